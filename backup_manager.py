@@ -0,0 +1,242 @@
+"""
+增量备份模块 - 按内容寻址的快照备份
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 文件内容按SHA-256存为压缩blob，相同内容只保存一份
+- 每次快照只写入内容有变化的文件，快照本身是一个小的清单文件
+- 大小和修改时间没变的文件直接沿用上一个快照的哈希，不重新读取
+- 支持恢复任意快照、删除快照以及清理不再被引用的blob
+
+目录结构（位于data/backup下，扫描提示词时会跳过）：
+    backup/objects/ab/cdef...   blob（zlib压缩）
+    backup/snapshots/20261018_120000.json   快照清单
+
+用法：
+    python backup_manager.py backup data
+    python backup_manager.py list data
+    python backup_manager.py restore data 20261018_120000 restore_dir
+    python backup_manager.py prune data --keep 24
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from dir_scanner import scan_prompt_files
+
+SNAPSHOT_VERSION = 1
+
+
+def _write_atomic(path: str, payload: bytes):
+    """先写临时文件再替换，避免中断时留下写了一半的文件"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class BackupManager:
+    """增量快照备份
+    快照清单记录 文件名 -> [内容哈希, 大小, 修改时间]，blob由所有快照共享
+    """
+    def __init__(self, data_dir: str, backup_dir: Optional[str] = None,
+                 extension: str = '.json', recursive: bool = True):
+        self.data_dir = data_dir
+        self.backup_dir = backup_dir or os.path.join(data_dir, 'backup')
+        self.extension = extension
+        self.recursive = recursive
+        self.objects_dir = os.path.join(self.backup_dir, 'objects')
+        self.snapshots_dir = os.path.join(self.backup_dir, 'snapshots')
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _snapshot_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.snapshots_dir, f"{snapshot_id}.json")
+
+    def list_snapshots(self) -> List[str]:
+        """按时间顺序列出所有快照ID"""
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.snapshots_dir) if name.endswith('.json'))
+
+    def load_snapshot(self, snapshot_id: str) -> Dict[str, list]:
+        """读取快照清单，返回 文件名 -> [哈希, 大小, 修改时间]"""
+        with open(self._snapshot_path(snapshot_id), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"不支持的快照版本: {snapshot_id}")
+        return snapshot['files']
+
+    def create_snapshot(self) -> Tuple[str, Dict[str, int]]:
+        """创建快照，返回 (快照ID, 统计信息)
+        统计信息: files 文件数, unchanged 沿用上一快照的文件数, new_blobs 新写入的blob数, bytes 新写入的字节数
+        """
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        snapshots = self.list_snapshots()
+        previous = {}
+        if snapshots:
+            try:
+                previous = self.load_snapshot(snapshots[-1])
+            except Exception as e:
+                print(f"读取上一个快照失败，将完整备份: {str(e)}")
+
+        stats = {'files': 0, 'unchanged': 0, 'new_blobs': 0, 'bytes': 0}
+        files = {}
+        for filename, entry in scan_prompt_files(self.data_dir, self.extension, self.recursive):
+            try:
+                st = entry.stat()
+                old = previous.get(filename)
+                if old is not None and old[1] == st.st_size and old[2] == st.st_mtime_ns \
+                        and os.path.exists(self._blob_path(old[0])):
+                    files[filename] = old
+                    stats['unchanged'] += 1
+                else:
+                    with open(entry.path, 'rb') as f:
+                        content = f.read()
+                    digest = hashlib.sha256(content).hexdigest()
+                    written = self._store_blob(digest, content)
+                    if written:
+                        stats['new_blobs'] += 1
+                        stats['bytes'] += written
+                    files[filename] = [digest, st.st_size, st.st_mtime_ns]
+                stats['files'] += 1
+            except OSError as e:
+                print(f"备份文件失败: {filename}, {str(e)}")
+
+        snapshot_id = time.strftime('%Y%m%d_%H%M%S')
+        counter = 1
+        while os.path.exists(self._snapshot_path(snapshot_id)):
+            snapshot_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{counter}"
+            counter += 1
+        payload = json.dumps({'version': SNAPSHOT_VERSION, 'created': time.time(), 'files': files},
+                             ensure_ascii=False, separators=(',', ':'))
+        _write_atomic(self._snapshot_path(snapshot_id), payload.encode('utf-8'))
+        return snapshot_id, stats
+
+    def _store_blob(self, digest: str, content: bytes) -> int:
+        """保存blob，已存在时不重复写入；返回写入的字节数"""
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = zlib.compress(content)
+        _write_atomic(path, payload)
+        return len(payload)
+
+    def read_blob(self, digest: str) -> bytes:
+        with open(self._blob_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def restore(self, snapshot_id: str, target_dir: Optional[str] = None,
+                delete_extra: bool = False, max_workers: int = 8) -> Dict[str, int]:
+        """把快照恢复到target_dir（默认为数据目录）
+        内容与快照一致的文件会被跳过，其余文件并行写出；
+        delete_extra为True时删除快照中没有的提示词文件
+        返回统计信息: restored 写出的文件数, skipped 已一致的文件数, deleted 删除的文件数
+        """
+        target_dir = target_dir or self.data_dir
+        files = self.load_snapshot(snapshot_id)
+        stats = {'restored': 0, 'skipped': 0, 'deleted': 0}
+
+        def restore_file(item) -> bool:
+            filename, (digest, size, _) = item
+            path = os.path.join(target_dir, filename)
+            try:
+                if os.path.getsize(path) == size:
+                    with open(path, 'rb') as f:
+                        if hashlib.sha256(f.read()).hexdigest() == digest:
+                            return False
+            except OSError:
+                pass
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            _write_atomic(path, self.read_blob(digest))
+            return True
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for restored in executor.map(restore_file, files.items()):
+                stats['restored' if restored else 'skipped'] += 1
+
+        if delete_extra and os.path.isdir(target_dir):
+            for filename, entry in scan_prompt_files(target_dir, self.extension, self.recursive):
+                if filename not in files:
+                    os.remove(entry.path)
+                    stats['deleted'] += 1
+        return stats
+
+    def delete_snapshot(self, snapshot_id: str):
+        """删除快照清单，blob在prune时回收"""
+        os.remove(self._snapshot_path(snapshot_id))
+
+    def prune(self, keep: Optional[int] = None) -> Dict[str, int]:
+        """清理备份
+        keep: 只保留最近的keep个快照（None表示不删除快照）
+        之后删除所有快照都不再引用的blob，返回统计信息: snapshots 删除的快照数, blobs 删除的blob数, bytes 释放的字节数
+        """
+        stats = {'snapshots': 0, 'blobs': 0, 'bytes': 0}
+        snapshots = self.list_snapshots()
+        if keep is not None and len(snapshots) > keep:
+            for snapshot_id in snapshots[:len(snapshots) - keep]:
+                self.delete_snapshot(snapshot_id)
+                stats['snapshots'] += 1
+            snapshots = snapshots[len(snapshots) - keep:]
+
+        referenced = set()
+        for snapshot_id in snapshots:
+            # 任何一个快照读不出来都不能确定哪些blob无用，此时放弃回收
+            referenced.update(entry[0] for entry in self.load_snapshot(snapshot_id).values())
+
+        if not os.path.isdir(self.objects_dir):
+            return stats
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if prefix + name in referenced:
+                    continue
+                path = os.path.join(prefix_dir, name)
+                stats['bytes'] += os.path.getsize(path)
+                os.remove(path)
+                stats['blobs'] += 1
+            if not os.listdir(prefix_dir):
+                os.rmdir(prefix_dir)
+        return stats
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="提示词增量备份工具")
+    sub = parser.add_subparsers(dest='command', required=True)
+    backup_cmd = sub.add_parser('backup', help="创建快照")
+    backup_cmd.add_argument('data_dir')
+    list_cmd = sub.add_parser('list', help="列出快照")
+    list_cmd.add_argument('data_dir')
+    restore_cmd = sub.add_parser('restore', help="恢复快照")
+    restore_cmd.add_argument('data_dir')
+    restore_cmd.add_argument('snapshot_id')
+    restore_cmd.add_argument('target_dir', nargs='?')
+    restore_cmd.add_argument('--delete-extra', action='store_true', help="删除快照中没有的文件")
+    prune_cmd = sub.add_parser('prune', help="删除旧快照并回收无用的blob")
+    prune_cmd.add_argument('data_dir')
+    prune_cmd.add_argument('--keep', type=int, default=None, help="保留最近的快照数")
+    args = parser.parse_args()
+
+    manager = BackupManager(args.data_dir)
+    if args.command == 'backup':
+        snapshot_id, stats = manager.create_snapshot()
+        print(f"快照 {snapshot_id}: {stats}")
+    elif args.command == 'list':
+        for snapshot_id in manager.list_snapshots():
+            print(snapshot_id)
+    elif args.command == 'restore':
+        print(manager.restore(args.snapshot_id, args.target_dir, args.delete_extra))
+    else:
+        print(manager.prune(args.keep))
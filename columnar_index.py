@@ -0,0 +1,206 @@
+"""
+列式搜索模块 - 按字段拼接的小写文本缓冲区
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 每个字段一个缓冲区：所有提示词该字段的小写文本用分隔符拼接，另存每段的起始位置
+- 查找关键词就是在缓冲区上反复str.find，命中位置用bisect换算回提示词；
+  找到一个提示词后直接跳到下一段，每个提示词最多命中一次
+- 安装了NumPy时，短关键词（命中通常很多）改用向量化比较
+- 缓冲区分块存放，新增的提示词追加到最后一块，只有这一块需要重新拼接；
+  删除和修改采用墓碑标记，失效的文本累计到一定比例后统一压缩
+- 提供与NgramIndex相同的field_candidates/add/remove接口，查询计划（query_parser）可以直接使用
+- 压缩时按顺序重新编号有效文档，编号表不再随修改次数无限增长
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Set
+from search_index import SEARCH_FIELDS, field_text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 段与段之间的分隔符，关键词中不会出现
+SEPARATOR = '\x00'
+# 每块最多的字符数，追加时只需重新拼接最后一块
+BLOCK_CHARS = 1 << 20
+# 使用NumPy的关键词最大长度：更长的关键词命中少，str.find跳得更快
+NUMPY_MAX_KEYWORD = 3
+# 失效文本超过总长度的这个比例时压缩
+_COMPACT_RATIO = 0.3
+
+
+class _Block:
+    """一块缓冲区：text为已拼接的文本，pending为尚未拼接的新段"""
+    __slots__ = ('text', 'pending', 'length', 'starts', 'ids', '_codes', '_arrays')
+
+    def __init__(self):
+        self.text = ''
+        self.pending: List[str] = []
+        self.length = 0
+        self.starts: List[int] = []   # 每段在块中的起始位置
+        self.ids: List[int] = []      # 每段对应的文档编号
+        self._codes = None            # NumPy的字符编码数组，按需生成
+        self._arrays = None
+
+    def append(self, doc_id: int, text: str):
+        self.starts.append(self.length)
+        self.ids.append(doc_id)
+        self.pending.append(text + SEPARATOR)
+        self.length += len(text) + 1
+
+    def flush(self) -> str:
+        if self.pending:
+            self.text += ''.join(self.pending)
+            self.pending = []
+            self._codes = None
+            self._arrays = None
+        return self.text
+
+    def segments(self):
+        """遍历 (文档编号, 文本)"""
+        text = self.flush()
+        starts = self.starts
+        for i, doc_id in enumerate(self.ids):
+            end = starts[i + 1] - 1 if i + 1 < len(starts) else len(text) - 1
+            yield doc_id, text[starts[i]:end]
+
+    def find_docs(self, keyword: str) -> List[int]:
+        """包含keyword的文档编号（可能含失效编号）"""
+        text = self.flush()
+        if np is not None and len(keyword) <= NUMPY_MAX_KEYWORD and text:
+            return self._numpy_find_docs(keyword)
+        starts = self.starts
+        ids = self.ids
+        found = []
+        pos = text.find(keyword)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            found.append(ids[i])
+            if i + 1 >= len(starts):
+                break
+            pos = text.find(keyword, starts[i + 1])
+        return found
+
+    def _numpy_find_docs(self, keyword: str) -> List[int]:
+        if self._codes is None:
+            self._codes = np.frombuffer(self.text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+            self._arrays = (np.array(self.starts, dtype=np.int64), np.array(self.ids, dtype=np.int64))
+        codes = self._codes
+        pattern = [ord(c) for c in keyword]
+        n = len(codes) - len(pattern) + 1
+        if n <= 0:
+            return []
+        pos = np.flatnonzero(codes[:n] == pattern[0])
+        for j in range(1, len(pattern)):
+            if not len(pos):
+                break
+            pos = pos[codes[pos + j] == pattern[j]]
+        if not len(pos):
+            return []
+        starts, ids = self._arrays
+        segments = np.unique(np.searchsorted(starts, pos, side='right') - 1)
+        return ids[segments].tolist()
+
+
+class ColumnarIndex:
+    """列式搜索索引
+    field_candidates返回的是精确结果（缓冲区与子串校验使用相同的小写规则），
+    接口与NgramIndex一致，两者可以互换
+    """
+    def __init__(self, fields: Iterable[str] = SEARCH_FIELDS):
+        self.fields = tuple(fields)
+        self.blocks: Dict[str, List[_Block]] = {field: [] for field in self.fields}
+        self.doc_files: List[Optional[str]] = []   # 编号 -> 文件名，失效的编号为None
+        self.doc_ids: Dict[str, int] = {}          # 文件名 -> 当前编号
+        self._total_chars = 0
+        self._dead_chars = 0
+        self._doc_chars: List[int] = []            # 编号 -> 各字段文本的总长度
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __contains__(self, filename):
+        return filename in self.doc_ids
+
+    def clear(self):
+        for field in self.fields:
+            self.blocks[field] = []
+        self.doc_files = []
+        self.doc_ids = {}
+        self._total_chars = 0
+        self._dead_chars = 0
+        self._doc_chars = []
+
+    def _append(self, field: str, doc_id: int, text: str):
+        blocks = self.blocks[field]
+        if not blocks or blocks[-1].length >= BLOCK_CHARS:
+            blocks.append(_Block())
+        blocks[-1].append(doc_id, text)
+
+    def add(self, filename: str, record):
+        """加入（或替换）一个文件，record只需具有各字段同名的属性"""
+        self.remove(filename)
+        doc_id = len(self.doc_files)
+        self.doc_files.append(filename)
+        self.doc_ids[filename] = doc_id
+        chars = 0
+        for field in self.fields:
+            text = field_text(getattr(record, field, None))
+            self._append(field, doc_id, text)
+            chars += len(text) + 1
+        self._doc_chars.append(chars)
+        self._total_chars += chars
+
+    def remove(self, filename: str) -> bool:
+        """移除一个文件（墓碑标记），文件不在索引中时返回False"""
+        doc_id = self.doc_ids.pop(filename, None)
+        if doc_id is None:
+            return False
+        self.doc_files[doc_id] = None
+        self._dead_chars += self._doc_chars[doc_id]
+        if self._dead_chars > _COMPACT_RATIO * self._total_chars and self._dead_chars >= BLOCK_CHARS // 4:
+            self.compact()
+        return True
+
+    def compact(self):
+        """去掉失效的文本重新分块，有效文档按原顺序重新编号为0~n-1"""
+        renumber = {}
+        doc_files = []
+        for doc_id, filename in enumerate(self.doc_files):
+            if filename is not None:
+                renumber[doc_id] = len(doc_files)
+                doc_files.append(filename)
+        for field in self.fields:
+            old_blocks = self.blocks[field]
+            self.blocks[field] = []
+            for block in old_blocks:
+                for doc_id, text in block.segments():
+                    if doc_id in renumber:
+                        self._append(field, renumber[doc_id], text)
+        self._doc_chars = [self._doc_chars[doc_id] for doc_id in renumber]
+        self.doc_files = doc_files
+        self.doc_ids = {filename: doc_id for doc_id, filename in enumerate(doc_files)}
+        self._total_chars -= self._dead_chars
+        self._dead_chars = 0
+
+    def field_candidates(self, field: str, keyword: str) -> Set[int]:
+        """该字段包含keyword的文档编号（keyword已是小写，可能含失效编号）"""
+        if not keyword or SEPARATOR in keyword:
+            return set()
+        result = set()
+        for block in self.blocks[field]:
+            result.update(block.find_docs(keyword))
+        return result
+
+    def candidates(self, keyword: str, fields: Optional[Iterable[str]] = None) -> List[str]:
+        """任意一个字段包含keyword的文件名"""
+        keyword = keyword.lower()
+        ids: Set[int] = set()
+        for field in (fields or self.fields):
+            ids |= self.field_candidates(field, keyword)
+        doc_files = self.doc_files
+        return [doc_files[doc_id] for doc_id in ids if doc_files[doc_id] is not None]
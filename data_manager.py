@@ -1,230 +1,1137 @@
-"""
-数据管理模块
-
-版本日志：
-v1.0 2024-03-xx
-- 初始版本
-- 实现JSON文件的读写操作
-- 实现分组管理功能
-- 实现提示词缓存功能
-v1.1 2024-03-xx
-- 添加data目录管理
-- 修改所有文件操作路径到data目录
-"""
-
-import json
-import os
-import re
-from typing import List, Dict
-import zipfile
-import time
-from configs.configs_data import DATA_PATHS
-from configs.set_configs import get_config
-
-class DataManager:
-    def __init__(self):
-        # 加载配置的数据目录
-        config = get_config()
-        self.data_dir = config.get('data_dir', DATA_PATHS['data_dir'])
-        
-        # 检查配置的目录是否存在，如果不存在则使用默认目录
-        if not os.path.exists(self.data_dir):
-            print(f"警告: 配置的数据目录 {self.data_dir} 不存在，将使用默认目录")
-            self.data_dir = DATA_PATHS['data_dir']  # 使用默认的 data 目录
-            
-            # 更新配置文件中的目录设置
-            try:
-                config['data_dir'] = self.data_dir
-                config_path = os.path.join('configs', 'user_configs.json')
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, ensure_ascii=False, indent=4)
-            except Exception as e:
-                print(f"更新配置文件失败: {str(e)}")
-        
-        self.ensure_data_directory()
-        self.data_all = []
-        
-    def ensure_data_directory(self):
-        """确保data目录存在"""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
-            
-    def get_data_path(self, filename: str) -> str:
-        """获取数据文件的完整路径"""
-        return os.path.join(self.data_dir, filename)
-        
-    def load_all_json_data(self) -> List[Dict]:
-        """加载所有JSON文件数据"""
-        json_files = [f for f in os.listdir(self.data_dir) if f.endswith('.json')]
-        json_data = []
-        
-        for file in json_files:
-            try:
-                with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    json_data.append(data)
-            except:
-                print(f"读取json文件数据错误请检查json文件: {file}")
-        
-        self.data_all = json_data
-        return json_data
-
-    def get_all_groups(self) -> List[str]:
-        """获取所有分组"""
-        groups = set()
-        for file in os.listdir(self.data_dir):
-            if file.endswith('.json'):
-                try:
-                    with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        group = data.get('group', '').strip()
-                        if group:
-                            groups.add(group)
-                except Exception as e:
-                    print(f"读取分组错误: {file}, {str(e)}")
-        return sorted(list(groups))  # 排序返回，保证顺序一致
-
-    def save_prompt(self, filename: str, data: Dict):
-        """保存提示词数据到文件"""
-        with open(self.get_data_path(filename), 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-
-    def get_files_by_group(self, group: str) -> List[str]:
-        """获取指定分组的所有文件"""
-        files = []
-        for file in os.listdir(self.data_dir):
-            if file.endswith('.json'):
-                try:
-                    with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if data.get('group', '').strip() == group:
-                            files.append(file)
-                except:
-                    print(f"读取文件错误: {file}")
-        return files
-
-    def cache_prompt(self, content: str):
-        """缓存提示词内容"""
-        cache_path = self.get_data_path('cache_prompt.txt')
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-    def read_cached_prompt(self) -> str:
-        """读取缓存的提示词"""
-        try:
-            cache_path = self.get_data_path('cache_prompt.txt')
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except:
-            return ""
-            
-    def delete_prompt(self, filename: str):
-        """删除提示词文件"""
-        file_path = self.get_data_path(filename)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
-    def get_all_files(self) -> List[str]:
-        """获取所有JSON文件"""
-        return [f for f in os.listdir(self.data_dir) if f.endswith('.json')]
-
-    def export_prompts(self, export_path: str):
-        """导出所有提示词到指定路径"""
-        export_data = []
-        for file in self.get_all_files():
-            try:
-                with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    export_data.append(data)
-            except Exception as e:
-                print(f"导出文件错误: {file}, {str(e)}")
-                
-        with open(export_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=4)
-
-    def import_prompts(self, import_path: str):
-        """从指定文件导入提示词"""
-        try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
-                
-            for data in import_data:
-                name = data.get('name', '').strip()
-                if name:
-                    filename = self.get_safe_filename(name)
-                    self.save_prompt(filename, data)
-        except Exception as e:
-            print(f"导入文件错误: {str(e)}")
-
-    def backup_data(self):
-        """备份所有数据"""
-        backup_dir = os.path.join(self.data_dir, 'backup')
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
-            
-        timestamp = time.strftime('%Y%m%d_%H%M%S')
-        backup_file = os.path.join(backup_dir, f'backup_{timestamp}.zip')
-        
-        with zipfile.ZipFile(backup_file, 'w') as zf:
-            for file in self.get_all_files():
-                zf.write(self.get_data_path(file), file)
-
-    def get_statistics(self) -> Dict:
-        """获取提示词统计信息"""
-        stats = {
-            'total_prompts': 0,
-            'total_groups': 0,
-            'prompts_by_group': {},
-            'most_used_prompts': []
-        }
-        
-        # 统计总数和分组数据
-        groups = self.get_all_groups()
-        stats['total_groups'] = len(groups)
-        
-        for group in groups:
-            files = self.get_files_by_group(group)
-            stats['total_prompts'] += len(files)
-            stats['prompts_by_group'][group] = len(files)
-            
-        return stats
-
-    def get_safe_filename(self, name: str) -> str:
-        """生成安全的文件名（移除非法字符）"""
-        # 移除或替换不安全的字符
-        safe_name = re.sub(r'\W+', '_', name)
-        # 确保文件名不重复
-        base_name = safe_name
-        counter = 1
-        while os.path.exists(self.get_data_path(f"{safe_name}.json")):
-            safe_name = f"{base_name}_{counter:04d}"
-            counter += 1
-        return f"{safe_name}.json"
-
-    def get_hotkeys_prompts(self):
-        """获取所有带快捷键的提示词"""
-        hotkeys_prompts = []
-        for file in self.get_all_files():
-            try:
-                with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'shortcut' in data and data['shortcut']:
-                        hotkeys_prompts.append(data)
-            except Exception as e:
-                print(f"读取文件 {file} 出错: {str(e)}")
-        return hotkeys_prompts
-
-    def clear_all_hotkeys(self):
-        """清空所有 JSON 数据的 shortcut 字段"""
-        json_files = [f for f in os.listdir(self.data_dir) if f.endswith('.json')]
-        
-        for file in json_files:
-            try:
-                with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if 'shortcut' in data:
-                    data['shortcut'] = ''
-                with open(self.get_data_path(file), 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-            except Exception as e:
-                print(f"清空快捷键时出错: {str(e)}")
\ No newline at end of file
+"""
+数据管理模块
+
+版本日志：
+v1.0 2024-03-xx
+- 初始版本
+- 实现JSON文件的读写操作
+- 实现分组管理功能
+- 实现提示词缓存功能
+v1.1 2024-03-xx
+- 添加data目录管理
+- 修改所有文件操作路径到data目录
+v1.2 2026-10-xx
+- 添加内存索引PromptIndex，分组与文件查询不再逐个解析JSON文件
+- 添加JsonFileCache，按文件状态校验的解析缓存，重复读取只需一次os.stat
+- 添加apply_file_changes，按单个文件的增删改增量更新索引
+- 支持可选的SQLite存储（配置项storage_backend），接口保持不变
+- 启动时用线程池（可选进程池）并行解析JSON文件，错误统一汇总到日志
+- 添加启动清单（.prompt_manifest），启动时只重新解析有变化的文件
+- 目录枚举统一使用dir_scanner，支持include_subdirs和file_extension配置
+- 索引只常驻name/group/shortcut元数据，正文按需加载并由LRU按内存预算缓存
+- 索引和缓存改用__slots__的PromptRecord，分组名驻留，空的预留字段不占空间
+- 添加FilenameAllocator，新文件名按 基础名 -> 已用序号 直接分配，不再逐个探测os.path.exists；
+  JSON目录用不会被扫描到的 .claim 占位文件原子地占用文件名，SQLite存储用一条INSERT预留
+- 导入导出改为流式处理，支持JSON Lines格式，JSON数组格式也逐条增量读写
+- 导入按正文哈希去重（跳过或合并），文件写入由线程池并行执行，结束时输出汇总报告
+- 添加增量备份模式（配置项backup_mode），只保存内容有变化的文件，可恢复任意快照
+- 快捷键批量操作（清空、按分组清空、批量替换）由索引确定要改写的文件，带回滚日志
+- 提示词文件改为先写临时文件再替换
+- 添加使用统计（UsageTracker），get_statistics一次遍历统计分组并填充most_used_prompts
+- 添加merge_prompts，供近似重复检查窗口批量合并
+- 保存时记录版本历史（HistoryManager），可查看和恢复任意版本
+- 添加数据变化通知（add_listener），保存、删除和重新加载时通知搜索索引等监听者
+- build_index在新的PromptIndex中建立索引，完成后一次赋值替换，后台搜索线程不会读到建到一半的索引
+"""
+
+import json
+import os
+import re
+import bisect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Iterable, Iterator, Set, Tuple
+import zipfile
+import time
+from configs.configs_data import DATA_PATHS
+from configs.set_configs import get_config
+from sqlite_storage import SqliteStorage
+from dir_scanner import is_prompt_file, scan_prompt_files
+from prompt_record import PromptRecord
+from backup_manager import BackupManager
+from import_pipeline import ImportPipeline, ImportReport, merge_fields
+from usage_tracker import UsageTracker
+from history_manager import HistoryManager
+from stream_io import (FORMAT_JSONL, JsonArrayWriter, JsonLinesWriter, detect_format,
+                       iter_json_array, iter_json_lines)
+
+# 新建提示词时的快捷键占位值，表示未设置
+SHORTCUT_PLACEHOLDER = 'ctrl+*'
+
+def _group_key(record: PromptRecord) -> str:
+    return str(record.group).strip()
+
+class PromptIndex:
+    """提示词内存索引
+    维护 文件名 -> 元数据记录 与 分组 -> 有序文件名 两张表，
+    由DataManager在增删改时同步更新；正文不在索引中，按需通过read_prompt读取
+    """
+    def __init__(self):
+        self.records: Dict[str, PromptRecord] = {}
+        self.groups: Dict[str, List[str]] = {}
+
+    def clear(self):
+        """清空索引"""
+        self.records.clear()
+        self.groups.clear()
+
+    def put(self, filename: str, record: PromptRecord):
+        """添加或更新一条记录"""
+        self.remove(filename)
+        self.records[filename] = record
+        bisect.insort(self.groups.setdefault(_group_key(record), []), filename)
+
+    def remove(self, filename: str) -> Optional[PromptRecord]:
+        """移除一条记录，返回被移除的记录"""
+        record = self.records.pop(filename, None)
+        if record is None:
+            return None
+        group = _group_key(record)
+        files = self.groups.get(group)
+        if files:
+            i = bisect.bisect_left(files, filename)
+            if i < len(files) and files[i] == filename:
+                del files[i]
+            if not files:
+                del self.groups[group]
+        return record
+
+    def get(self, filename: str) -> Optional[PromptRecord]:
+        """获取记录"""
+        return self.records.get(filename)
+
+    def get_groups(self) -> List[str]:
+        """获取所有非空分组（已排序）"""
+        return sorted(g for g in self.groups if g)
+
+    def get_files(self, group: str) -> List[str]:
+        """获取分组下的文件名（已排序）"""
+        return list(self.groups.get(group, []))
+
+    def get_all_files(self) -> List[str]:
+        """获取所有已索引的文件名"""
+        return list(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, filename):
+        return filename in self.records
+
+class JsonFileCache:
+    """JSON文件解析缓存（按路径），也是提示词正文的按需加载层
+    缓存解析后的PromptRecord，以文件的 (mtime_ns, size, inode) 判断缓存是否过期，
+    外部修改的文件会被重新解析；按估算的内存占用做LRU淘汰。热键回调在其他线程中执行，所以内部加锁
+    """
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (stat_key, 内存估算, record)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat_key(st) -> tuple:
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self, path: str) -> PromptRecord:
+        """读取并解析JSON文件，命中缓存时只需一次os.stat
+        返回的记录在缓存中共享，调用方不要修改，需要修改时请用to_dict()
+        """
+        st = os.stat(path)
+        key = self._stat_key(st)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(path)
+                return entry[2]
+        with open(path, 'r', encoding='utf-8') as f:
+            record = PromptRecord.from_dict(json.load(f))
+        self._store(path, key, record)
+        return record
+
+    def put(self, path: str, data: Dict):
+        """写文件后直接更新缓存，避免下次读取时重新解析"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return
+        self._store(path, self._stat_key(st), PromptRecord.from_dict(data))
+
+    def invalidate(self, path: str):
+        """移除某个路径的缓存"""
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._total_bytes -= entry[1]
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _store(self, path: str, key: tuple, record: PromptRecord):
+        size = record.estimate_size()
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[path] = (key, size, record)
+            self._total_bytes += size
+            # 超出容量时淘汰最久未使用的条目
+            while self._total_bytes > self.max_bytes:
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+
+class FilenameAllocator:
+    """新文件名分配器
+    维护 基础名 -> 已用序号集合（0表示不带序号的 基础名.json）以及最大序号，
+    分配时直接取 基础名.json 或 基础名_{最大序号+1:04d}.json，不需要逐个探测磁盘。
+    只管理数据目录顶层的文件（get_safe_filename生成的文件名不含'/'）。
+    claim回调用于在存储中原子地占用文件名，返回False表示已被其他写入方占用，此时顺延到下一个序号
+    """
+    _SUFFIX = re.compile(r'^(.*)_(\d{4,})$')
+
+    def __init__(self, extension: str, claim: Optional[Callable[[str], bool]] = None):
+        self.extension = extension
+        self._claim = claim
+        self._used: Dict[str, Set[int]] = {}
+        self._highest: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _split(self, filename: str) -> List[Tuple[str, int]]:
+        """文件名可能对应的 (基础名, 序号)
+        name_2024.json 既是基础名name_2024本身，也可能是name的第2024号，两种都要登记
+        """
+        if '/' in filename or not filename.endswith(self.extension):
+            return []
+        stem = filename[:-len(self.extension)]
+        keys = [(stem, 0)]
+        match = self._SUFFIX.match(stem)
+        if match:
+            keys.append((match.group(1), int(match.group(2))))
+        return keys
+
+    def _format(self, base: str, number: int) -> str:
+        return f"{base}{self.extension}" if number == 0 else f"{base}_{number:04d}{self.extension}"
+
+    def _add_locked(self, filename: str):
+        for base, number in self._split(filename):
+            self._used.setdefault(base, set()).add(number)
+            if number > self._highest.get(base, -1):
+                self._highest[base] = number
+
+    def add(self, filename: str):
+        """登记已存在（或刚保存）的文件名"""
+        with self._lock:
+            self._add_locked(filename)
+
+    def remove(self, filename: str):
+        """登记被删除的文件名，序号可以被重新使用"""
+        with self._lock:
+            for base, number in self._split(filename):
+                used = self._used.get(base)
+                if used is None:
+                    continue
+                used.discard(number)
+                if not used:
+                    del self._used[base]
+                    del self._highest[base]
+                elif number == self._highest[base]:
+                    self._highest[base] = max(used)
+
+    def allocate(self, base: str) -> str:
+        """分配一个不重复的文件名"""
+        with self._lock:
+            while True:
+                used = self._used.get(base)
+                number = 0 if not used or 0 not in used else self._highest[base] + 1
+                filename = self._format(base, number)
+                self._add_locked(filename)
+                if self._claim is None or self._claim(filename):
+                    return filename
+                # 其他进程抢先创建了同名文件，已登记为占用，继续下一个序号
+
+def _write_json_atomic(path: str, data, **dump_kwargs):
+    """写入临时文件后用os.replace替换目标文件（临时文件名不以提示词扩展名结尾，不会被扫描到）"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# 使用统计文件
+USAGE_FILE = '.usage_stats'
+# 批量修改快捷键的回滚日志
+SHORTCUT_JOURNAL = '.shortcut_journal'
+
+# 新文件名的占位文件后缀（文件名.json.claim）：不以提示词扩展名结尾，不会被扫描到；
+# 保存或放弃时删除，建立索引时清除超过CLAIM_MAX_AGE秒的遗留占位
+CLAIM_SUFFIX = '.claim'
+CLAIM_MAX_AGE = 3600
+
+# 启动清单：记录每个文件的大小、修改时间及名称/分组/快捷键
+# 不使用.json扩展名，避免被当作提示词文件扫描
+MANIFEST_FILE = '.prompt_manifest'
+MANIFEST_VERSION = 1
+
+def _read_json_file(path: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """读取并解析单个JSON文件，返回 (数据, 错误信息)
+    放在模块级别，进程池才能序列化调用
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), None
+    except Exception as e:
+        return None, str(e)
+
+def _read_json_meta(path: str) -> Tuple[Optional[Tuple[str, str, str]], Optional[str]]:
+    """读取单个JSON文件，只返回 (name, group, shortcut)，正文在工作线程/进程中即被丢弃"""
+    data, error = _read_json_file(path)
+    if data is None:
+        return None, error
+    return (str(data.get('name', '')), str(data.get('group', '')), str(data.get('shortcut', ''))), None
+
+class LoadReport:
+    """批量加载结果汇总"""
+    def __init__(self):
+        self.loaded = 0
+        self.errors: List[Tuple[str, str]] = []  # [(文件名, 错误信息), ...]
+        self.elapsed = 0.0
+
+    def summary(self) -> str:
+        text = f"加载 {self.loaded} 个文件，失败 {len(self.errors)} 个，耗时 {self.elapsed:.2f} 秒"
+        for file, error in self.errors:
+            text += f"\n  读取json文件数据错误请检查json文件: {file}, {error}"
+        return text
+
+def parallel_load(data_dir: str, filenames: List[str], max_workers: int = 8,
+                  use_processes: bool = False, meta_only: bool = False) -> Tuple[List[Tuple[str, Dict]], LoadReport]:
+    """并行读取并解析一批JSON文件
+    结果顺序与filenames一致；单个文件的错误不会中断加载，统一记录在LoadReport中
+    网络盘上读取耗时主要在IO，默认使用线程池；文件数量很大时可改用进程池分摊解析开销
+    meta_only为True时只返回元数据，避免整个语料的正文同时驻留内存
+    """
+    reader = _read_json_meta if meta_only else _read_json_file
+    report = LoadReport()
+    start = time.perf_counter()
+    paths = [os.path.join(data_dir, file) for file in filenames]
+    results = []
+    if paths:
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            chunksize = max(1, len(paths) // (max_workers * 4))
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            chunksize = 1
+        with executor:
+            for file, (data, error) in zip(filenames, executor.map(reader, paths, chunksize=chunksize)):
+                if error is not None:
+                    report.errors.append((file, error))
+                else:
+                    results.append((file, data))
+    report.loaded = len(results)
+    report.elapsed = time.perf_counter() - start
+    return results, report
+
+class DataManager:
+    def __init__(self):
+        # 加载配置的数据目录
+        config = get_config()
+        self.config = config
+        self.data_dir = config.get('data_dir', DATA_PATHS['data_dir'])
+        
+        # 检查配置的目录是否存在，如果不存在则使用默认目录
+        if not os.path.exists(self.data_dir):
+            print(f"警告: 配置的数据目录 {self.data_dir} 不存在，将使用默认目录")
+            self.data_dir = DATA_PATHS['data_dir']  # 使用默认的 data 目录
+            
+            # 更新配置文件中的目录设置
+            try:
+                config['data_dir'] = self.data_dir
+                config_path = os.path.join('configs', 'user_configs.json')
+                with open(config_path, 'w', encoding='utf-8') as f:
+                    json.dump(config, f, ensure_ascii=False, indent=4)
+            except Exception as e:
+                print(f"更新配置文件失败: {str(e)}")
+        
+        self.ensure_data_directory()
+        self._apply_scan_config()
+        self.last_load_report = None
+        
+        # 内存索引，首次查询时建立
+        self.index = PromptIndex()
+        self._index_ready = False
+        # 已索引文件的 (size, mtime_ns)，用于写启动清单
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        self._manifest_dirty = False
+        
+        # 正文按需加载缓存，内存预算单位MB，可在配置文件中用content_cache_mb调整
+        self.file_cache = JsonFileCache(int(config.get('content_cache_mb', 32)) * 1024 * 1024)
+        # 新文件名分配器，首次分配时根据已有文件建立；_claims为本进程创建的、尚未保存的占位文件
+        self._allocator: Optional[FilenameAllocator] = None
+        self._claims: Set[str] = set()
+        
+        # 使用统计，以及ctrl+b发送的缓存提示词对应的文件
+        self.usage = UsageTracker(self.get_data_path(USAGE_FILE))
+        self.cached_prompt_file: Optional[str] = None
+        
+        # 版本历史，可用history_enabled关闭
+        self.history: Optional[HistoryManager] = None
+        self._open_history()
+        
+        # 数据变化监听器 callback(event, filename)，见add_listener
+        self._listeners: List[Callable[[str, Optional[str]], None]] = []
+        
+        # 存储方式: 'json'（每个提示词一个文件，默认）或 'sqlite'（单个数据库文件）
+        self.storage = None
+        self._open_storage()
+        
+    def ensure_data_directory(self):
+        """确保data目录存在"""
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+            
+    def get_data_path(self, filename: str) -> str:
+        """获取数据文件的完整路径（filename可以是包含'/'的相对路径）"""
+        return os.path.join(self.data_dir, filename)
+        
+    def _apply_scan_config(self):
+        """读取扫描相关配置：是否包含子目录、提示词文件扩展名"""
+        self.include_subdirs = bool(self.config.get('include_subdirs', DATA_PATHS['include_subdirs']))
+        self.file_extension = self.config.get('file_extension') or DATA_PATHS['file_extension']
+
+    def scan_files(self):
+        """惰性遍历数据目录中的提示词文件，产出 (文件名, DirEntry)"""
+        return scan_prompt_files(self.data_dir, self.file_extension, self.include_subdirs)
+        
+    def _open_storage(self):
+        """按配置打开SQLite存储，未配置时使用JSON目录"""
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+        if self.config.get('storage_backend', 'json') == 'sqlite':
+            db_path = self.config.get('sqlite_path') or self.get_data_path('prompts.db')
+            self.storage = SqliteStorage(db_path)
+
+    def _open_history(self):
+        """按配置创建版本历史管理器，切换目录前先写完旧目录的待写入版本"""
+        if self.history is not None:
+            self.history.flush()
+            self.history = None
+        if self.config.get('history_enabled', True):
+            self.history = HistoryManager(
+                self.data_dir,
+                max_revisions=int(self.config.get('history_max_revisions', 50)),
+                max_age_days=float(self.config.get('history_max_days', 0))
+            )
+
+    def add_listener(self, callback: Callable[[str, Optional[str]], None]):
+        """注册数据变化监听器（如搜索索引），callback(event, filename)：
+        'save' 提示词新增或修改 | 'delete' 提示词删除 | 'reset' 整个库需要重新加载（filename为None）
+        回调在修改数据的线程中同步执行，应只做记录，不要做耗时操作
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, event: str, filename: Optional[str] = None):
+        for callback in self._listeners:
+            try:
+                callback(event, filename)
+            except Exception as e:
+                print(f"数据变化通知失败: {str(e)}")
+
+    def close(self):
+        """退出前调用：刷新启动清单、使用统计和版本历史"""
+        self.save_manifest()
+        self.usage.close()
+        if self.history is not None:
+            self.history.flush()
+
+    def set_data_dir(self, data_dir: str):
+        """切换数据目录，索引在下次查询时重建"""
+        self.data_dir = data_dir
+        self.ensure_data_directory()
+        self._apply_scan_config()
+        self.index = PromptIndex()
+        self._index_ready = False
+        self._allocator = None
+        self.file_cache.clear()
+        self.usage.close()
+        self.usage = UsageTracker(self.get_data_path(USAGE_FILE))
+        self.cached_prompt_file = None
+        self._open_history()
+        self._open_storage()
+        self._notify('reset')
+
+    def build_index(self):
+        """建立内存索引
+        先读取启动清单，再用一次os.scandir核对每个文件的大小和修改时间，
+        只有新增或变化的文件才会被重新解析
+        重新扫描时后台线程可能正在搜索，新索引建好后才替换self.index，不在原索引上清空重建
+        """
+        self._allocator = None
+        if self.storage is not None:
+            # SQLite存储直接使用数据库索引，不需要内存索引
+            self.index = PromptIndex()
+            self._file_stats = {}
+            self._index_ready = True
+            self._notify('reset')
+            return
+            
+        self.recover_shortcut_journal()
+        self._remove_stale_claims()
+        manifest = self._load_manifest()
+        records = {}
+        file_stats = {}
+        changed_files = []
+        for filename, entry in self.scan_files():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            key = (st.st_size, st.st_mtime_ns)
+            file_stats[filename] = key
+            cached = manifest.get(filename)
+            if cached is not None and tuple(cached[:2]) == key:
+                records[filename] = PromptRecord.meta(*cached[2:5])
+            else:
+                changed_files.append(filename)
+                    
+        changed_files.sort()
+        results, report = parallel_load(
+            self.data_dir, changed_files,
+            max_workers=int(self.config.get('load_workers', min(32, (os.cpu_count() or 1) * 4))),
+            use_processes=self.config.get('load_executor', 'thread') == 'process',
+            meta_only=True
+        )
+        for file, meta in results:
+            records[file] = PromptRecord.meta(*meta)
+        for file, _ in report.errors:
+            file_stats.pop(file, None)
+        index = PromptIndex()
+        for file in sorted(records):
+            index.put(file, records[file])
+        self.index = index
+        self._file_stats = file_stats
+            
+        self.last_load_report = report
+        if report.errors:
+            logging.error(report.summary())
+        self._index_ready = True
+        
+        # 有文件变化（或删除）时刷新清单
+        self._manifest_dirty = bool(changed_files) or len(manifest) != len(records)
+        self.save_manifest()
+        self._notify('reset')
+
+    def _load_manifest(self) -> Dict[str, list]:
+        """读取启动清单，不存在或版本不符时返回空字典"""
+        try:
+            with open(self.get_data_path(MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != MANIFEST_VERSION:
+                return {}
+            return manifest.get('files', {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.error(f"读取启动清单失败: {str(e)}")
+            return {}
+
+    def save_manifest(self):
+        """把当前索引写入启动清单（先写临时文件再替换，避免写一半）
+        只记录本程序确认过大小和修改时间的文件，之后被外部修改的文件在下次启动时会被重新解析
+        """
+        if self.storage is not None or not self._index_ready or not self._manifest_dirty:
+            return
+        files = {}
+        for filename, (size, mtime_ns) in self._file_stats.items():
+            record = self.index.get(filename)
+            if record is None:
+                continue
+            files[filename] = [size, mtime_ns, *record.meta_key()]
+        try:
+            _write_json_atomic(self.get_data_path(MANIFEST_FILE), {'version': MANIFEST_VERSION, 'files': files},
+                              separators=(',', ':'))
+            self._manifest_dirty = False
+        except Exception as e:
+            logging.error(f"写入启动清单失败: {str(e)}")
+
+    def _record_stat(self, filename: str):
+        """记录文件当前的大小和修改时间，供启动清单使用"""
+        try:
+            st = os.stat(self.get_data_path(filename))
+            self._file_stats[filename] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            self._file_stats.pop(filename, None)
+        self._manifest_dirty = True
+
+    def ensure_index(self):
+        """确保索引已建立"""
+        if not self._index_ready:
+            self.build_index()
+
+    def apply_file_changes(self, filenames: Iterable[str]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """把外部对单个文件的新增/修改/删除应用到索引
+        返回实际发生变化的条目: [(文件名, 原分组, 新分组), ...]，
+        新增时原分组为None，删除时新分组为None
+        """
+        if self.storage is not None:
+            return []
+        self.ensure_index()
+        deltas = []
+        for filename in filenames:
+            if not is_prompt_file(filename, self.file_extension, self.include_subdirs):
+                continue  # 备份、隐藏目录等不属于提示词库的文件
+            old = self.index.get(filename)
+            old_group = _group_key(old) if old is not None else None
+            file_path = self.get_data_path(filename)
+            if not os.path.exists(file_path):
+                self.file_cache.invalidate(file_path)
+                if old is not None:
+                    self.index.remove(filename)
+                    self._record_stat(filename)
+                    deltas.append((filename, old_group, None))
+                if self._allocator is not None:
+                    self._allocator.remove(filename)
+                self._notify('delete', filename)
+                continue
+            try:
+                record = self.get_record(filename)
+            except Exception as e:
+                # 文件可能正在写入，等待下一批事件
+                print(f"读取变化的文件失败: {filename}, {str(e)}")
+                continue
+            self._record_stat(filename)
+            if self._allocator is not None:
+                self._allocator.add(filename)
+            self._notify('save', filename)
+            if old is not None and record.meta_key() == old.meta_key():
+                continue  # 元数据没变（如本程序自己保存的文件），正文由缓存按文件状态自动更新
+            meta = record.to_meta()
+            self.index.put(filename, meta)
+            deltas.append((filename, old_group, _group_key(meta)))
+        return deltas
+
+    def load_all_json_data(self) -> List[PromptRecord]:
+        """加载所有提示词的元数据记录（name/group/shortcut）
+        正文不再整体驻留内存，需要时用get_record或get_content读取
+        """
+        if self.storage is not None:
+            return [PromptRecord.meta(**meta) for _, meta in self.storage.iter_meta()]
+        self.ensure_index()
+        return list(self.index.records.values())
+
+    def get_meta(self, filename: str) -> Optional[PromptRecord]:
+        """获取单个提示词的元数据记录，不读取正文"""
+        if self.storage is not None:
+            meta = self.storage.load_meta(filename)
+            return PromptRecord.meta(**meta) if meta is not None else None
+        self.ensure_index()
+        return self.index.get(filename)
+
+    def get_content(self, filename: str) -> str:
+        """按需读取单个提示词的正文"""
+        return self.get_record(filename).get('content', '')
+
+    def get_all_groups(self) -> List[str]:
+        """获取所有分组"""
+        if self.storage is not None:
+            return self.storage.get_all_groups()
+        self.ensure_index()
+        return self.index.get_groups()  # 排序返回，保证顺序一致
+
+    def get_record(self, filename: str) -> PromptRecord:
+        """读取单个提示词的完整记录（经过解析缓存）
+        返回的记录与缓存共享，只用于读取；需要修改后保存时请用read_prompt
+        文件不存在或格式错误时抛出异常，由调用方处理
+        """
+        if self.storage is not None:
+            return PromptRecord.from_dict(self.storage.load(filename))
+        return self.file_cache.load(self.get_data_path(filename))
+
+    def read_prompt(self, filename: str) -> Dict:
+        """读取单个提示词文件，返回可修改的字典（字段与磁盘上的JSON一致）
+        文件不存在或格式错误时抛出异常，由调用方处理
+        """
+        if self.storage is not None:
+            return self.storage.load(filename)
+        return self.file_cache.load(self.get_data_path(filename)).to_dict()
+
+    def save_prompt(self, filename: str, data):
+        """保存提示词数据到文件，data可以是字典或PromptRecord"""
+        if isinstance(data, PromptRecord):
+            data = data.to_dict()
+        if self._allocator is not None:
+            self._allocator.add(filename)
+        self._capture_history_base(filename)
+        if self.storage is not None:
+            self.storage.save(filename, data)
+        else:
+            self._write_prompt_file(filename, data)
+            self._register_saved(filename, data)
+        if self.history is not None:
+            self.history.record(filename, data)
+        self._notify('save', filename)
+
+    def save_prompts(self, items: List[Tuple[str, Dict]], max_workers: int = 8) -> List[Tuple[str, str]]:
+        """批量保存提示词，返回失败的 [(文件名, 错误信息), ...]
+        JSON目录下文件写入在线程池中并行执行，索引和缓存在调用线程中统一更新；
+        SQLite存储在一个事务中写入
+        """
+        if not items:
+            return []
+        for filename, _ in items:
+            self._capture_history_base(filename)
+        if self.storage is not None:
+            try:
+                self.storage.save_many(items)
+            except Exception as e:
+                return [(filename, str(e)) for filename, _ in items]
+            for filename, data in items:
+                if self._allocator is not None:
+                    self._allocator.add(filename)
+                if self.history is not None:
+                    self.history.record(filename, data)
+                self._notify('save', filename)
+            return []
+        errors = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+            futures = [(filename, data, executor.submit(self._write_prompt_file, filename, data))
+                       for filename, data in items]
+            for filename, data, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append((filename, str(e)))
+                    continue
+                if self._allocator is not None:
+                    self._allocator.add(filename)
+                self._register_saved(filename, data)
+                if self.history is not None:
+                    self.history.record(filename, data)
+                self._notify('save', filename)
+        return errors
+
+    def _capture_history_base(self, filename: str):
+        """第一次修改没有历史记录的已有提示词时，先把修改前的内容记为第一个版本"""
+        if self.history is None or self.history.has_history(filename):
+            return
+        try:
+            old = self.read_prompt(filename)
+        except Exception:
+            return  # 新建的提示词
+        self.history.record(filename, old)
+
+    def restore_revision(self, filename: str, rev: int):
+        """把提示词恢复到历史中的指定版本（恢复本身也会记为一个新版本）"""
+        if self.history is None:
+            raise RuntimeError("版本历史未启用")
+        self.save_prompt(filename, self.history.get_revision(filename, rev))
+
+    def _write_prompt_file(self, filename: str, data: Dict):
+        """只负责把数据写入文件，不访问索引，可在工作线程中调用
+        先写临时文件再替换，中途崩溃不会留下写了一半的提示词
+        """
+        _write_json_atomic(self.get_data_path(filename), data, indent=4)
+
+    def _register_saved(self, filename: str, data: Dict):
+        """文件写入后同步解析缓存、索引和启动清单，并删除该文件名的占位文件"""
+        if filename in self._claims:
+            self._drop_claim(filename)
+        self.file_cache.put(self.get_data_path(filename), data)
+        if self._index_ready:
+            self.index.put(filename, PromptRecord.meta(
+                str(data.get('name', '')), str(data.get('group', '')), str(data.get('shortcut', ''))))
+            self._record_stat(filename)
+
+    def get_files_by_group(self, group: str) -> List[str]:
+        """获取指定分组的所有文件"""
+        if self.storage is not None:
+            return self.storage.get_files_by_group(group)
+        self.ensure_index()
+        return self.index.get_files(group)
+
+    def cache_prompt(self, content: str, filename: Optional[str] = None):
+        """缓存提示词内容，filename用于统计ctrl+b的使用次数"""
+        self.cached_prompt_file = filename
+        cache_path = self.get_data_path('cache_prompt.txt')
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def read_cached_prompt(self) -> str:
+        """读取缓存的提示词"""
+        try:
+            cache_path = self.get_data_path('cache_prompt.txt')
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except:
+            return ""
+            
+    def delete_prompt(self, filename: str):
+        """删除提示词文件"""
+        if self._allocator is not None:
+            self._allocator.remove(filename)
+        self.usage.forget(filename)
+        if self.storage is not None:
+            self.storage.delete(filename)
+            self._notify('delete', filename)
+            return
+        file_path = self.get_data_path(filename)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        self.file_cache.invalidate(file_path)
+        if self.index.remove(filename) is not None:
+            self._record_stat(filename)
+        self._notify('delete', filename)
+
+    def merge_prompts(self, keep: str, others: Iterable[str]) -> int:
+        """把others合并到keep：others中有值而keep中为空的字段补到keep，然后删除others
+        返回删除的条数
+        """
+        data = self.read_prompt(keep)
+        merged = []
+        changed = False
+        for file in others:
+            if file == keep:
+                continue
+            try:
+                changed |= merge_fields(data, self.read_prompt(file))
+            except Exception as e:
+                print(f"读取待合并的提示词失败: {file}, {str(e)}")
+                continue
+            merged.append(file)
+        if changed:
+            self.save_prompt(keep, data)
+        for file in merged:
+            self.delete_prompt(file)
+        return len(merged)
+
+    def get_all_files(self) -> List[str]:
+        """获取所有JSON文件"""
+        if self.storage is not None:
+            return self.storage.get_all_files()
+        self.ensure_index()
+        return self.index.get_all_files()
+
+    def export_prompts(self, export_path: str, fmt: Optional[str] = None) -> int:
+        """导出所有提示词到指定路径，逐条读取逐条写入，内存占用与库的大小无关
+        fmt: 'json'（JSON数组，默认）或 'jsonl'（每行一条），不指定时按扩展名判断
+        返回导出的条数；先写入临时文件，全部写完才替换目标文件，中途出错时不会留下不完整的导出文件
+        """
+        fmt = fmt or detect_format(export_path)
+        writer_cls = JsonLinesWriter if fmt == FORMAT_JSONL else JsonArrayWriter
+        tmp_path = f"{export_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f, writer_cls(f) as writer:
+                count = writer.write_all(self._iter_export_records())
+            os.replace(tmp_path, export_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return count
+
+    def _iter_export_records(self) -> Iterator[Dict]:
+        if self.storage is not None:
+            for _, data in self.storage.iter_records():
+                yield data
+            return
+        for file in self.get_all_files():
+            try:
+                yield self.read_prompt(file)
+            except Exception as e:
+                print(f"导出文件错误: {file}, {str(e)}")
+
+    def import_prompts(self, import_path: str, fmt: Optional[str] = None, batch_size: int = 500,
+                       dedup: str = 'skip') -> ImportReport:
+        """从指定文件导入提示词，逐条解析，按batch_size条一批并行写入
+        fmt: 'json'（JSON数组）或 'jsonl'（每行一条），不指定时按扩展名判断
+        dedup: 正文重复时 'skip' 跳过 | 'merge' 合并空字段到已有提示词 | 'off' 照常新增
+        返回导入报告（新增/跳过/合并/失败条数和各阶段耗时）
+        """
+        fmt = fmt or detect_format(import_path)
+        pipeline = ImportPipeline(self, dedup=dedup, batch_size=batch_size,
+                                  max_workers=int(self.config.get('import_workers', 8)))
+        try:
+            with open(import_path, 'r', encoding='utf-8') as f:
+                records = iter_json_lines(f) if fmt == FORMAT_JSONL else iter_json_array(f)
+                report = pipeline.run(records)
+        except Exception as e:
+            print(f"导入文件错误: {str(e)}")
+            report = pipeline.report
+        print(report.summary())
+        return report
+
+    def backup_data(self, mode: Optional[str] = None):
+        """备份所有数据
+        mode: 'zip'（每次一个完整压缩包，默认）或 'incremental'（内容寻址的增量快照），
+        不指定时使用配置项backup_mode；SQLite存储始终使用数据库在线备份
+        返回增量快照的ID，其他方式返回None
+        """
+        backup_dir = os.path.join(self.data_dir, 'backup')
+        if not os.path.exists(backup_dir):
+            os.makedirs(backup_dir)
+            
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        if self.storage is not None:
+            self.storage.backup_to(os.path.join(backup_dir, f'backup_{timestamp}.db'))
+            return None
+        if (mode or self.config.get('backup_mode', 'zip')) == 'incremental':
+            snapshot_id, stats = self.get_backup_manager().create_snapshot()
+            print(f"增量备份完成: {snapshot_id}, 共 {stats['files']} 个文件, "
+                  f"新增 {stats['new_blobs']} 个blob ({stats['bytes']} 字节)")
+            return snapshot_id
+        backup_file = os.path.join(backup_dir, f'backup_{timestamp}.zip')
+        
+        with zipfile.ZipFile(backup_file, 'w') as zf:
+            for file in self.get_all_files():
+                zf.write(self.get_data_path(file), file)
+        return None
+
+    def get_backup_manager(self) -> BackupManager:
+        """数据目录对应的增量备份管理器"""
+        return BackupManager(self.data_dir, extension=self.file_extension, recursive=self.include_subdirs)
+
+    def restore_backup(self, snapshot_id: str, delete_extra: bool = False) -> Dict[str, int]:
+        """把增量快照恢复到数据目录，之后重建索引"""
+        stats = self.get_backup_manager().restore(snapshot_id, delete_extra=delete_extra)
+        self.file_cache.clear()
+        self._index_ready = False
+        self.ensure_index()
+        return stats
+
+    def get_statistics(self, top_k: int = 10) -> Dict:
+        """获取提示词统计信息
+        分组数量一次遍历得到；most_used_prompts为使用次数最多的top_k个 [(文件名, 名称, 次数), ...]
+        """
+        stats = {
+            'total_prompts': 0,
+            'total_groups': 0,
+            'prompts_by_group': {},
+            'most_used_prompts': []
+        }
+        
+        # 统计总数和分组数据
+        if self.storage is not None:
+            counts = self.storage.count_by_group()
+        else:
+            self.ensure_index()
+            counts = {group: len(files) for group, files in self.index.groups.items() if group}
+        stats['total_groups'] = len(counts)
+        stats['total_prompts'] = sum(counts.values())
+        stats['prompts_by_group'] = dict(sorted(counts.items()))
+        
+        existing = set(self.get_all_files())
+        for file, count in self.usage.top_k(top_k, existing):
+            meta = self.get_meta(file)
+            stats['most_used_prompts'].append((file, meta.name if meta is not None else file, count))
+            
+        return stats
+
+    def record_usage(self, filename: Optional[str], source: str):
+        """记录一次提示词使用（复制到剪贴板），可在热键回调线程中调用"""
+        if filename:
+            self.usage.record(filename, source)
+
+    def get_safe_filename(self, name: str) -> str:
+        """生成安全且不重复的文件名（移除非法字符）
+        文件名会立即被占用（JSON目录下创建 文件名.claim 占位文件，SQLite存储中预留），
+        调用方应随后用save_prompt写入，放弃使用时调用release_filename；同名并发创建时各自得到不同的文件名
+        """
+        # 移除或替换不安全的字符
+        safe_name = re.sub(r'\W+', '_', name)
+        return self._get_allocator().allocate(safe_name)
+
+    def release_filename(self, filename: str):
+        """放弃get_safe_filename分配但未写入的文件名，解除占用"""
+        if self._allocator is not None:
+            self._allocator.remove(filename)
+        if self.storage is not None:
+            self.storage.release(filename)
+        else:
+            self._drop_claim(filename)
+
+    def _get_allocator(self) -> FilenameAllocator:
+        """首次分配文件名时根据已有文件建立分配器"""
+        if self._allocator is None:
+            if self.storage is not None:
+                claim = self.storage.reserve
+            else:
+                claim = self._claim_file
+            allocator = FilenameAllocator(self.file_extension, claim)
+            for filename in self.get_all_files():
+                allocator.add(filename)
+            self._allocator = allocator
+        return self._allocator
+
+    def _claim_file(self, filename: str) -> bool:
+        """用O_CREAT|O_EXCL原子地创建占位文件，已被占用或文件已存在时返回False"""
+        path = self.get_data_path(filename)
+        try:
+            fd = os.open(path + CLAIM_SUFFIX, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        os.close(fd)
+        if os.path.exists(path):
+            # 其他进程已保存了同名文件（占位已删除）
+            os.remove(path + CLAIM_SUFFIX)
+            return False
+        self._claims.add(filename)
+        return True
+
+    def _drop_claim(self, filename: str):
+        """删除本进程创建的占位文件"""
+        self._claims.discard(filename)
+        try:
+            os.remove(self.get_data_path(filename) + CLAIM_SUFFIX)
+        except OSError:
+            pass
+
+    def _remove_stale_claims(self):
+        """清除数据目录顶层遗留的占位文件（程序崩溃等原因没有删除的）"""
+        cutoff = time.time() - CLAIM_MAX_AGE
+        try:
+            with os.scandir(self.data_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(CLAIM_SUFFIX) and entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError as e:
+            logging.error(f"清除占位文件失败: {str(e)}")
+
+    def get_hotkeys_prompts(self) -> List[PromptRecord]:
+        """获取所有带快捷键的提示词记录（不含ctrl+*占位）"""
+        return [record for _, record in self.get_hotkeys_items()]
+
+    def get_hotkeys_items(self) -> List[Tuple[str, PromptRecord]]:
+        """获取所有带快捷键的 [(文件名, 提示词记录), ...]（不含ctrl+*占位）"""
+        items = []
+        # 索引中只有元数据，正文按需读取（设置了快捷键的通常只有少数几个）
+        for file, _ in self.get_hotkey_files():
+            try:
+                items.append((file, self.get_record(file)))
+            except Exception as e:
+                print(f"读取文件 {file} 出错: {str(e)}")
+        return items
+
+    def get_hotkey_files(self, group: Optional[str] = None) -> List[Tuple[str, str]]:
+        """从索引获取设置了快捷键（不含ctrl+*占位）的 [(文件名, 快捷键), ...]，可限定分组"""
+        if self.storage is not None:
+            return self.storage.get_shortcut_files(group)
+        self.ensure_index()
+        files = self.index.get_files(group) if group is not None else self.index.get_all_files()
+        result = []
+        for file in files:
+            shortcut = self.index.records[file].shortcut
+            if shortcut and shortcut != SHORTCUT_PLACEHOLDER:
+                result.append((file, shortcut))
+        return result
+
+    def clear_all_hotkeys(self) -> int:
+        """清空所有提示词的快捷键，只改写真正设置了快捷键的文件，返回修改的条数"""
+        return self.update_shortcuts({file: '' for file, _ in self.get_hotkey_files()})
+
+    def clear_hotkeys_by_group(self, group: str) -> int:
+        """清空指定分组中所有提示词的快捷键，返回修改的条数"""
+        return self.update_shortcuts({file: '' for file, _ in self.get_hotkey_files(group)})
+
+    def reassign_hotkeys(self, mapping: Dict[str, str]) -> int:
+        """批量替换快捷键，mapping: 原快捷键 -> 新快捷键（新快捷键为''表示清空）
+        返回修改的条数
+        """
+        changes = {}
+        for file, shortcut in self.get_hotkey_files():
+            new_shortcut = mapping.get(shortcut)
+            if new_shortcut is not None and new_shortcut != shortcut:
+                changes[file] = new_shortcut
+        return self.update_shortcuts(changes)
+
+    def update_shortcuts(self, changes: Dict[str, str]) -> int:
+        """批量修改快捷键，changes: 文件名 -> 新快捷键，返回修改的条数
+        JSON目录下先把本批每个文件的原快捷键写入回滚日志，再逐个原子地改写文件，全部成功后才删除日志；
+        有文件改写失败时立即按日志把已改写的文件恢复原样并返回0，中途崩溃时下次建立索引前恢复；
+        批量修改只改快捷键，不为每个文件记录版本历史
+        """
+        if not changes:
+            return 0
+        if self.storage is not None:
+            return self.storage.update_shortcuts(changes)
+        # 原快捷键从文件读取（而不是索引），索引中还没有的文件也能记入日志；读取失败的文件不改写
+        journal = {}
+        updated = {}
+        for file, shortcut in changes.items():
+            try:
+                data = self.read_prompt(file)
+            except Exception as e:
+                print(f"修改快捷键时出错: {file}, {str(e)}")
+                continue
+            journal[file] = data.get('shortcut', '')
+            data['shortcut'] = shortcut
+            updated[file] = data
+        if not updated:
+            return 0
+        journal_path = self.get_data_path(SHORTCUT_JOURNAL)
+        _write_json_atomic(journal_path, {'version': 1, 'shortcuts': journal})
+        for file, data in updated.items():
+            try:
+                self._write_prompt_file(file, data)
+                self._register_saved(file, data)
+                self._notify('save', file)
+            except Exception as e:
+                print(f"修改快捷键时出错: {file}, {str(e)}，撤销本次修改")
+                self.recover_shortcut_journal()
+                return 0
+        os.remove(journal_path)
+        return len(updated)
+
+    def recover_shortcut_journal(self):
+        """批量修改快捷键没有全部完成时（逐个改写文件的中途崩溃或改写失败），按回滚日志恢复原来的快捷键
+        日志中的文件可能只有一部分已被改写，快捷键已是原值的文件跳过；
+        全部恢复成功后才删除日志，否则保留到下次建立索引时再试
+        """
+        journal_path = self.get_data_path(SHORTCUT_JOURNAL)
+        if not os.path.exists(journal_path):
+            return
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                journal = json.load(f).get('shortcuts', {})
+        except Exception as e:
+            # 日志是原子写入的，读不出来只可能是被外部改坏了，无法得知原快捷键，只能丢弃
+            print(f"读取快捷键回滚日志失败: {str(e)}")
+            os.remove(journal_path)
+            return
+        restored = 0
+        failed = 0
+        for file, shortcut in journal.items():
+            try:
+                with open(self.get_data_path(file), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('shortcut') != shortcut:
+                    data['shortcut'] = shortcut
+                    self._write_prompt_file(file, data)
+                    self._register_saved(file, data)
+                    self._notify('save', file)
+                    restored += 1
+            except FileNotFoundError:
+                continue  # 文件已被删除，不需要恢复
+            except Exception as e:
+                failed += 1
+                print(f"恢复快捷键失败: {file}, {str(e)}")
+        if failed:
+            print(f"批量修改快捷键未完成，已恢复 {restored} 个文件，{failed} 个文件将在下次启动时重试")
+            return
+        os.remove(journal_path)
+        print(f"批量修改快捷键未完成，已恢复 {restored} 个文件")
@@ -0,0 +1,86 @@
+"""
+目录扫描模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 基于os.scandir的惰性遍历，支持子目录和自定义扩展名
+- 添加is_prompt_file，目录监听等逐个得到的文件名使用与遍历相同的跳过规则
+"""
+
+import os
+import logging
+from typing import Iterator, Tuple
+
+# 数据目录顶层中不属于提示词库的子目录（备份等）
+SKIP_DIRS = {'backup'}
+
+
+def scan_prompt_files(root: str, extension: str = '.json',
+                      recursive: bool = True) -> Iterator[Tuple[str, os.DirEntry]]:
+    """惰性遍历数据目录，逐个产出 (相对路径, DirEntry)
+    - 相对路径统一使用'/'分隔，作为提示词的文件名使用
+    - DirEntry自带的类型和stat信息可直接复用（Windows下不需要额外的系统调用）
+    - 跳过隐藏目录、符号链接目录以及SKIP_DIRS中的目录
+    """
+    stack = [('', root)]
+    while stack:
+        prefix, path = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and _wanted_dir(prefix, entry.name):
+                                subdirs.append((prefix + entry.name + '/', entry.path))
+                        elif entry.name.endswith(extension) and entry.is_file():
+                            yield prefix + entry.name, entry
+                    except OSError:
+                        continue
+        except OSError as e:
+            logging.error(f"扫描目录失败: {path}, {str(e)}")
+        # 倒序入栈，保证按目录顺序深度优先遍历
+        stack.extend(reversed(subdirs))
+
+
+def scan_prompt_dirs(root: str, recursive: bool = True) -> Iterator[Tuple[str, str]]:
+    """遍历需要监听的目录，产出 (相对前缀, 完整路径)，包含根目录本身（前缀为''）"""
+    yield '', root
+    if not recursive:
+        return
+    stack = [('', root)]
+    while stack:
+        prefix, path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False) and _wanted_dir(prefix, entry.name):
+                        sub = (prefix + entry.name + '/', entry.path)
+                        yield sub
+                        stack.append(sub)
+        except OSError as e:
+            logging.error(f"扫描目录失败: {path}, {str(e)}")
+
+
+def is_prompt_file(filename: str, extension: str = '.json', recursive: bool = True) -> bool:
+    """相对路径filename（'/'分隔）是否是scan_prompt_files会产出的提示词文件
+    路径中的每一级目录都按遍历时的规则检查（隐藏目录、SKIP_DIRS）
+    """
+    if not filename.endswith(extension):
+        return False
+    parts = filename.split('/')
+    if len(parts) > 1 and not recursive:
+        return False
+    prefix = ''
+    for name in parts[:-1]:
+        if not _wanted_dir(prefix, name):
+            return False
+        prefix += name + '/'
+    return True
+
+
+def _wanted_dir(prefix: str, name: str) -> bool:
+    if name.startswith('.'):
+        return False
+    return not (prefix == '' and name in SKIP_DIRS)
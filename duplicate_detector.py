@@ -0,0 +1,195 @@
+"""
+近似重复检测模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 按字符切分shingle（k个连续字符），中文没有空格也能直接使用
+- 单次哈希的MinHash签名（One Permutation Hashing + 旋转补齐空桶），每条提示词只需遍历一次shingle
+- LSH分段分桶找候选对，不做两两比较，可处理十万级提示词
+- 并查集把相似对合并成簇
+
+用法：
+    python duplicate_detector.py data --threshold 0.8
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64
+# 空桶补齐时使用的偏移（任意奇数常量），保证补齐值不会与真实值系统性相等
+_ROTATION_OFFSET = 0x9E3779B97F4A7C15
+# 同一个桶里成员超过这个数量时不再两两比较，只与桶内第一个成员比较
+_MAX_PAIRWISE_BUCKET = 50
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """规范化：小写并把连续空白压缩为一个空格"""
+    return _SPACES.sub(' ', text.lower()).strip()
+
+
+def shingle_hashes(text: str, k: int = 3) -> set:
+    """字符级shingle的64位哈希集合；文本短于k时整段作为一个shingle"""
+    text = normalize_text(text)
+    if not text:
+        return set()
+    if len(text) <= k:
+        return {hash(text) & _MASK64}
+    return {hash(text[i:i + k]) & _MASK64 for i in range(len(text) - k + 1)}
+
+
+def minhash_signature(hashes: Iterable[int], num_perm: int = 128) -> Tuple[int, ...]:
+    """一次哈希得到num_perm维MinHash签名
+    哈希值按 h % num_perm 分到各个桶，每个桶取最小值；
+    空桶用右侧第一个非空桶的值补齐（加上与距离相关的偏移），短文本也能得到完整签名
+    """
+    sig = [_EMPTY] * num_perm
+    for h in hashes:
+        b = h % num_perm
+        v = h // num_perm
+        if v < sig[b]:
+            sig[b] = v
+    if _EMPTY in sig and any(v != _EMPTY for v in sig):
+        # 从右向左扫两圈，记录每个位置右侧（循环）最近的非空桶
+        filled = list(sig)
+        next_pos = next_val = None
+        for i in range(2 * num_perm - 1, -1, -1):
+            value = sig[i % num_perm]
+            if value != _EMPTY:
+                next_pos, next_val = i, value
+            elif i < num_perm and next_pos is not None:
+                filled[i] = (next_val + (next_pos - i) * _ROTATION_OFFSET) & _MASK64
+        sig = filled
+    return tuple(sig)
+
+
+def estimate_similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+    """由签名估计Jaccard相似度"""
+    return sum(1 for a, b in zip(sig1, sig2) if a == b) / len(sig1)
+
+
+def choose_bands(num_perm: int, threshold: float) -> int:
+    """选择LSH分段数：每段r行、共b段时，相似度为(1/b)^(1/r)左右的两条记录有一半概率成为候选，
+    取该值不超过阈值的最大者，尽量少漏掉真正的重复
+    """
+    best = num_perm
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1.0 / bands) ** (1.0 / rows) <= threshold:
+            best = bands
+    return best
+
+
+class NearDuplicateFinder:
+    """近似重复检测
+    add()逐条加入文本（只保留签名，不保留shingle集合），clusters()返回相似度不低于threshold的簇
+    """
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3,
+                 bands: Optional[int] = None):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands = bands or choose_bands(num_perm, threshold)
+        self.rows = num_perm // self.bands
+        self.keys: List[str] = []
+        self.signatures: List[Tuple[int, ...]] = []
+        self._buckets: Dict[tuple, List[int]] = {}
+
+    def add(self, key: str, text: str):
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes:
+            return
+        sig = minhash_signature(hashes, self.num_perm)
+        doc_id = len(self.keys)
+        self.keys.append(key)
+        self.signatures.append(sig)
+        for band in range(self.bands):
+            start = band * self.rows
+            self._buckets.setdefault((band, sig[start:start + self.rows]), []).append(doc_id)
+
+    def clusters(self) -> List[List[Tuple[str, float]]]:
+        """返回近似重复的簇 [[(文件名, 与簇中第一项的相似度), ...], ...]，按簇大小降序"""
+        parent = list(range(len(self.keys)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        checked = set()
+        for members in self._buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) <= _MAX_PAIRWISE_BUCKET:
+                pairs = ((a, b) for i, a in enumerate(members) for b in members[i + 1:])
+            else:
+                pairs = ((members[0], b) for b in members[1:])
+            for a, b in pairs:
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                ra, rb = find(a), find(b)
+                if ra == rb:
+                    continue
+                if estimate_similarity(self.signatures[a], self.signatures[b]) >= self.threshold:
+                    parent[max(ra, rb)] = min(ra, rb)
+
+        groups: Dict[int, List[int]] = {}
+        for doc_id in range(len(self.keys)):
+            groups.setdefault(find(doc_id), []).append(doc_id)
+        result = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            members.sort(key=lambda d: self.keys[d])
+            first = self.signatures[members[0]]
+            result.append([(self.keys[d], estimate_similarity(first, self.signatures[d])) for d in members])
+        result.sort(key=lambda cluster: (-len(cluster), cluster[0][0]))
+        return result
+
+
+def find_library_duplicates(data_manager, threshold: float = 0.8,
+                            num_perm: int = 128) -> List[List[Tuple[str, float]]]:
+    """检测提示词库中正文近似重复的簇"""
+    finder = NearDuplicateFinder(threshold=threshold, num_perm=num_perm)
+    if data_manager.storage is not None:
+        for file, data in data_manager.storage.iter_records():
+            finder.add(file, str(data.get('content', '') or ''))
+    else:
+        for file in data_manager.get_all_files():
+            try:
+                finder.add(file, str(data_manager.get_content(file) or ''))
+            except Exception as e:
+                print(f"读取文件出错: {file}, {str(e)}")
+    return finder.clusters()
+
+
+if __name__ == '__main__':
+    import argparse
+    from dir_scanner import scan_prompt_files
+    import json
+
+    parser = argparse.ArgumentParser(description="检测提示词库中的近似重复")
+    parser.add_argument('data_dir')
+    parser.add_argument('--threshold', type=float, default=0.8, help="相似度阈值（0~1）")
+    args = parser.parse_args()
+
+    finder = NearDuplicateFinder(threshold=args.threshold)
+    for file, entry in scan_prompt_files(args.data_dir):
+        try:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                finder.add(file, str(json.load(f).get('content', '') or ''))
+        except Exception as e:
+            print(f"读取文件出错: {file}, {str(e)}")
+    clusters = finder.clusters()
+    for i, cluster in enumerate(clusters, 1):
+        print(f"簇 {i}（{len(cluster)} 个）:")
+        for file, similarity in cluster:
+            print(f"    {similarity:.2f}  {file}")
+    print(f"共 {len(clusters)} 个近似重复簇")
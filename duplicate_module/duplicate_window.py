@@ -0,0 +1,225 @@
+"""
+近似重复检查窗口模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 在后台线程中检测近似重复的提示词，结果按簇显示
+- 支持合并选中簇、删除选中项、每簇只保留一个（批量）
+- 合并或删除后通过callback通知主界面刷新列表
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from duplicate_detector import find_library_duplicates
+
+
+class DuplicateWindow:
+    def __init__(self, parent, data_manager, callback=None):
+        self.window = tk.Toplevel(parent)
+        self.window.title("近似重复检查")
+        self.data_manager = data_manager
+        self.callback = callback  # 合并或删除提示词后调用，用于刷新主界面
+        self.clusters = []
+        self._results = queue.Queue()
+
+        # 绑定右键双击事件到窗口
+        self.window.bind('<Double-Button-3>', lambda e: self.window.destroy())
+
+        self.setup_ui()
+        self.start_scan()
+
+    def setup_ui(self):
+        """设置UI界面"""
+        main_frame = ttk.Frame(self.window)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # 顶部：阈值和检测按钮
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(top_frame, text="相似度阈值:").pack(side=tk.LEFT)
+        self.threshold_var = tk.StringVar(value="0.8")
+        ttk.Entry(top_frame, textvariable=self.threshold_var, width=6).pack(side=tk.LEFT, padx=5)
+        self.scan_button = ttk.Button(top_frame, text="重新检测", command=self.start_scan)
+        self.scan_button.pack(side=tk.LEFT, padx=5)
+        self.status_label = ttk.Label(top_frame, text="", foreground='blue')
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        # 列表框架：簇列表、簇内文件列表、内容预览
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.cluster_list = tk.Listbox(list_frame, width=40, selectmode=tk.SINGLE, exportselection=False)
+        self.cluster_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        self.cluster_list.bind('<<ListboxSelect>>', self.on_cluster_select)
+        cluster_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.cluster_list.yview)
+        cluster_scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        self.cluster_list.config(yscrollcommand=cluster_scrollbar.set)
+
+        # 簇内文件 - 支持Ctrl和Shift多选
+        self.file_list = tk.Listbox(list_frame, width=50, selectmode=tk.EXTENDED, exportselection=False)
+        self.file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        self.file_list.bind('<<ListboxSelect>>', self.on_file_select)
+
+        self.preview = tk.Text(list_frame, width=60, wrap=tk.WORD)
+        self.preview.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0))
+
+        # 按钮框架
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="合并选中簇", command=self.merge_selected_cluster).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="删除选中项", command=self.delete_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="每簇只保留一个", command=self.merge_all_clusters).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="关闭", command=self.window.destroy).pack(side=tk.LEFT, padx=5)
+
+        tip_label = ttk.Label(main_frame,
+                              text="合并时保留簇内选中的第一项（未选中时保留第一项），其余项的非空字段补到保留项后删除",
+                              foreground='blue')
+        tip_label.pack(pady=5)
+
+    def start_scan(self):
+        """在后台线程中检测，避免大库时界面卡住"""
+        try:
+            threshold = float(self.threshold_var.get())
+        except ValueError:
+            messagebox.showwarning("警告", "阈值必须是0~1之间的数字", parent=self.window)
+            return
+        if not 0 < threshold <= 1:
+            messagebox.showwarning("警告", "阈值必须是0~1之间的数字", parent=self.window)
+            return
+        self.scan_button.config(state=tk.DISABLED)
+        self.status_label.config(text="正在检测...")
+
+        def scan():
+            try:
+                self._results.put(find_library_duplicates(self.data_manager, threshold))
+            except Exception as e:
+                self._results.put(e)
+
+        threading.Thread(target=scan, daemon=True).start()
+        self.window.after(100, self.poll_scan_result)
+
+    def poll_scan_result(self):
+        """检查后台检测是否完成"""
+        if not self.window.winfo_exists():
+            return
+        try:
+            result = self._results.get_nowait()
+        except queue.Empty:
+            self.window.after(100, self.poll_scan_result)
+            return
+        self.scan_button.config(state=tk.NORMAL)
+        if isinstance(result, Exception):
+            self.status_label.config(text="")
+            messagebox.showerror("错误", f"检测失败: {str(result)}", parent=self.window)
+            return
+        self.clusters = result
+        self.refresh_clusters()
+
+    def refresh_clusters(self):
+        """刷新簇列表"""
+        self.cluster_list.delete(0, tk.END)
+        self.file_list.delete(0, tk.END)
+        self.preview.delete('1.0', tk.END)
+        for i, cluster in enumerate(self.clusters, 1):
+            self.cluster_list.insert(tk.END, f"簇{i}（{len(cluster)}个）{cluster[0][0]}")
+        total = sum(len(cluster) for cluster in self.clusters)
+        self.status_label.config(text=f"共 {len(self.clusters)} 个簇，涉及 {total} 个提示词")
+        if self.clusters:
+            self.cluster_list.select_set(0)
+            self.on_cluster_select(None)
+
+    def selected_cluster(self):
+        selection = self.cluster_list.curselection()
+        return selection[0] if selection else None
+
+    def on_cluster_select(self, event):
+        """显示选中簇的文件"""
+        index = self.selected_cluster()
+        if index is None:
+            return
+        self.file_list.delete(0, tk.END)
+        for file, similarity in self.clusters[index]:
+            self.file_list.insert(tk.END, f"{similarity:.2f}  {file}")
+        self.file_list.select_set(0)
+        self.on_file_select(None)
+
+    def on_file_select(self, event):
+        """预览选中文件的内容"""
+        index = self.selected_cluster()
+        selection = self.file_list.curselection()
+        if index is None or not selection:
+            return
+        file = self.clusters[index][selection[0]][0]
+        self.preview.delete('1.0', tk.END)
+        try:
+            self.preview.insert('1.0', self.data_manager.get_content(file))
+        except Exception as e:
+            self.preview.insert('1.0', f"读取失败: {str(e)}")
+
+    def merge_selected_cluster(self):
+        """合并选中的簇"""
+        index = self.selected_cluster()
+        if index is None:
+            return
+        files = [file for file, _ in self.clusters[index]]
+        selection = self.file_list.curselection()
+        keep = files[selection[0]] if selection else files[0]
+        if not messagebox.askyesno("确认", f"保留 {keep}，合并并删除其余 {len(files) - 1} 项？",
+                                   parent=self.window):
+            return
+        try:
+            self.data_manager.merge_prompts(keep, files)
+        finally:
+            self.notify_changed()
+        del self.clusters[index]
+        self.refresh_clusters()
+
+    def merge_all_clusters(self):
+        """每个簇保留第一项，其余合并后删除"""
+        if not self.clusters:
+            return
+        count = sum(len(cluster) - 1 for cluster in self.clusters)
+        if not messagebox.askyesno("确认", f"每个簇只保留第一项，共将删除 {count} 个提示词，确定吗？",
+                                   parent=self.window):
+            return
+        deleted = 0
+        for cluster in self.clusters:
+            files = [file for file, _ in cluster]
+            try:
+                deleted += self.data_manager.merge_prompts(files[0], files)
+            except Exception as e:
+                print(f"合并失败: {files[0]}, {str(e)}")
+        self.notify_changed()
+        self.clusters = []
+        self.refresh_clusters()
+        messagebox.showinfo("完成", f"已删除 {deleted} 个重复的提示词", parent=self.window)
+
+    def delete_selected(self):
+        """删除簇内选中的文件"""
+        index = self.selected_cluster()
+        selection = self.file_list.curselection()
+        if index is None or not selection:
+            messagebox.showwarning("警告", "请选择要删除的提示词", parent=self.window)
+            return
+        if not messagebox.askyesno("确认", "确定要删除选中的提示词吗？", parent=self.window):
+            return
+        cluster = self.clusters[index]
+        try:
+            for i in selection:
+                self.data_manager.delete_prompt(cluster[i][0])
+        finally:
+            self.notify_changed()
+        remaining = [item for i, item in enumerate(cluster) if i not in selection]
+        if len(remaining) > 1:
+            self.clusters[index] = remaining
+        else:
+            del self.clusters[index]
+        self.refresh_clusters()
+
+    def notify_changed(self):
+        """提示词有增删改时通知主界面"""
+        if self.callback:
+            self.callback()
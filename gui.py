@@ -1,607 +1,814 @@
-"""
-GUI界面模块
-
-版本日志：
-v1.0 2024-03-xx
-- 初始版本
-- 实现基础GUI界面
-- 实现提示词编辑功能
-- 实现分组显示功能
-"""
-
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from config import FONT_SIZES, LAYOUT, BASE_JSON_TEMPLATE
-from search_manager import SearchManager
-import pyperclip
-import re
-import os
-import json
-
-class PromptAssistantGUI:
-    def __init__(self, root: tk.Tk, data_manager, hotkey_manager):
-        self.root = root
-        self.data_manager = data_manager
-        self.hotkey_manager = hotkey_manager
-        self.search_manager = SearchManager(data_manager)  # 添加搜索管理器
-        self.current_file = ""
-        self.select_group_list = []
-        
-        self.setup_ui()
-        self.init_data()
-        
-    def init_data(self):
-        """初始化数据"""
-        # 加载分组列表
-        groups = self.data_manager.get_all_groups()
-        for group in groups:
-            self.group_list.insert(tk.END, group)
-            
-        # 如果有分组，默认选中第一个分组载其文件
-        if groups:
-            self.group_list.select_set(0)
-            self.load_files_from_group(None)  # None 表示不是由事件触发
-            
-            # 如果有文件，默认选中第一个文件并加载
-            if self.file_list.size() > 0:
-                self.file_list.select_set(0)
-                self.load_file(None)  # None 表示不是由事件触发
-        
-    def setup_ui(self):
-        """设置UI界面"""
-        # 创建顶部按钮和状态栏区域
-        top_frame = ttk.Frame(self.root)
-        top_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
-        
-        # 左侧按钮组
-        left_button_frame = ttk.Frame(top_frame)
-        left_button_frame.pack(side=tk.LEFT)
-        
-        # 其他设置按钮 - 移到最左侧
-        self.settings_button = ttk.Button(
-            left_button_frame, 
-            text="其他设置",
-            command=self.open_settings
-        )
-        self.settings_button.pack(side=tk.LEFT, padx=5)
-        
-        # Delete按钮
-        self.delete_button = ttk.Button(left_button_frame, text="Delete", command=self.show_delete_window)
-        self.delete_button.pack(side=tk.LEFT, padx=5)
-        
-        # 状态显示标签
-        self.label1 = ttk.Label(left_button_frame, text="当前选中的提示词", 
-                             font=("Arial", FONT_SIZES['status']))
-        self.label1.pack(side=tk.LEFT, padx=5)
-        
-        self.label2 = ttk.Label(left_button_frame, text="", background="light green", 
-                             width=LAYOUT['status_width'], 
-                             font=("Arial", FONT_SIZES['status']))
-        self.label2.pack(side=tk.LEFT, padx=5)
-        
-        # 右侧按钮组
-        right_button_frame = ttk.Frame(top_frame)
-        right_button_frame.pack(side=tk.RIGHT)
-        
-        # 功能按钮
-        self.hotkeys_button = ttk.Button(right_button_frame, text="独立专属快捷键", command=self.open_hotkeys_window)
-        self.hotkeys_button.pack(side=tk.LEFT, padx=5)
-        
-        self.high_freq_hotkey_button = ttk.Button(right_button_frame, text="高频快捷键管理", command=self.open_high_freq_hotkey_window)
-        self.high_freq_hotkey_button.pack(side=tk.LEFT, padx=5)
-        
-        self.add_button = tk.Button(right_button_frame, text="新建提示词")
-        self.add_button.pack(side=tk.LEFT, padx=5)
-        self.add_button.bind('<ButtonPress-1>', self.on_add_button_press)
-        self.add_button.bind('<ButtonRelease-1>', self.on_add_button_release)
-        
-        self.save_button = tk.Button(right_button_frame, text="保存修改")
-        self.save_button.pack(side=tk.LEFT, padx=5)
-        self.save_button.bind('<ButtonPress-1>', self.on_save_button_press)
-        self.save_button.bind('<ButtonRelease-1>', self.on_save_button_release)
-        
-        self.copy_button = ttk.Button(right_button_frame, text="Copy", command=self.copy_content)
-        self.copy_button.pack(side=tk.LEFT, padx=5)
-        
-        self.exit_button = ttk.Button(right_button_frame, text="退出", command=self.root.destroy)
-        self.exit_button.pack(side=tk.LEFT, padx=(20, 10))
-        
-        # 创建其他界面元素
-        self.create_search_frame()
-        self.create_list_frame()
-        self.create_content_frame()
-        
-    def create_search_frame(self):
-        """创建搜索框架"""
-        search_frame = tk.Frame(self.root)
-        search_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
-        
-        # 全局搜索
-        global_search_label = tk.Label(search_frame, text="全局搜索:")
-        global_search_label.pack(side=tk.LEFT)
-        
-        self.global_search_entry = tk.Entry(search_frame)
-        self.global_search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 20))
-        self.global_search_entry.bind('<KeyRelease>', self.on_global_search)
-        
-        # 分组搜索 - 修改标签文本
-        group_search_label = tk.Label(search_frame, text="当前分组搜索:")
-        group_search_label.pack(side=tk.LEFT)
-        
-        self.group_search_entry = tk.Entry(search_frame)
-        self.group_search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        self.group_search_entry.bind('<KeyRelease>', self.on_group_search)
-        
-    def create_list_frame(self):
-        """创建左侧列表框架"""
-        list_frame = tk.Frame(self.root)
-        list_frame.pack(side=tk.LEFT, fill=tk.Y, expand=True, anchor='w')
-        
-        # 分组列表
-        self.group_list = tk.Listbox(list_frame, width=LAYOUT['group_list_width'], 
-                                   font=('Arial', FONT_SIZES['list']))
-        self.group_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.group_list.bind('<<ListboxSelect>>', self.load_files_from_group)
-        
-        # 文件列表
-        self.file_list = tk.Listbox(list_frame, width=LAYOUT['file_list_width'], 
-                                  font=('Arial', FONT_SIZES['list']))
-        self.file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.file_list.bind('<<ListboxSelect>>', self.load_file)
-        
-    def create_content_frame(self):
-        """创建右侧内容框架"""
-        # 主框架
-        content_frame = tk.Frame(self.root)
-        content_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-        
-        # 创建可滚动的内容区域
-        # 使用PanedWindow来确保内容区域和按钮区域的分隔
-        paned = ttk.PanedWindow(content_frame, orient=tk.VERTICAL)
-        paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # 创建内容区域的容器
-        detail_container = ttk.Frame(paned)
-        paned.add(detail_container, weight=1)
-        
-        # 创建可滚动的文本区域
-        self.detail_text = tk.Text(detail_container, wrap=tk.WORD)
-        scrollbar = ttk.Scrollbar(detail_container, orient="vertical", command=self.detail_text.yview)
-        self.detail_text.configure(yscrollcommand=scrollbar.set)
-        
-        # 打包动条和文区域
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.detail_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # 创建内部Frame作为内容容器
-        self.detail_frame = ttk.Frame(self.detail_text)
-        self.detail_text.window_create("1.0", window=self.detail_frame)
-        
-        # 绑定鼠标滚轮事件到所有文本框和标签
-        def _on_mousewheel(event):
-            self.detail_text.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        # 为每个组件绑定滚轮事件
-        def bind_mousewheel(widget):
-            widget.bind("<MouseWheel>", _on_mousewheel)
-            # 递归绑定所有子组件
-            for child in widget.winfo_children():
-                bind_mousewheel(child)
-                # 特殊处理Text组件
-                if isinstance(child, tk.Text):
-                    child.bind("<MouseWheel>", lambda e: "break")  # 阻止Text组件的默认滚动行为
-        
-        # 绑定主容器及其所有子组件
-        bind_mousewheel(self.detail_frame)
-        
-        # 为detail_text本也绑定滚轮事件
-        self.detail_text.bind("<MouseWheel>", _on_mousewheel)
-        
-        # 提示词名称
-        name_frame = ttk.Frame(self.detail_frame)
-        name_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.name_label = ttk.Label(name_frame, text="Name:", font=('Arial', FONT_SIZES['name']))
-        self.name_label.pack(side=tk.TOP, anchor='w')
-        self.file_pname = tk.Text(name_frame, height=1, font=('Arial', FONT_SIZES['name']))
-        self.file_pname.pack(fill=tk.X, pady=2)
-        
-        # 分组
-        group_frame = ttk.Frame(self.detail_frame)
-        group_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.group_label = ttk.Label(group_frame, text="Group:", font=('Arial', FONT_SIZES['group']))
-        self.group_label.pack(side=tk.TOP, anchor='w')
-        self.file_pgroup = tk.Text(group_frame, height=1, font=('Arial', FONT_SIZES['group']))
-        self.file_pgroup.pack(fill=tk.X, pady=2)
-        
-        # 独立专属快捷键
-        shortcut_frame = ttk.Frame(self.detail_frame)
-        shortcut_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.shortcut_label = ttk.Label(shortcut_frame, text="独立专属快捷键:", font=('Arial', FONT_SIZES['shortcut']))
-        self.shortcut_label.pack(side=tk.TOP, anchor='w')
-        self.file_pshortcut = tk.Text(shortcut_frame, height=1, font=('Arial', FONT_SIZES['shortcut']))
-        self.file_pshortcut.pack(fill=tk.X, pady=2)
-        
-        # 备注
-        comment_frame = ttk.Frame(self.detail_frame)
-        comment_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.comment_label = ttk.Label(comment_frame, text="Comment:", font=('Arial', FONT_SIZES['comment']))
-        self.comment_label.pack(side=tk.TOP, anchor='w')
-        self.file_pcomment = tk.Text(comment_frame, height=3, font=('Arial', FONT_SIZES['comment']))
-        self.file_pcomment.pack(fill=tk.X, pady=2)
-        
-        # 修改content标签文本
-        self.content_label = ttk.Label(content_frame, 
-                                     text="双击content编辑区域进行放大编辑", 
-                                     font=('Arial', FONT_SIZES['content']))
-        self.content_label.pack(side=tk.TOP, anchor='w')
-        
-        # 内容
-        content_frame = ttk.Frame(self.detail_frame)
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        self.file_content = tk.Text(content_frame, height=24, font=('Arial', FONT_SIZES['content']))
-        self.file_content.pack(fill=tk.BOTH, expand=True, pady=2)
-        
-        # 禁用主Text组件的编辑功能
-        self.detail_text.configure(state='disabled')
-        
-        # 在所有组件创建完成后，再次绑定滚轮事件（确保新创建的组件都被绑定）
-        bind_mousewheel(self.detail_frame)
-        
-        # 在创建file_content后添加双击事件绑定
-        self.file_content.bind('<Double-Button-1>', self.open_edit_window)
-        
-    def load_files_from_group(self, event):
-        """从选中的分组加载文件"""
-        if not self.group_list.curselection():
-            return
-            
-        self.file_list.delete(0, tk.END)
-        group = self.group_list.get(self.group_list.curselection())
-        files = self.data_manager.get_files_by_group(group)
-        
-        for file in files:
-            self.file_list.insert(tk.END, file)
-        self.select_group_list = files
-        
-    def load_file(self, event):
-        """加载选中的文件"""
-        if (event is None and self.file_list.size() > 0) or (event and self.file_list.curselection()):
-            if event is None:
-                index = 0
-            else:
-                index = self.file_list.curselection()[0]
-            
-            file = self.file_list.get(index)
-            self.current_file = file
-            self.label2.config(text=file)
-            
-            self.clear_text_fields()
-            
-            try:
-                with open(self.data_manager.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"加载文件内容: {data}")
-                    self.fill_text_fields(data)
-                    # 更新缓存
-                    self.data_manager.cache_prompt(data['content'])
-                    
-                    # 如果当前有搜索关键词，立即高亮显示
-                    global_keyword = self.global_search_entry.get().strip()
-                    group_keyword = self.group_search_entry.get().strip()
-                    if global_keyword:
-                        self.highlight_text(global_keyword)
-                    elif group_keyword:
-                        self.highlight_text(group_keyword)
-                    
-            except Exception as e:
-                print(f"加载文件错误: {file}, {str(e)}")
-                messagebox.showerror("错误", f"加载文件失败: {str(e)}")
-            
-    def clear_text_fields(self):
-        """清空所有文本框"""
-        self.file_pname.delete('1.0', tk.END)
-        self.file_pgroup.delete('1.0', tk.END)
-        self.file_pshortcut.delete('1.0', tk.END)
-        self.file_pcomment.delete('1.0', tk.END)
-        self.file_content.delete('1.0', tk.END)
-        
-    def fill_text_fields(self, data):
-        """填充文本框"""
-        try:
-            self.clear_text_fields()
-            
-            self.file_pname.insert(tk.END, data.get('name', ''))
-            self.file_pgroup.insert(tk.END, data.get('group', ''))
-            self.file_pshortcut.insert(tk.END, data.get('shortcut', ''))
-            self.file_pcomment.insert(tk.END, data.get('comment', ''))
-            self.file_content.insert(tk.END, data.get('content', ''))
-            
-            print("文本框填充完成")
-        except Exception as e:
-            print(f"填充文本框错误: {str(e)}")
-        
-    def add_file(self):
-        """添加文件"""
-        name = self.file_pname.get("1.0", "end-1c").strip()
-        if not name:
-            return
-            
-        name1 = re.sub(r'\W+', '_', name)
-        
-        data = {
-            'name': name,
-            'group': self.file_pgroup.get("1.0", "end-1c").strip(),
-            'shortcut': self.file_pshortcut.get("1.0", "end-1c").strip(),
-            'comment': self.file_pcomment.get("1.0", "end-1c").strip(),
-            'content': self.file_content.get("1.0", "end-1c").strip(),
-            'add1': '', 'add2': '', 'add3': '', 'add4': '',
-            'add5': '', 'add6': '', 'add7': '', 'add8': ''
-        }
-        
-        filename = f"{name1}.json"
-        i = 0
-        while os.path.exists(self.data_manager.get_data_path(filename)):
-            i += 1
-            filename = f"{name1}_{i:04d}.json"
-        
-        try:
-            self.data_manager.save_prompt(filename, data)
-            # 保存到缓存
-            self.data_manager.cache_prompt(data['content'])
-            self.refresh_lists()
-        except Exception as e:
-            messagebox.showerror("错误", f"创建提示词失败：{str(e)}")
-        
-    def save_changes(self):
-        """保存修改"""
-        if not self.current_file:
-            return
-            
-        data = {
-            'name': self.file_pname.get("1.0", "end-1c").strip(),
-            'group': self.file_pgroup.get("1.0", "end-1c").strip(),
-            'shortcut': self.file_pshortcut.get("1.0", "end-1c").strip(),
-            'comment': self.file_pcomment.get("1.0", "end-1c").strip(),
-            'content': self.file_content.get("1.0", "end-1c").strip(),
-            'add1': '', 'add2': '', 'add3': '', 'add4': '',
-            'add5': '', 'add6': '', 'add7': '', 'add8': ''
-        }
-        
-        try:
-            self.data_manager.save_prompt(self.current_file, data)
-            # 保存到缓存
-            self.data_manager.cache_prompt(data['content'])
-        except Exception as e:
-            messagebox.showerror("错误", f"保存修改失败：{str(e)}")
-        
-    def delete_file(self):
-        """删除文件"""
-        if not self.file_list.curselection():
-            return
-            
-        file = self.file_list.get(self.file_list.curselection())
-        self.data_manager.delete_prompt(file)
-        self.refresh_lists()
-        
-    def copy_content(self):
-        """复制内容到剪贴板"""
-        content = self.file_content.get("1.0", tk.END)
-        pyperclip.copy(content)
-        
-    def refresh_lists(self):
-        """刷新列表"""
-        # 保存当前选中的分组
-        current_group = None
-        if self.group_list.curselection():
-            current_group = self.group_list.get(self.group_list.curselection())
-        
-        # 刷新分组列表
-        self.group_list.delete(0, tk.END)
-        groups = self.data_manager.get_all_groups()
-        
-        # 清空文件列表和内容显示
-        self.file_list.delete(0, tk.END)
-        self.clear_text_fields()
-        
-        # 如果没有分组，直接返回
-        if not groups:
-            return
-            
-        # 有分组时的处理
-        for group in groups:
-            self.group_list.insert(tk.END, group)
-            
-        # 如果之前有选中的分组，尝试重新选中它
-        if current_group and current_group in groups:
-            index = groups.index(current_group)
-            self.group_list.select_set(index)
-            # 加载该分组的文件
-            self.load_files_from_group(None)
-        # 如果没有之前选中的分组，但有分组存在，选中第一个
-        elif groups:
-            self.group_list.select_set(0)
-            # 加载第一个分组的文件
-            self.load_files_from_group(None)
-        
-    def send_cache_prompt_toclipboard(self):
-        """发送缓存的提示词到剪贴板"""
-        content = self.data_manager.read_cached_prompt()
-        if content:
-            pyperclip.copy(content)
-        
-    def on_global_search(self, event):
-        """处理全局搜索"""
-        keyword = self.global_search_entry.get().strip()
-        # 清除分组搜索的内容，避免冲突
-        self.group_search_entry.delete(0, tk.END)
-        
-        if not keyword:
-            self.refresh_lists()  # 清空搜索时恢复始显示
-            return
-            
-        # 清空当前列表
-        self.group_list.delete(0, tk.END)
-        self.file_list.delete(0, tk.END)
-        
-        # 执行搜索
-        results = self.search_manager.global_search(keyword)
-        
-        # 显示结果
-        shown_groups = set()
-        for file, data in results:
-            group = data.get('group', '')
-            if group not in shown_groups:
-                self.group_list.insert(tk.END, group)
-                shown_groups.add(group)
-            self.file_list.insert(tk.END, file)
-        
-        # 高亮显示当前文本框中的匹配内容
-        self.highlight_text(keyword)
-        
-    def on_group_search(self, event):
-        """处理分组搜索"""
-        if not self.group_list.curselection():
-            return
-            
-        keyword = self.group_search_entry.get().strip()
-        # 清除全局搜索的内容，避免冲突
-        self.global_search_entry.delete(0, tk.END)
-        
-        group = self.group_list.get(self.group_list.curselection())
-        
-        if not keyword:
-            self.load_files_from_group(None)  # 清空搜索时恢复原始显示
-            return
-            
-        # 清空文件列表
-        self.file_list.delete(0, tk.END)
-        
-        # 执行搜索
-        results = self.search_manager.group_search(keyword, group)
-        
-        # 显示结果
-        for file, _ in results:
-            self.file_list.insert(tk.END, file)
-        
-        # 高亮显示当前文本框中的匹配内容
-        self.highlight_text(keyword)
-        
-    def highlight_text(self, keyword):
-        """高亮显示匹配的文本"""
-        if not keyword:
-            return
-            
-        # 获取所有需要高亮的文本范围
-        for widget in [self.file_pname, self.file_content, self.file_pcomment]:
-            text = widget.get("1.0", tk.END)
-            widget.tag_remove("highlight", "1.0", tk.END)  # 清除现有高亮
-            
-            ranges = self.search_manager.get_highlight_ranges(text, keyword)
-            for start, end in ranges:
-                # 将字符位置转换为tkinter的行列格式
-                start_line = text.count('\n', 0, start) + 1
-                start_col = start - text.rfind('\n', 0, start) - 1
-                end_line = text.count('\n', 0, end) + 1
-                end_col = end - text.rfind('\n', 0, end) - 1
-                
-                # 添加高亮标签
-                widget.tag_add("highlight", 
-                             f"{start_line}.{start_col}", 
-                             f"{end_line}.{end_col}")
-                widget.tag_config("highlight", background="light green")
-        
-        # 添加右键菜单
-        def create_context_menu(self):
-            self.context_menu = tk.Menu(self.root, tearoff=0)
-            self.context_menu.add_command(label="删除", command=self.delete_file)
-            self.context_menu.add_command(label="复制", command=self.copy_content)
-            
-            # 绑定右键菜单到文件列表
-            self.file_list.bind("<Button-3>", self.show_context_menu)
-
-        def show_context_menu(self, event):
-            if self.file_list.curselection():  # 只在有选中项时显示
-                self.context_menu.post(event.x_root, event.y_root)
-
-    def show_delete_window(self):
-        """显示删除窗口"""
-        try:
-            from delete_module.delete_window import DeleteWindow
-            DeleteWindow(self.root, self.data_manager)
-        except Exception as e:
-            messagebox.showerror("错误", f"无法打开删除窗口: {str(e)}\n请检查delete_module目录是否存在")
-            print(f"打开删除窗口错误: {str(e)}")
-
-    def open_hotkeys_window(self):
-        """打开独立专属快捷键配置界面"""
-        from hotkeys.hotkeys_window import HotkeysWindow
-        HotkeysWindow(self.root, self.data_manager)
-
-    def open_high_freq_hotkey_window(self):
-        """打开高频快捷键管理界面"""
-        from high_frequency_hotkey.high_freq_hotkey_window import HighFreqHotkeyWindow
-        HighFreqHotkeyWindow(self.root, self.data_manager)
-
-    def on_add_button_press(self, event):
-        """新建按钮按下时的效果"""
-        self.add_button.configure(bg='yellow')  # 按钮变黄
-        self.file_list.configure(bg='yellow')   # 列表变黄
-
-    def on_add_button_release(self, event):
-        """新建按钮释放时的效果"""
-        self.add_button.configure(bg='SystemButtonFace')  # 恢复按钮默认颜色
-        self.file_list.configure(bg='white')    # 恢复列表默认颜色
-        self.add_file()  # 执行新建操作
-
-    def on_save_button_press(self, event):
-        """保存按钮按下时的效果"""
-        self.file_content.configure(bg='light green')
-        # 记录按下的时间
-        self.save_button_press_time = event.time
-
-    def on_save_button_release(self, event):
-        """保存按钮释放时的效果"""
-        # 计算按下的持续时间（毫秒）
-        press_duration = (event.time - self.save_button_press_time) * 1000  # 转换为毫秒
-        
-        if press_duration < 1000:  # 如果按下时间不足1秒
-            # 设置定时器，确保从按下开始算起满1秒后再恢复颜色
-            self.root.after(1000, lambda: self.file_content.configure(bg='white'))
-        else:
-            # 果已经超过1秒，立恢复颜色
-            self.file_content.configure(bg='white')
-        
-        # 执行保存操作
-        self.save_changes()
-
-    def open_edit_window(self, event):
-        """打开编辑窗口"""
-        if self.current_file:
-            from edit_prompt_content import EditPromptWindow
-            content = self.file_content.get('1.0', 'end-1c')
-            
-            # 添加回调函数用于更新主界面内容
-            def update_main_content(new_content):
-                self.file_content.delete('1.0', tk.END)
-                self.file_content.insert('1.0', new_content)
-            
-            edit_window = EditPromptWindow(
-                self.root,
-                self.data_manager,
-                self.current_file,
-                content,
-                callback=update_main_content  # 传入回调函数
-            )
-
-    def open_settings(self):
-        """打开设置窗口"""
-        from configs.set_configs import SettingsWindow
-        
-        def on_config_updated(new_config):
-            """配置更新后的回调函数"""
-            # 更新数据管理器的路径
-            self.data_manager.data_dir = new_config['data_dir']
-            # 重新加载数据并刷新界面
-            self.refresh_lists()
-        
+"""
+GUI界面模块
+
+版本日志：
+v1.0 2024-03-xx
+- 初始版本
+- 实现基础GUI界面
+- 实现提示词编辑功能
+- 实现分组显示功能
+v1.1 2026-10-xx
+- 监听data目录变化，只把变化的行同步到列表框
+- 新建提示词的文件名由DataManager的分配器直接给出，保存失败时释放占位
+- 复制和ctrl+b发送提示词时记录使用次数
+- 添加“查重”按钮，打开近似重复检查窗口
+- 搜索框改用SearchSession，输入加长或回退时复用之前的搜索结果
+- 搜索移到后台线程执行：输入防抖，新的输入取消正在进行的搜索，结果分批显示
+- 添加搜索模式下拉框，可按相关度排序（允许少量错字）
+- 添加正则搜索模式，正则有误或搜索超时时在搜索框旁显示提示
+- 高亮位置由SearchManager直接给出行列，样式只设置一次；匹配很多时先高亮可见部分，其余空闲时分批添加
+- 正则模式的高亮使用后台搜索时一并算出的匹配位置，界面线程中不执行正则
+- 搜索语法（字段前缀、排除、AND/OR等）只在"语法"模式下生效，其他模式按输入原样搜索
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from config import FONT_SIZES, LAYOUT, BASE_JSON_TEMPLATE, SEARCH
+from search_manager import SearchManager, SearchSession, SearchTimeout, MODE_SUBSTRING, MODE_RANKED, MODE_QUERY, MODE_REGEX
+from watch_manager import WatchManager, RESCAN
+import pyperclip
+import re
+import os
+import bisect
+import queue
+import threading
+
+# 搜索模式下拉框的选项
+SEARCH_MODES = {'包含': MODE_SUBSTRING, '相关度': MODE_RANKED, '语法': MODE_QUERY, '正则': MODE_REGEX}
+
+class PromptAssistantGUI:
+    def __init__(self, root: tk.Tk, data_manager, hotkey_manager):
+        self.root = root
+        self.data_manager = data_manager
+        self.hotkey_manager = hotkey_manager
+        self.search_manager = SearchManager(data_manager)  # 添加搜索管理器
+        self.search_session = SearchSession(self.search_manager)  # 边输入边搜索，复用上次的结果
+        # 后台搜索：防抖定时器、当前搜索的取消标志、搜索序号（用于丢弃过期结果）
+        self._search_after = None
+        self._search_cancel = None
+        self._search_token = 0
+        self._search_results = queue.Queue()
+        self._shown_groups = set()
+        # 最近一次正则搜索各结果的匹配位置（在后台线程中随搜索算出），界面线程不执行正则
+        self._regex_spans = {}
+        self._highlight_generation = 0  # 每次重新高亮加一，分批高亮据此停止过期的任务
+        self.current_file = ""
+        self.select_group_list = []
+        
+        self.setup_ui()
+        self.init_data()
+        
+        # 监听数据目录，外部工具同步或修改的文件会增量显示
+        self.watch_manager = None
+        self.start_watcher()
+        self.root.after(500, self.poll_library_changes)
+        
+    def init_data(self):
+        """初始化数据"""
+        # 加载分组列表
+        groups = self.data_manager.get_all_groups()
+        for group in groups:
+            self.group_list.insert(tk.END, group)
+            
+        # 如果有分组，默认选中第一个分组载其文件
+        if groups:
+            self.group_list.select_set(0)
+            self.load_files_from_group(None)  # None 表示不是由事件触发
+            
+            # 如果有文件，默认选中第一个文件并加载
+            if self.file_list.size() > 0:
+                self.file_list.select_set(0)
+                self.load_file(None)  # None 表示不是由事件触发
+        
+    def setup_ui(self):
+        """设置UI界面"""
+        # 创建顶部按钮和状态栏区域
+        top_frame = ttk.Frame(self.root)
+        top_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        
+        # 左侧按钮组
+        left_button_frame = ttk.Frame(top_frame)
+        left_button_frame.pack(side=tk.LEFT)
+        
+        # 其他设置按钮 - 移到最左侧
+        self.settings_button = ttk.Button(
+            left_button_frame, 
+            text="其他设置",
+            command=self.open_settings
+        )
+        self.settings_button.pack(side=tk.LEFT, padx=5)
+        
+        # Delete按钮
+        self.delete_button = ttk.Button(left_button_frame, text="Delete", command=self.show_delete_window)
+        self.delete_button.pack(side=tk.LEFT, padx=5)
+        
+        # 近似重复检查按钮
+        self.duplicate_button = ttk.Button(left_button_frame, text="查重", command=self.show_duplicate_window)
+        self.duplicate_button.pack(side=tk.LEFT, padx=5)
+        
+        # 状态显示标签
+        self.label1 = ttk.Label(left_button_frame, text="当前选中的提示词", 
+                             font=("Arial", FONT_SIZES['status']))
+        self.label1.pack(side=tk.LEFT, padx=5)
+        
+        self.label2 = ttk.Label(left_button_frame, text="", background="light green", 
+                             width=LAYOUT['status_width'], 
+                             font=("Arial", FONT_SIZES['status']))
+        self.label2.pack(side=tk.LEFT, padx=5)
+        
+        # 右侧按钮组
+        right_button_frame = ttk.Frame(top_frame)
+        right_button_frame.pack(side=tk.RIGHT)
+        
+        # 功能按钮
+        self.hotkeys_button = ttk.Button(right_button_frame, text="独立专属快捷键", command=self.open_hotkeys_window)
+        self.hotkeys_button.pack(side=tk.LEFT, padx=5)
+        
+        self.high_freq_hotkey_button = ttk.Button(right_button_frame, text="高频快捷键管理", command=self.open_high_freq_hotkey_window)
+        self.high_freq_hotkey_button.pack(side=tk.LEFT, padx=5)
+        
+        self.add_button = tk.Button(right_button_frame, text="新建提示词")
+        self.add_button.pack(side=tk.LEFT, padx=5)
+        self.add_button.bind('<ButtonPress-1>', self.on_add_button_press)
+        self.add_button.bind('<ButtonRelease-1>', self.on_add_button_release)
+        
+        self.save_button = tk.Button(right_button_frame, text="保存修改")
+        self.save_button.pack(side=tk.LEFT, padx=5)
+        self.save_button.bind('<ButtonPress-1>', self.on_save_button_press)
+        self.save_button.bind('<ButtonRelease-1>', self.on_save_button_release)
+        
+        self.copy_button = ttk.Button(right_button_frame, text="Copy", command=self.copy_content)
+        self.copy_button.pack(side=tk.LEFT, padx=5)
+        
+        self.exit_button = ttk.Button(right_button_frame, text="退出", command=self.root.destroy)
+        self.exit_button.pack(side=tk.LEFT, padx=(20, 10))
+        
+        # 创建其他界面元素
+        self.create_search_frame()
+        self.create_list_frame()
+        self.create_content_frame()
+        
+    def create_search_frame(self):
+        """创建搜索框架"""
+        search_frame = tk.Frame(self.root)
+        search_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        
+        # 全局搜索
+        global_search_label = tk.Label(search_frame, text="全局搜索:")
+        global_search_label.pack(side=tk.LEFT)
+        
+        self.global_search_entry = tk.Entry(search_frame)
+        self.global_search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 20))
+        self.global_search_entry.bind('<KeyRelease>', self.on_global_search)
+        
+        # 分组搜索 - 修改标签文本
+        group_search_label = tk.Label(search_frame, text="当前分组搜索:")
+        group_search_label.pack(side=tk.LEFT)
+        
+        self.group_search_entry = tk.Entry(search_frame)
+        self.group_search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.group_search_entry.bind('<KeyRelease>', self.on_group_search)
+        
+        # 搜索模式：包含关键词 / 按相关度排序（允许少量错字）
+        self.search_mode_var = tk.StringVar(value='包含')
+        search_mode_combo = ttk.Combobox(search_frame, textvariable=self.search_mode_var,
+                                         values=list(SEARCH_MODES), state='readonly', width=6)
+        search_mode_combo.pack(side=tk.LEFT, padx=5)
+        search_mode_combo.bind('<<ComboboxSelected>>', self.on_search_mode_change)
+        
+        # 搜索提示（正则有误、搜索超时等）
+        self.search_status_label = ttk.Label(search_frame, text="", foreground='blue')
+        self.search_status_label.pack(side=tk.LEFT, padx=5)
+        
+    def create_list_frame(self):
+        """创建左侧列表框架"""
+        list_frame = tk.Frame(self.root)
+        list_frame.pack(side=tk.LEFT, fill=tk.Y, expand=True, anchor='w')
+        
+        # 分组列表
+        self.group_list = tk.Listbox(list_frame, width=LAYOUT['group_list_width'], 
+                                   font=('Arial', FONT_SIZES['list']))
+        self.group_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.group_list.bind('<<ListboxSelect>>', self.load_files_from_group)
+        
+        # 文件列表
+        self.file_list = tk.Listbox(list_frame, width=LAYOUT['file_list_width'], 
+                                  font=('Arial', FONT_SIZES['list']))
+        self.file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.file_list.bind('<<ListboxSelect>>', self.load_file)
+        
+    def create_content_frame(self):
+        """创建右侧内容框架"""
+        # 主框架
+        content_frame = tk.Frame(self.root)
+        content_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        
+        # 创建可滚动的内容区域
+        # 使用PanedWindow来确保内容区域和按钮区域的分隔
+        paned = ttk.PanedWindow(content_frame, orient=tk.VERTICAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # 创建内容区域的容器
+        detail_container = ttk.Frame(paned)
+        paned.add(detail_container, weight=1)
+        
+        # 创建可滚动的文本区域
+        self.detail_text = tk.Text(detail_container, wrap=tk.WORD)
+        scrollbar = ttk.Scrollbar(detail_container, orient="vertical", command=self.detail_text.yview)
+        self.detail_text.configure(yscrollcommand=scrollbar.set)
+        
+        # 打包动条和文区域
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.detail_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # 创建内部Frame作为内容容器
+        self.detail_frame = ttk.Frame(self.detail_text)
+        self.detail_text.window_create("1.0", window=self.detail_frame)
+        
+        # 绑定鼠标滚轮事件到所有文本框和标签
+        def _on_mousewheel(event):
+            self.detail_text.yview_scroll(int(-1*(event.delta/120)), "units")
+        
+        # 为每个组件绑定滚轮事件
+        def bind_mousewheel(widget):
+            widget.bind("<MouseWheel>", _on_mousewheel)
+            # 递归绑定所有子组件
+            for child in widget.winfo_children():
+                bind_mousewheel(child)
+                # 特殊处理Text组件
+                if isinstance(child, tk.Text):
+                    child.bind("<MouseWheel>", lambda e: "break")  # 阻止Text组件的默认滚动行为
+        
+        # 绑定主容器及其所有子组件
+        bind_mousewheel(self.detail_frame)
+        
+        # 为detail_text本也绑定滚轮事件
+        self.detail_text.bind("<MouseWheel>", _on_mousewheel)
+        
+        # 提示词名称
+        name_frame = ttk.Frame(self.detail_frame)
+        name_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.name_label = ttk.Label(name_frame, text="Name:", font=('Arial', FONT_SIZES['name']))
+        self.name_label.pack(side=tk.TOP, anchor='w')
+        self.file_pname = tk.Text(name_frame, height=1, font=('Arial', FONT_SIZES['name']))
+        self.file_pname.pack(fill=tk.X, pady=2)
+        
+        # 分组
+        group_frame = ttk.Frame(self.detail_frame)
+        group_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.group_label = ttk.Label(group_frame, text="Group:", font=('Arial', FONT_SIZES['group']))
+        self.group_label.pack(side=tk.TOP, anchor='w')
+        self.file_pgroup = tk.Text(group_frame, height=1, font=('Arial', FONT_SIZES['group']))
+        self.file_pgroup.pack(fill=tk.X, pady=2)
+        
+        # 独立专属快捷键
+        shortcut_frame = ttk.Frame(self.detail_frame)
+        shortcut_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.shortcut_label = ttk.Label(shortcut_frame, text="独立专属快捷键:", font=('Arial', FONT_SIZES['shortcut']))
+        self.shortcut_label.pack(side=tk.TOP, anchor='w')
+        self.file_pshortcut = tk.Text(shortcut_frame, height=1, font=('Arial', FONT_SIZES['shortcut']))
+        self.file_pshortcut.pack(fill=tk.X, pady=2)
+        
+        # 备注
+        comment_frame = ttk.Frame(self.detail_frame)
+        comment_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.comment_label = ttk.Label(comment_frame, text="Comment:", font=('Arial', FONT_SIZES['comment']))
+        self.comment_label.pack(side=tk.TOP, anchor='w')
+        self.file_pcomment = tk.Text(comment_frame, height=3, font=('Arial', FONT_SIZES['comment']))
+        self.file_pcomment.pack(fill=tk.X, pady=2)
+        
+        # 修改content标签文本
+        self.content_label = ttk.Label(content_frame, 
+                                     text="双击content编辑区域进行放大编辑", 
+                                     font=('Arial', FONT_SIZES['content']))
+        self.content_label.pack(side=tk.TOP, anchor='w')
+        
+        # 内容
+        content_frame = ttk.Frame(self.detail_frame)
+        content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.file_content = tk.Text(content_frame, height=24, font=('Arial', FONT_SIZES['content']))
+        self.file_content.pack(fill=tk.BOTH, expand=True, pady=2)
+        
+        # 搜索高亮的样式只需设置一次
+        for widget in [self.file_pname, self.file_content, self.file_pcomment]:
+            widget.tag_config("highlight", background="light green")
+        
+        # 禁用主Text组件的编辑功能
+        self.detail_text.configure(state='disabled')
+        
+        # 在所有组件创建完成后，再次绑定滚轮事件（确保新创建的组件都被绑定）
+        bind_mousewheel(self.detail_frame)
+        
+        # 在创建file_content后添加双击事件绑定
+        self.file_content.bind('<Double-Button-1>', self.open_edit_window)
+        
+    def load_files_from_group(self, event):
+        """从选中的分组加载文件"""
+        if not self.group_list.curselection():
+            return
+            
+        self.file_list.delete(0, tk.END)
+        group = self.group_list.get(self.group_list.curselection())
+        files = self.data_manager.get_files_by_group(group)
+        
+        for file in files:
+            self.file_list.insert(tk.END, file)
+        self.select_group_list = files
+        
+    def load_file(self, event):
+        """加载选中的文件"""
+        if (event is None and self.file_list.size() > 0) or (event and self.file_list.curselection()):
+            if event is None:
+                index = 0
+            else:
+                index = self.file_list.curselection()[0]
+            
+            file = self.file_list.get(index)
+            self.current_file = file
+            self.label2.config(text=file)
+            
+            self.clear_text_fields()
+            
+            try:
+                data = self.data_manager.read_prompt(file)
+                print(f"加载文件内容: {data}")
+                self.fill_text_fields(data)
+                # 更新缓存
+                self.data_manager.cache_prompt(data['content'], file)
+                
+                # 如果当前有搜索关键词，立即高亮显示
+                global_keyword = self.global_search_entry.get().strip()
+                group_keyword = self.group_search_entry.get().strip()
+                if global_keyword:
+                    self.highlight_text(global_keyword)
+                elif group_keyword:
+                    self.highlight_text(group_keyword)
+                
+            except Exception as e:
+                print(f"加载文件错误: {file}, {str(e)}")
+                messagebox.showerror("错误", f"加载文件失败: {str(e)}")
+            
+    def clear_text_fields(self):
+        """清空所有文本框"""
+        self.file_pname.delete('1.0', tk.END)
+        self.file_pgroup.delete('1.0', tk.END)
+        self.file_pshortcut.delete('1.0', tk.END)
+        self.file_pcomment.delete('1.0', tk.END)
+        self.file_content.delete('1.0', tk.END)
+        self._highlight_generation += 1  # 停止对旧内容的分批高亮
+        
+    def fill_text_fields(self, data):
+        """填充文本框"""
+        try:
+            self.clear_text_fields()
+            
+            self.file_pname.insert(tk.END, data.get('name', ''))
+            self.file_pgroup.insert(tk.END, data.get('group', ''))
+            self.file_pshortcut.insert(tk.END, data.get('shortcut', ''))
+            self.file_pcomment.insert(tk.END, data.get('comment', ''))
+            self.file_content.insert(tk.END, data.get('content', ''))
+            
+            print("文本框填充完成")
+        except Exception as e:
+            print(f"填充文本框错误: {str(e)}")
+        
+    def add_file(self):
+        """添加文件"""
+        name = self.file_pname.get("1.0", "end-1c").strip()
+        if not name:
+            return
+            
+        data = {
+            'name': name,
+            'group': self.file_pgroup.get("1.0", "end-1c").strip(),
+            'shortcut': self.file_pshortcut.get("1.0", "end-1c").strip(),
+            'comment': self.file_pcomment.get("1.0", "end-1c").strip(),
+            'content': self.file_content.get("1.0", "end-1c").strip(),
+            'add1': '', 'add2': '', 'add3': '', 'add4': '',
+            'add5': '', 'add6': '', 'add7': '', 'add8': ''
+        }
+        
+        filename = self.data_manager.get_safe_filename(name)
+        
+        try:
+            self.data_manager.save_prompt(filename, data)
+            # 保存到缓存
+            self.data_manager.cache_prompt(data['content'], filename)
+            self.refresh_lists()
+        except Exception as e:
+            self.data_manager.release_filename(filename)
+            messagebox.showerror("错误", f"创建提示词失败：{str(e)}")
+        
+    def save_changes(self):
+        """保存修改"""
+        if not self.current_file:
+            return
+            
+        data = {
+            'name': self.file_pname.get("1.0", "end-1c").strip(),
+            'group': self.file_pgroup.get("1.0", "end-1c").strip(),
+            'shortcut': self.file_pshortcut.get("1.0", "end-1c").strip(),
+            'comment': self.file_pcomment.get("1.0", "end-1c").strip(),
+            'content': self.file_content.get("1.0", "end-1c").strip(),
+            'add1': '', 'add2': '', 'add3': '', 'add4': '',
+            'add5': '', 'add6': '', 'add7': '', 'add8': ''
+        }
+        
+        try:
+            self.data_manager.save_prompt(self.current_file, data)
+            # 保存到缓存
+            self.data_manager.cache_prompt(data['content'], self.current_file)
+        except Exception as e:
+            messagebox.showerror("错误", f"保存修改失败：{str(e)}")
+        
+    def delete_file(self):
+        """删除文件"""
+        if not self.file_list.curselection():
+            return
+            
+        file = self.file_list.get(self.file_list.curselection())
+        self.data_manager.delete_prompt(file)
+        self.refresh_lists()
+        
+    def copy_content(self):
+        """复制内容到剪贴板"""
+        content = self.file_content.get("1.0", tk.END)
+        pyperclip.copy(content)
+        self.data_manager.record_usage(self.current_file, 'gui')
+        
+    def refresh_lists(self):
+        """刷新列表"""
+        # 保存当前选中的分组
+        current_group = None
+        if self.group_list.curselection():
+            current_group = self.group_list.get(self.group_list.curselection())
+        
+        # 刷新分组列表
+        self.group_list.delete(0, tk.END)
+        groups = self.data_manager.get_all_groups()
+        
+        # 清空文件列表和内容显示
+        self.file_list.delete(0, tk.END)
+        self.clear_text_fields()
+        
+        # 如果没有分组，直接返回
+        if not groups:
+            return
+            
+        # 有分组时的处理
+        for group in groups:
+            self.group_list.insert(tk.END, group)
+            
+        # 如果之前有选中的分组，尝试重新选中它
+        if current_group and current_group in groups:
+            index = groups.index(current_group)
+            self.group_list.select_set(index)
+            # 加载该分组的文件
+            self.load_files_from_group(None)
+        # 如果没有之前选中的分组，但有分组存在，选中第一个
+        elif groups:
+            self.group_list.select_set(0)
+            # 加载第一个分组的文件
+            self.load_files_from_group(None)
+        
+    def start_watcher(self):
+        """启动（或重启）数据目录监听"""
+        if self.watch_manager:
+            self.watch_manager.stop()
+        # SQLite存储不需要监听目录
+        mode = self.data_manager.config.get('watch_mode', 'auto')
+        if self.data_manager.storage is not None:
+            mode = 'off'
+        self.watch_manager = WatchManager(
+            self.data_manager.data_dir,
+            extension=self.data_manager.file_extension,
+            recursive=self.data_manager.include_subdirs,
+            mode=mode
+        )
+        self.watch_manager.start()
+
+    def poll_library_changes(self):
+        """定时取出监听线程合并好的文件变化，在界面线程中应用"""
+        try:
+            changes = self.watch_manager.get_changes() if self.watch_manager else set()
+            if RESCAN in changes:
+                self.data_manager.build_index()
+                if not (self.global_search_entry.get().strip() or self.group_search_entry.get().strip()):
+                    self.refresh_lists()
+            elif changes:
+                deltas = self.data_manager.apply_file_changes(changes)
+                if deltas:
+                    self.apply_library_deltas(deltas)
+        except Exception as e:
+            print(f"同步目录变化出错: {str(e)}")
+        self.root.after(500, self.poll_library_changes)
+
+    def apply_library_deltas(self, deltas):
+        """只把发生变化的分组和文件行同步到列表框"""
+        # 正在显示搜索结果时不做同步，下一次搜索会使用最新索引
+        if self.global_search_entry.get().strip() or self.group_search_entry.get().strip():
+            return
+            
+        current_group = None
+        if self.group_list.curselection():
+            current_group = self.group_list.get(self.group_list.curselection())
+            
+        # 分组列表：新旧分组都是有序的，逐行删除/插入
+        groups = self.data_manager.get_all_groups()
+        shown = list(self.group_list.get(0, tk.END))
+        if groups != shown:
+            group_set = set(groups)
+            for i in range(len(shown) - 1, -1, -1):
+                if shown[i] not in group_set:
+                    self.group_list.delete(i)
+            shown_set = set(shown)
+            for i, group in enumerate(groups):
+                if group not in shown_set:
+                    self.group_list.insert(i, group)
+                    
+        if current_group is None:
+            return
+            
+        # 文件列表：只处理移入/移出当前分组的文件
+        files = list(self.file_list.get(0, tk.END))
+        for filename, old_group, new_group in deltas:
+            if old_group == current_group and new_group != current_group and filename in files:
+                i = files.index(filename)
+                self.file_list.delete(i)
+                del files[i]
+            elif new_group == current_group and filename not in files:
+                i = bisect.bisect_left(files, filename)
+                self.file_list.insert(i, filename)
+                files.insert(i, filename)
+        self.select_group_list = files
+        
+    def send_cache_prompt_toclipboard(self):
+        """发送缓存的提示词到剪贴板"""
+        content = self.data_manager.read_cached_prompt()
+        if content:
+            pyperclip.copy(content)
+            self.data_manager.record_usage(self.data_manager.cached_prompt_file, 'global_hotkey')
+        
+    def on_global_search(self, event):
+        """处理全局搜索"""
+        keyword = self.global_search_entry.get().strip()
+        # 清除分组搜索的内容，避免冲突
+        self.group_search_entry.delete(0, tk.END)
+        
+        if not keyword:
+            self.cancel_search()
+            self.refresh_lists()  # 清空搜索时恢复始显示
+            return
+            
+        self.schedule_search(keyword, None)
+        
+    def on_group_search(self, event):
+        """处理分组搜索"""
+        if not self.group_list.curselection():
+            return
+            
+        keyword = self.group_search_entry.get().strip()
+        # 清除全局搜索的内容，避免冲突
+        self.global_search_entry.delete(0, tk.END)
+        
+        group = self.group_list.get(self.group_list.curselection())
+        
+        if not keyword:
+            self.cancel_search()
+            self.load_files_from_group(None)  # 清空搜索时恢复原始显示
+            return
+            
+        self.schedule_search(keyword, group)
+        
+    def on_search_mode_change(self, event):
+        """切换搜索模式后重新执行当前的搜索"""
+        if self.global_search_entry.get().strip():
+            self.on_global_search(None)
+        elif self.group_search_entry.get().strip():
+            self.on_group_search(None)
+        
+    def schedule_search(self, keyword, group):
+        """防抖：连续输入时只在停止输入一小段时间后搜索一次"""
+        self.cancel_search()
+        self._search_after = self.root.after(SEARCH['debounce_ms'],
+                                             lambda: self.start_search(keyword, group))
+        
+    def cancel_search(self):
+        """取消等待中的和正在执行的搜索，已放入队列的旧结果会被丢弃"""
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+            self._search_after = None
+        if self._search_cancel is not None:
+            self._search_cancel.set()
+            self._search_cancel = None
+        self._search_token += 1
+        self.search_status_label.config(text="")
+        
+    def start_search(self, keyword, group):
+        """在后台线程中搜索，结果分批放入队列，由poll_search_results在界面线程中显示"""
+        self._search_after = None
+        token = self._search_token
+        mode = SEARCH_MODES[self.search_mode_var.get()]
+        cancel = threading.Event()
+        self._search_cancel = cancel
+        
+        # 清空当前列表（分组搜索时保留分组列表）
+        if group is None:
+            self.group_list.delete(0, tk.END)
+        self.file_list.delete(0, tk.END)
+        self._shown_groups = set()
+        spans = {}
+        self._regex_spans = spans
+        
+        def run():
+            try:
+                for batch in self.search_session.iter_search(keyword, group, cancel.is_set, mode=mode,
+                                                             spans=spans if mode == MODE_REGEX else None):
+                    self._search_results.put((token, batch))
+            except Exception as e:
+                # 正则有误或超时等，交给界面线程显示
+                self._search_results.put((token, e))
+            self._search_results.put((token, None))
+            
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(SEARCH['poll_ms'], lambda: self.poll_search_results(token, keyword, group))
+        
+    def poll_search_results(self, token, keyword, group):
+        """取出后台搜索的结果批次并显示，搜索结束后高亮当前文本框中的匹配内容"""
+        if token != self._search_token:
+            return  # 已有新的搜索，由新搜索的轮询负责取结果
+        while True:
+            try:
+                result_token, batch = self._search_results.get_nowait()
+            except queue.Empty:
+                break
+            if result_token != self._search_token:
+                continue  # 已被新的输入取代
+            if batch is None:
+                self._search_cancel = None
+                self.highlight_text(keyword)
+                return
+            if isinstance(batch, Exception):
+                if isinstance(batch, SearchTimeout):
+                    self.search_status_label.config(text=str(batch))
+                else:
+                    self.search_status_label.config(text=f"搜索出错: {str(batch)}")
+                    print(f"搜索出错: {keyword}, {str(batch)}")
+                continue
+            for file, record in batch:
+                if group is None and record.group not in self._shown_groups:
+                    self.group_list.insert(tk.END, record.group)
+                    self._shown_groups.add(record.group)
+                self.file_list.insert(tk.END, file)
+        self.root.after(SEARCH['poll_ms'], lambda: self.poll_search_results(token, keyword, group))
+        
+    def highlight_text(self, keyword):
+        """高亮显示匹配的文本
+        匹配较多时先高亮当前可见的部分，其余的在界面空闲时分批添加；
+        正则模式使用搜索时算出的匹配位置，当前文件没有（如搜索超时）时不高亮
+        """
+        self._highlight_generation += 1
+        if not keyword:
+            return
+            
+        mode = SEARCH_MODES[self.search_mode_var.get()]
+        chunk = SEARCH['highlight_chunk']
+        file_spans = self._regex_spans.get(self.current_file, {}) if mode == MODE_REGEX else None
+        for widget, field in [(self.file_pname, 'name'), (self.file_content, 'content'),
+                              (self.file_pcomment, 'comment')]:
+            widget.tag_remove("highlight", "1.0", tk.END)  # 清除现有高亮
+            text = widget.get("1.0", tk.END)
+            spans = file_spans.get(field, []) if file_spans is not None else None
+            ranges = self.search_manager.get_highlight_ranges(text, keyword, mode, spans)
+            if len(ranges) <= chunk:
+                self._add_highlight(widget, ranges)
+                continue
+                
+            # 可见区域内的匹配（按开始行查找）立即高亮
+            lines = [int(start.partition('.')[0]) for start, _ in ranges]
+            first_line = int(widget.index("@0,0").partition('.')[0])
+            last_line = int(widget.index(f"@0,{widget.winfo_height()}").partition('.')[0])
+            lo = bisect.bisect_left(lines, first_line)
+            hi = bisect.bisect_right(lines, last_line)
+            self._add_highlight(widget, ranges[lo:hi])
+            self._highlight_later(widget, ranges[hi:] + ranges[:lo], 0, self._highlight_generation)
+            
+    def _add_highlight(self, widget, ranges):
+        """一次调用添加多段高亮"""
+        if ranges:
+            widget.tag_add("highlight", *(index for pair in ranges for index in pair))
+            
+    def _highlight_later(self, widget, ranges, pos, generation):
+        """空闲时每次高亮一批，期间有新的高亮请求则停止"""
+        if generation != self._highlight_generation or pos >= len(ranges):
+            return
+        chunk = SEARCH['highlight_chunk']
+        self._add_highlight(widget, ranges[pos:pos + chunk])
+        self.root.after_idle(lambda: self._highlight_later(widget, ranges, pos + chunk, generation))
+        
+        # 添加右键菜单
+        def create_context_menu(self):
+            self.context_menu = tk.Menu(self.root, tearoff=0)
+            self.context_menu.add_command(label="删除", command=self.delete_file)
+            self.context_menu.add_command(label="复制", command=self.copy_content)
+            
+            # 绑定右键菜单到文件列表
+            self.file_list.bind("<Button-3>", self.show_context_menu)
+
+        def show_context_menu(self, event):
+            if self.file_list.curselection():  # 只在有选中项时显示
+                self.context_menu.post(event.x_root, event.y_root)
+
+    def show_delete_window(self):
+        """显示删除窗口"""
+        try:
+            from delete_module.delete_window import DeleteWindow
+            DeleteWindow(self.root, self.data_manager)
+        except Exception as e:
+            messagebox.showerror("错误", f"无法打开删除窗口: {str(e)}\n请检查delete_module目录是否存在")
+            print(f"打开删除窗口错误: {str(e)}")
+
+    def show_duplicate_window(self):
+        """显示近似重复检查窗口"""
+        try:
+            from duplicate_module.duplicate_window import DuplicateWindow
+            DuplicateWindow(self.root, self.data_manager, callback=self.refresh_lists)
+        except Exception as e:
+            messagebox.showerror("错误", f"无法打开查重窗口: {str(e)}\n请检查duplicate_module目录是否存在")
+            print(f"打开查重窗口错误: {str(e)}")
+
+    def open_hotkeys_window(self):
+        """打开独立专属快捷键配置界面"""
+        from hotkeys.hotkeys_window import HotkeysWindow
+        HotkeysWindow(self.root, self.data_manager)
+
+    def open_high_freq_hotkey_window(self):
+        """打开高频快捷键管理界面"""
+        from high_frequency_hotkey.high_freq_hotkey_window import HighFreqHotkeyWindow
+        HighFreqHotkeyWindow(self.root, self.data_manager)
+
+    def on_add_button_press(self, event):
+        """新建按钮按下时的效果"""
+        self.add_button.configure(bg='yellow')  # 按钮变黄
+        self.file_list.configure(bg='yellow')   # 列表变黄
+
+    def on_add_button_release(self, event):
+        """新建按钮释放时的效果"""
+        self.add_button.configure(bg='SystemButtonFace')  # 恢复按钮默认颜色
+        self.file_list.configure(bg='white')    # 恢复列表默认颜色
+        self.add_file()  # 执行新建操作
+
+    def on_save_button_press(self, event):
+        """保存按钮按下时的效果"""
+        self.file_content.configure(bg='light green')
+        # 记录按下的时间
+        self.save_button_press_time = event.time
+
+    def on_save_button_release(self, event):
+        """保存按钮释放时的效果"""
+        # 计算按下的持续时间（毫秒）
+        press_duration = (event.time - self.save_button_press_time) * 1000  # 转换为毫秒
+        
+        if press_duration < 1000:  # 如果按下时间不足1秒
+            # 设置定时器，确保从按下开始算起满1秒后再恢复颜色
+            self.root.after(1000, lambda: self.file_content.configure(bg='white'))
+        else:
+            # 果已经超过1秒，立恢复颜色
+            self.file_content.configure(bg='white')
+        
+        # 执行保存操作
+        self.save_changes()
+
+    def open_edit_window(self, event):
+        """打开编辑窗口"""
+        if self.current_file:
+            from edit_prompt_content import EditPromptWindow
+            content = self.file_content.get('1.0', 'end-1c')
+            
+            # 添加回调函数用于更新主界面内容
+            def update_main_content(new_content):
+                self.file_content.delete('1.0', tk.END)
+                self.file_content.insert('1.0', new_content)
+            
+            edit_window = EditPromptWindow(
+                self.root,
+                self.data_manager,
+                self.current_file,
+                content,
+                callback=update_main_content  # 传入回调函数
+            )
+
+    def open_settings(self):
+        """打开设置窗口"""
+        from configs.set_configs import SettingsWindow
+        
+        def on_config_updated(new_config):
+            """配置更新后的回调函数"""
+            # 更新数据管理器的路径和扫描配置（同时使内存索引失效）
+            self.data_manager.config.update(new_config)
+            self.data_manager.set_data_dir(new_config['data_dir'])
+            self.start_watcher()
+            # 重新加载数据并刷新界面
+            self.refresh_lists()
+        
         SettingsWindow(self.root, callback=on_config_updated)
\ No newline at end of file
@@ -0,0 +1,292 @@
+"""
+版本历史模块 - 每个提示词的修改记录
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 最新版本保存完整数据，旧版本保存为反向差异，每隔若干个版本保存一次完整数据，读取任意版本最多回放有限个差异
+- 差异按字段计算：正文单独按行求差异，其他字段只记录变化的旧值（正文在JSON中只占一行，不能对整个JSON文本按行求差异）
+- 每个提示词一个历史文件，整体zlib压缩
+- 保存提示词时只把新内容放入队列，由后台线程计算差异并写入，不拖慢保存
+- 支持按数量和按天数的保留策略，支持查看任意版本和版本间差异
+
+历史文件位于 data/.history 下（隐藏目录，扫描提示词时会跳过）
+
+用法：
+    python history_manager.py list data 文件名.json
+    python history_manager.py show data 文件名.json 3
+    python history_manager.py diff data 文件名.json 2 5
+"""
+
+import difflib
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+HISTORY_DIR = '.history'
+HISTORY_VERSION = 1
+_SUFFIX = '.hist'
+# 单独按行求差异的字段
+_TEXT_FIELD = 'content'
+
+
+def make_line_delta(new_text: str, old_text: str) -> list:
+    """计算从新文本还原旧文本的反向差异（按行）
+    ['=', i, j] 表示复制新文本的第i~j行，['+', 行, ...] 表示插入这些行
+    """
+    new_lines = new_text.splitlines(True)
+    old_lines = old_text.splitlines(True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, new_lines, old_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(['=', i1, i2])
+        elif j2 > j1:
+            ops.append(['+'] + old_lines[j1:j2])
+    return ops
+
+
+def apply_line_delta(new_text: str, ops: list) -> str:
+    """用反向差异从新文本还原旧文本"""
+    new_lines = new_text.splitlines(True)
+    out = []
+    for op in ops:
+        if op[0] == '=':
+            out.extend(new_lines[op[1]:op[2]])
+        else:
+            out.extend(op[1:])
+    return ''.join(out)
+
+
+def make_delta(new_data: Dict, old_data: Dict) -> Dict:
+    """计算从新版本还原旧版本的反向差异
+    {'content': 正文的按行差异, 'fields': {其他变化的字段: 旧值}, 'removed': [旧版本中没有的字段]}，
+    没有变化的部分省略
+    """
+    delta = {}
+    new_content = new_data.get(_TEXT_FIELD)
+    old_content = old_data.get(_TEXT_FIELD)
+    skip = set()
+    if isinstance(new_content, str) and isinstance(old_content, str):
+        skip.add(_TEXT_FIELD)
+        if new_content != old_content:
+            delta[_TEXT_FIELD] = make_line_delta(new_content, old_content)
+    fields = {key: value for key, value in old_data.items()
+              if key not in skip and (key not in new_data or new_data[key] != value)}
+    if fields:
+        delta['fields'] = fields
+    removed = [key for key in new_data if key not in old_data]
+    if removed:
+        delta['removed'] = removed
+    return delta
+
+
+def apply_delta(new_data: Dict, delta: Dict) -> Dict:
+    """用反向差异从新版本还原旧版本"""
+    old_data = dict(new_data)
+    if _TEXT_FIELD in delta:
+        old_data[_TEXT_FIELD] = apply_line_delta(new_data[_TEXT_FIELD], delta[_TEXT_FIELD])
+    old_data.update(delta.get('fields', {}))
+    for key in delta.get('removed', ()):
+        old_data.pop(key, None)
+    return old_data
+
+
+class HistoryManager:
+    """提示词版本历史
+    revisions列表按从新到旧排列：第一项总是完整数据（'data'），其后每项为反向差异（'delta'）或定期保存的完整数据
+    max_revisions: 每个提示词最多保留的版本数（0表示不限）
+    max_age_days: 超过天数的旧版本被清理（0表示不限），最新版本始终保留
+    checkpoint_interval: 每隔多少个版本保存一次全文
+    """
+    def __init__(self, data_dir: str, max_revisions: int = 50, max_age_days: float = 0,
+                 checkpoint_interval: int = 20):
+        self.history_dir = os.path.join(data_dir, HISTORY_DIR)
+        self.max_revisions = max_revisions
+        self.max_age_days = max_age_days
+        self.checkpoint_interval = checkpoint_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._known: Optional[set] = None  # 已有历史记录的文件名，首次使用时从目录读取
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.history_dir, quote(filename, safe='') + _SUFFIX)
+
+    def has_history(self, filename: str) -> bool:
+        """该提示词是否已有历史记录（只查内存，不访问磁盘）"""
+        with self._lock:
+            if self._known is None:
+                try:
+                    self._known = {unquote(name[:-len(_SUFFIX)]) for name in os.listdir(self.history_dir)
+                                   if name.endswith(_SUFFIX)}
+                except FileNotFoundError:
+                    self._known = set()
+            return filename in self._known
+
+    def record(self, filename: str, data: Dict, timestamp: Optional[float] = None):
+        """记录一个新版本（只入队，由后台线程写入）"""
+        with self._lock:
+            if self._known is not None:
+                self._known.add(filename)
+        # 先转为文本，调用方之后修改data不影响入队的版本
+        text = json.dumps(data, ensure_ascii=False)
+        self._queue.put((filename, text, timestamp or time.time()))
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            filename, text, timestamp = self._queue.get()
+            try:
+                self._append(filename, json.loads(text), timestamp)
+            except Exception as e:
+                print(f"写入版本历史失败: {filename}, {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """等待队列中的版本全部写入"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _load(self, filename: str) -> List[Dict]:
+        try:
+            with open(self._path(filename), 'rb') as f:
+                history = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        except FileNotFoundError:
+            return []
+        if history.get('version') != HISTORY_VERSION:
+            raise ValueError(f"不支持的历史文件版本: {filename}")
+        return history['revisions']
+
+    def _save(self, filename: str, revisions: List[Dict]):
+        os.makedirs(self.history_dir, exist_ok=True)
+        payload = json.dumps({'version': HISTORY_VERSION, 'file': filename, 'revisions': revisions},
+                             ensure_ascii=False, separators=(',', ':'))
+        path = self._path(filename)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(payload.encode('utf-8')))
+        os.replace(tmp_path, path)
+
+    def _append(self, filename: str, data: Dict, timestamp: float):
+        revisions = self._load(filename)
+        if revisions:
+            latest = revisions[0]
+            if latest['data'] == data:
+                return  # 内容没变（如只是重新保存），不产生新版本
+            rev = latest['rev'] + 1
+            # 原来的最新版本改为反向差异，定期保留完整数据
+            if latest['rev'] % self.checkpoint_interval != 0:
+                revisions[0] = {'rev': latest['rev'], 'time': latest['time'],
+                                'delta': make_delta(data, latest['data'])}
+        else:
+            rev = 1
+        revisions.insert(0, {'rev': rev, 'time': timestamp, 'data': data})
+        self._apply_retention(revisions, timestamp)
+        self._save(filename, revisions)
+
+    def _apply_retention(self, revisions: List[Dict], now: float):
+        if self.max_revisions and len(revisions) > self.max_revisions:
+            del revisions[self.max_revisions:]
+        if self.max_age_days:
+            cutoff = now - self.max_age_days * 86400
+            while len(revisions) > 1 and revisions[-1]['time'] < cutoff:
+                revisions.pop()
+
+    def list_revisions(self, filename: str) -> List[Tuple[int, float]]:
+        """列出版本 [(版本号, 时间戳), ...]，从新到旧"""
+        self.flush()
+        return [(r['rev'], r['time']) for r in self._load(filename)]
+
+    def get_revision(self, filename: str, rev: int) -> Dict:
+        """读取指定版本的提示词数据
+        从不早于该版本的最近一个完整数据开始回放差异，最多回放checkpoint_interval个
+        """
+        self.flush()
+        revisions = self._load(filename)
+        base = None
+        for r in revisions:
+            if 'data' in r:
+                base = r['data']
+            elif base is not None:
+                base = apply_delta(base, r['delta'])
+            if r['rev'] == rev:
+                return base
+        raise KeyError(f"{filename} 没有版本 {rev}")
+
+    def get_text(self, filename: str, rev: int) -> str:
+        """读取指定版本的全文（与提示词文件相同格式的JSON文本）"""
+        return json.dumps(self.get_revision(filename, rev), ensure_ascii=False, indent=4)
+
+    def diff(self, filename: str, rev_a: int, rev_b: int) -> str:
+        """两个版本之间的统一格式差异"""
+        a = self.get_text(filename, rev_a).splitlines(True)
+        b = self.get_text(filename, rev_b).splitlines(True)
+        return ''.join(difflib.unified_diff(a, b, f"{filename}@{rev_a}", f"{filename}@{rev_b}"))
+
+    def prune(self) -> int:
+        """对所有历史文件应用保留策略，返回清理掉的版本数"""
+        self.flush()
+        removed = 0
+        now = time.time()
+        try:
+            names = os.listdir(self.history_dir)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            if not name.endswith(_SUFFIX):
+                continue
+            filename = unquote(name[:-len(_SUFFIX)])
+            try:
+                revisions = self._load(filename)
+                before = len(revisions)
+                self._apply_retention(revisions, now)
+                if len(revisions) < before:
+                    self._save(filename, revisions)
+                    removed += before - len(revisions)
+            except Exception as e:
+                print(f"清理版本历史失败: {filename}, {str(e)}")
+        return removed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="提示词版本历史")
+    sub = parser.add_subparsers(dest='command', required=True)
+    list_cmd = sub.add_parser('list', help="列出版本")
+    list_cmd.add_argument('data_dir')
+    list_cmd.add_argument('filename')
+    show_cmd = sub.add_parser('show', help="显示指定版本")
+    show_cmd.add_argument('data_dir')
+    show_cmd.add_argument('filename')
+    show_cmd.add_argument('rev', type=int)
+    diff_cmd = sub.add_parser('diff', help="比较两个版本")
+    diff_cmd.add_argument('data_dir')
+    diff_cmd.add_argument('filename')
+    diff_cmd.add_argument('rev_a', type=int)
+    diff_cmd.add_argument('rev_b', type=int)
+    args = parser.parse_args()
+
+    manager = HistoryManager(args.data_dir)
+    if args.command == 'list':
+        for rev, timestamp in manager.list_revisions(args.filename):
+            print(f"{rev:>5}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}")
+    elif args.command == 'show':
+        print(manager.get_text(args.filename, args.rev))
+    else:
+        print(manager.diff(args.filename, args.rev_a, args.rev_b))
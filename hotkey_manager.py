@@ -1,62 +1,73 @@
-"""
-热键管理模块
-
-版本日志：
-v1.0 2024-03-xx
-- 初始版本
-- 实现热键注册功能
-- 实现全局热键功能
-- 实现热键监听线程
-v1.1 2024-03-xx
-- 添加热键注册错误处理
-- 优化热键验证逻辑
-"""
-
-import keyboard
-import pyperclip
-import threading
-from typing import List, Dict
-
-class HotkeyManager:
-    def __init__(self):
-        self.hotkeys = []
-        
-    def register_hotkeys(self, data_all: List[dict]):
-        """注册所有热键"""
-        for item in data_all:
-            try:
-                # 检查shortcut字段是否存在且有效
-                shortcut = item.get('shortcut', '')
-                if not shortcut or shortcut == 'ctrl+*':
-                    continue
-                    
-                content = item.get('content', '')
-                if not content:
-                    continue
-                    
-                # 注册热键
-                keyboard.add_hotkey(shortcut, lambda c=content: pyperclip.copy(c))
-                self.hotkeys.append((shortcut, content))
-                print(f"成功注册热键: {shortcut}")
-                
-            except Exception as e:
-                print(f"注册热键失败: {str(e)}")
-                continue
-
-    def register_global_hotkey(self, hotkey: str, callback):
-        """注册全局热键"""
-        try:
-            keyboard.add_hotkey(hotkey, callback)
-            print(f"成功注册全局热键: {hotkey}")
-        except Exception as e:
-            print(f"注册全局热键失败: {str(e)}")
-
-    def start_listener(self):
-        """启动热键监听线程"""
-        try:
-            thread = threading.Thread(target=keyboard.wait)
-            thread.daemon = True
-            thread.start()
-            print("热键监听线程已启动")
-        except Exception as e:
+"""
+热键管理模块
+
+版本日志：
+v1.0 2024-03-xx
+- 初始版本
+- 实现热键注册功能
+- 实现全局热键功能
+- 实现热键监听线程
+v1.1 2024-03-xx
+- 添加热键注册错误处理
+- 优化热键验证逻辑
+v1.2 2026-10-xx
+- register_hotkeys接收 (文件名, PromptRecord) 列表
+- 快捷键触发时通过on_copy回调记录使用次数
+"""
+
+import keyboard
+import pyperclip
+import threading
+from typing import Callable, List, Optional, Tuple
+from prompt_record import PromptRecord
+
+class HotkeyManager:
+    def __init__(self, on_copy: Optional[Callable[[str, str], None]] = None):
+        self.hotkeys = []
+        # 快捷键复制提示词后的回调 on_copy(文件名, 来源)，用于使用统计
+        self.on_copy = on_copy
+        
+    def register_hotkeys(self, data_all: List[Tuple[str, PromptRecord]]):
+        """注册所有热键，data_all: [(文件名, 提示词记录), ...]"""
+        for filename, item in data_all:
+            try:
+                # 检查shortcut字段是否存在且有效
+                shortcut = item.shortcut
+                if not shortcut or shortcut == 'ctrl+*':
+                    continue
+                    
+                content = item.content
+                if not content:
+                    continue
+                    
+                # 注册热键
+                keyboard.add_hotkey(shortcut, lambda c=content, f=filename: self._copy(c, f))
+                self.hotkeys.append((shortcut, content))
+                print(f"成功注册热键: {shortcut}")
+                
+            except Exception as e:
+                print(f"注册热键失败: {str(e)}")
+                continue
+
+    def _copy(self, content: str, filename: str):
+        pyperclip.copy(content)
+        if self.on_copy is not None:
+            self.on_copy(filename, 'shortcut')
+
+    def register_global_hotkey(self, hotkey: str, callback):
+        """注册全局热键"""
+        try:
+            keyboard.add_hotkey(hotkey, callback)
+            print(f"成功注册全局热键: {hotkey}")
+        except Exception as e:
+            print(f"注册全局热键失败: {str(e)}")
+
+    def start_listener(self):
+        """启动热键监听线程"""
+        try:
+            thread = threading.Thread(target=keyboard.wait)
+            thread.daemon = True
+            thread.start()
+            print("热键监听线程已启动")
+        except Exception as e:
             print(f"启动热键监听线程失败: {str(e)}") 
\ No newline at end of file
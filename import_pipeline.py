@@ -0,0 +1,209 @@
+"""
+批量导入模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 按规范化后的正文计算哈希，与库中已有提示词（及本次导入中的前序记录）去重
+- 重复记录可以跳过，或把空字段合并到已有提示词
+- 文件写入交给DataManager.save_prompts的线程池并行执行
+- 导入结束后输出汇总报告：新增/跳过/合并/失败条数和各阶段耗时
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEDUP_MODES = ('skip', 'merge', 'off')
+# 合并时视为“未填写”的值（ctrl+*是新建提示词时的快捷键占位）
+_EMPTY_VALUES = ('', 'ctrl+*')
+# 合并时不覆盖的字段：正文相同才会合并，名称保持已有的
+_MERGE_SKIP_FIELDS = ('name', 'content')
+STAGES = ('扫描已有库', '读取', '哈希', '去重合并', '写入')
+
+
+def normalize_content(text: str) -> str:
+    """规范化正文：统一换行符，去掉行尾空白和首尾空行"""
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return '\n'.join(line.rstrip() for line in text.split('\n')).strip()
+
+
+def content_hash(data: Dict) -> Optional[str]:
+    """正文的哈希值，正文为空时返回None（空正文不参与去重）"""
+    text = normalize_content(str(data.get('content', '') or ''))
+    if not text:
+        return None
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def merge_fields(target: Dict, incoming: Dict) -> bool:
+    """把incoming中有值而target中为空的字段补到target，返回target是否有变化"""
+    changed = False
+    for key, value in incoming.items():
+        if key in _MERGE_SKIP_FIELDS or value in _EMPTY_VALUES or value is None:
+            continue
+        if target.get(key, '') in _EMPTY_VALUES:
+            target[key] = value
+            changed = True
+    return changed
+
+
+class ImportReport:
+    """导入结果汇总"""
+    def __init__(self):
+        self.inserted = 0
+        self.skipped = 0
+        self.merged = 0
+        self.failed = 0
+        self.errors: List[Tuple[str, str]] = []
+        self.stage_times: Dict[str, float] = OrderedDict((stage, 0.0) for stage in STAGES)
+        self.elapsed = 0.0
+
+    def add_time(self, stage: str, seconds: float):
+        self.stage_times[stage] += seconds
+
+    def summary(self) -> str:
+        lines = [f"导入完成: 新增 {self.inserted} 条，跳过 {self.skipped} 条，"
+                 f"合并 {self.merged} 条，失败 {self.failed} 条，耗时 {self.elapsed:.2f} 秒"]
+        lines.append('  ' + '，'.join(f"{stage} {seconds:.2f}秒" for stage, seconds in self.stage_times.items()))
+        lines.extend(f"  {where}: {message}" for where, message in self.errors)
+        return '\n'.join(lines)
+
+
+class ImportPipeline:
+    """批量导入流水线
+    读取 -> 哈希 -> 去重/合并 -> 按批并行写入，记录逐条流过，内存中只保留一批待写入的数据和哈希表
+    dedup: 'skip' 跳过重复 | 'merge' 把空字段合并到已有提示词 | 'off' 不去重
+    """
+    def __init__(self, data_manager, dedup: str = 'skip', batch_size: int = 500, max_workers: int = 8):
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"未知的去重方式: {dedup}")
+        self.data_manager = data_manager
+        self.dedup = dedup
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.report = ImportReport()
+        self._hashes: Dict[str, str] = {}  # 正文哈希 -> 文件名
+        # 当前批次: 文件名 -> [数据, 是否新文件, 合并进来的记录数]
+        self._batch: Dict[str, list] = OrderedDict()
+
+    def run(self, records: Iterable[Dict]) -> ImportReport:
+        """执行导入，读取中途出错时已读到的记录仍会写入"""
+        start = time.perf_counter()
+        if self.dedup != 'off':
+            self._load_existing_hashes()
+        iterator = iter(records)
+        index = 0
+        while True:
+            t = time.perf_counter()
+            try:
+                data = next(iterator)
+            except StopIteration:
+                break
+            except Exception as e:
+                self.report.errors.append(('读取', str(e)))
+                break
+            finally:
+                self.report.add_time('读取', time.perf_counter() - t)
+            index += 1
+            self._process(index, data)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+        self._flush()
+        self.report.elapsed = time.perf_counter() - start
+        return self.report
+
+    def _load_existing_hashes(self):
+        """计算库中已有提示词的正文哈希"""
+        t = time.perf_counter()
+        dm = self.data_manager
+        if dm.storage is not None:
+            for file, data in dm.storage.iter_records():
+                self._add_existing(file, data)
+        else:
+            for file in dm.get_all_files():
+                try:
+                    self._add_existing(file, dm.get_record(file))
+                except Exception as e:
+                    # 个别文件读取失败只影响去重，不中断导入
+                    self.report.errors.append((file, str(e)))
+        self.report.add_time('扫描已有库', time.perf_counter() - t)
+
+    def _add_existing(self, filename: str, data):
+        digest = content_hash(data)
+        if digest is not None:
+            self._hashes.setdefault(digest, filename)
+
+    def _process(self, index: int, data):
+        if not isinstance(data, dict):
+            self.report.failed += 1
+            self.report.errors.append((f"第 {index} 条", "不是JSON对象"))
+            return
+        name = str(data.get('name', '')).strip()
+        if not name:
+            self.report.failed += 1
+            self.report.errors.append((f"第 {index} 条", "缺少name"))
+            return
+
+        digest = None
+        if self.dedup != 'off':
+            t = time.perf_counter()
+            digest = content_hash(data)
+            self.report.add_time('哈希', time.perf_counter() - t)
+            existing = self._hashes.get(digest) if digest is not None else None
+            if existing is not None:
+                t = time.perf_counter()
+                self._merge_duplicate(existing, data)
+                self.report.add_time('去重合并', time.perf_counter() - t)
+                return
+
+        filename = self.data_manager.get_safe_filename(name)
+        self._batch[filename] = [data, True, 0]
+        if digest is not None:
+            self._hashes[digest] = filename
+
+    def _merge_duplicate(self, filename: str, data: Dict):
+        if self.dedup == 'skip':
+            self.report.skipped += 1
+            return
+        entry = self._batch.get(filename)
+        if entry is None:
+            try:
+                entry = [self.data_manager.read_prompt(filename), False, 0]
+            except Exception as e:
+                self.report.failed += 1
+                self.report.errors.append((filename, f"读取待合并的提示词失败: {str(e)}"))
+                return
+            if not merge_fields(entry[0], data):
+                self.report.skipped += 1
+                return
+            self._batch[filename] = entry
+        elif not merge_fields(entry[0], data):
+            self.report.skipped += 1
+            return
+        entry[2] += 1
+
+    def _flush(self):
+        """并行写入当前批次"""
+        if not self._batch:
+            return
+        t = time.perf_counter()
+        dm = self.data_manager
+        items = [(filename, entry[0]) for filename, entry in self._batch.items()]
+        failed = dict(dm.save_prompts(items, self.max_workers))
+        for filename, (_, is_new, merges) in self._batch.items():
+            error = failed.get(filename)
+            if error is None:
+                self.report.inserted += int(is_new)
+                self.report.merged += merges
+                continue
+            self.report.failed += int(is_new) + merges
+            self.report.errors.append((filename, error))
+            if is_new:
+                dm.release_filename(filename)
+                for digest in [d for d, f in self._hashes.items() if f == filename]:
+                    del self._hashes[digest]
+        dm.save_manifest()
+        self._batch = OrderedDict()
+        self.report.add_time('写入', time.perf_counter() - t)
@@ -0,0 +1,141 @@
+"""
+提示词记录模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- PromptRecord使用__slots__存储，分组名和快捷键字符串做驻留（intern）
+- 全空的预留字段add1..add8不占用额外空间
+- 与磁盘上的JSON字典无损互相转换（包括字段顺序和未知字段）
+"""
+
+import sys
+from typing import Dict, Optional, Tuple
+
+# 常用字段，直接作为属性保存
+CORE_FIELDS = ('name', 'group', 'shortcut', 'comment', 'content')
+# 预留扩展字段，绝大多数为空字符串
+RESERVED_FIELDS = tuple(f'add{i}' for i in range(1, 9))
+_RESERVED_SET = frozenset(RESERVED_FIELDS)
+_CORE_SET = frozenset(CORE_FIELDS)
+
+# 字段顺序元组的驻留表：同一种字段顺序的所有记录共享同一个元组
+_KEY_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_str(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_keys(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    return _KEY_ORDERS.setdefault(keys, keys)
+
+
+class PromptRecord:
+    """单个提示词记录
+    - 完整记录：由磁盘字典转换而来，可以用to_dict()无损还原
+    - 元数据记录：只有name/group/shortcut（索引中常驻的形式），comment/content为None
+    提供只读的get()方法，方便按字典方式读取字段
+    """
+    __slots__ = ('name', 'group', 'shortcut', 'comment', 'content', 'reserved', 'extra', 'keys')
+
+    def __init__(self, name='', group='', shortcut='', comment='', content='',
+                 reserved: Optional[Dict] = None, extra: Optional[Dict] = None,
+                 keys: Optional[Tuple[str, ...]] = None):
+        self.name = name
+        self.group = _intern_str(group)
+        self.shortcut = _intern_str(shortcut)
+        self.comment = comment
+        self.content = content
+        self.reserved = reserved or None  # 只保存非空的预留字段
+        self.extra = extra or None        # 模板之外的字段
+        self.keys = keys                  # 磁盘上的字段顺序；元数据记录为None
+
+    @classmethod
+    def meta(cls, name: str, group: str, shortcut: str) -> 'PromptRecord':
+        """创建只含元数据的记录"""
+        return cls(name, group, shortcut, comment=None, content=None)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PromptRecord':
+        """从磁盘上的JSON字典创建完整记录"""
+        record = cls()
+        reserved = None
+        extra = None
+        for key, value in data.items():
+            if key in _CORE_SET:
+                setattr(record, key, value)
+            elif key in _RESERVED_SET:
+                if value != '':
+                    if reserved is None:
+                        reserved = {}
+                    reserved[key] = value
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        record.group = _intern_str(record.group)
+        record.shortcut = _intern_str(record.shortcut)
+        record.reserved = reserved
+        record.extra = extra
+        record.keys = _intern_keys(tuple(data))
+        return record
+
+    @property
+    def is_meta(self) -> bool:
+        """是否只含元数据（没有正文）"""
+        return self.keys is None
+
+    def to_dict(self) -> Dict:
+        """还原为磁盘上的JSON字典（字段顺序与读取时一致）"""
+        if self.keys is None:
+            raise ValueError("元数据记录不包含正文，无法还原为完整字典")
+        data = {}
+        for key in self.keys:
+            if key in _CORE_SET:
+                data[key] = getattr(self, key)
+            elif key in _RESERVED_SET:
+                data[key] = self.reserved.get(key, '') if self.reserved else ''
+            else:
+                data[key] = self.extra[key]
+        return data
+
+    def to_meta(self) -> 'PromptRecord':
+        """提取元数据记录"""
+        return PromptRecord.meta(str(self.name), str(self.group), str(self.shortcut))
+
+    def meta_key(self) -> Tuple[str, str, str]:
+        """用于比较元数据是否变化"""
+        return (str(self.name), str(self.group), str(self.shortcut))
+
+    def get(self, key: str, default=None):
+        """按字典方式读取字段"""
+        if key in _CORE_SET:
+            value = getattr(self, key)
+            return default if value is None else value
+        if key in _RESERVED_SET:
+            if self.reserved and key in self.reserved:
+                return self.reserved[key]
+            return '' if self.keys and key in self.keys else default
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def estimate_size(self) -> int:
+        """估算占用的内存（字节），分组和快捷键为共享字符串，不计入"""
+        size = sys.getsizeof(self)
+        for value in (self.name, self.comment, self.content):
+            if value is not None:
+                size += sys.getsizeof(value)
+        for table in (self.reserved, self.extra):
+            if table:
+                size += sys.getsizeof(table) + sum(sys.getsizeof(v) for v in table.values())
+        return size
+
+    def __eq__(self, other):
+        if not isinstance(other, PromptRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"PromptRecord(name={self.name!r}, group={self.group!r}, shortcut={self.shortcut!r})"
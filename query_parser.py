@@ -0,0 +1,293 @@
+"""
+搜索语法解析模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 支持字段前缀（name: content: comment: group:）、减号排除、双引号短语、AND/OR（OR也可写作|）和括号
+- 查询只解析一次，得到由Term/And/Or/Not组成的查询计划：
+  先用倒排索引求候选（And求交集、Or求并集，排除条件不参与），再对候选做精确校验
+- 语法只在搜索模式选择"语法"时生效，其他模式用literal_query把输入整体作为一个关键词，
+  print(x)、foo (bar、-x 等都按字面搜索
+- 不含任何语法的查询整体作为一个关键词，与原来的包含搜索完全一致
+- 解析不会报错：括号或引号不配对、运算符缺少操作数时，整个输入按普通关键词处理
+
+示例：
+    group:000常用 name:代码 -content:test
+    "code review" OR 代码审查
+    name:(翻译 | 总结) -group:模板
+"""
+
+from typing import List, Optional, Set
+from search_index import SEARCH_FIELDS, field_text
+
+# 词法单元类型
+_LPAREN = '('
+_RPAREN = ')'
+_NEG = '-'
+_AND = 'AND'
+_OR = 'OR'
+_TERM = 'TERM'
+
+
+class _ParseError(Exception):
+    """查询不完整或不合法，由parse_query转为普通关键词"""
+
+
+class Term:
+    """单个关键词：在指定字段（field为None时为任意字段）中包含text"""
+    __slots__ = ('field', 'text')
+
+    def __init__(self, field: Optional[str], text: str):
+        self.field = field
+        self.text = text.lower()
+
+    @property
+    def fields(self):
+        return (self.field,) if self.field else SEARCH_FIELDS
+
+    def candidates(self, index) -> Optional[Set[int]]:
+        result = set()
+        for field in self.fields:
+            result |= index.field_candidates(field, self.text)
+        return result
+
+    def matches(self, record) -> bool:
+        return any(self.text in field_text(getattr(record, field)) for field in self.fields)
+
+    def __repr__(self):
+        return f"{self.field}:{self.text!r}" if self.field else repr(self.text)
+
+
+class Not:
+    """排除：不满足child"""
+    __slots__ = ('child',)
+
+    def __init__(self, child):
+        self.child = child
+
+    def candidates(self, index) -> Optional[Set[int]]:
+        return None  # 排除条件无法缩小候选范围
+
+    def matches(self, record) -> bool:
+        return not self.child.matches(record)
+
+    def __repr__(self):
+        return f"NOT {self.child!r}"
+
+
+class And:
+    """同时满足所有子条件"""
+    __slots__ = ('children',)
+
+    def __init__(self, children: list):
+        # 校验时先检查肯定条件，排除条件放在最后
+        self.children = sorted(children, key=lambda child: isinstance(child, Not))
+
+    def candidates(self, index) -> Optional[Set[int]]:
+        sets = [ids for ids in (child.candidates(index) for child in self.children) if ids is not None]
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
+
+    def matches(self, record) -> bool:
+        return all(child.matches(record) for child in self.children)
+
+    def __repr__(self):
+        return '(' + ' AND '.join(map(repr, self.children)) + ')'
+
+
+class Or:
+    """满足任意一个子条件"""
+    __slots__ = ('children',)
+
+    def __init__(self, children: list):
+        self.children = children
+
+    def candidates(self, index) -> Optional[Set[int]]:
+        result = set()
+        for child in self.children:
+            ids = child.candidates(index)
+            if ids is None:
+                return None
+            result |= ids
+        return result
+
+    def matches(self, record) -> bool:
+        return any(child.matches(record) for child in self.children)
+
+    def __repr__(self):
+        return '(' + ' OR '.join(map(repr, self.children)) + ')'
+
+
+class Query:
+    """解析后的查询
+    root: 查询计划的根节点（查询为空时为None）
+    plain: 查询不含任何语法，整体是一个关键词
+    """
+    __slots__ = ('text', 'root', 'plain')
+
+    def __init__(self, text: str, root, plain: bool):
+        self.text = text
+        self.root = root
+        self.plain = plain
+
+    def candidates(self, index) -> List[str]:
+        """由倒排索引得到的候选文件名（需要再用matches校验）"""
+        if self.root is None:
+            return []
+        ids = self.root.candidates(index)
+        doc_files = index.doc_files
+        if ids is None:
+            # 只有排除条件，只能逐个检查所有文件
+            return list(index.doc_ids)
+        return [doc_files[doc_id] for doc_id in ids if doc_files[doc_id] is not None]
+
+    def matches(self, record) -> bool:
+        return self.root is not None and self.root.matches(record)
+
+    def highlight_terms(self) -> List[str]:
+        """需要高亮的关键词（排除条件中的除外）"""
+        terms = []
+
+        def collect(node):
+            if isinstance(node, Term):
+                if node.text not in terms:
+                    terms.append(node.text)
+            elif isinstance(node, (And, Or)):
+                for child in node.children:
+                    collect(child)
+
+        collect(self.root)
+        return terms
+
+    def __repr__(self):
+        return f"Query({self.root!r})"
+
+
+def _tokenize(text: str) -> list:
+    """切分为词法单元 [(类型, 字段, 文本), ...]"""
+    tokens = []
+    i = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c == '(':
+            tokens.append((_LPAREN, None, c))
+            i += 1
+        elif c == ')':
+            tokens.append((_RPAREN, None, c))
+            i += 1
+        elif c == '-' and i + 1 < n and not text[i + 1].isspace():
+            tokens.append((_NEG, None, c))
+            i += 1
+        elif c == '"':
+            end = text.find('"', i + 1)
+            if end == -1:
+                raise _ParseError('缺少右引号')
+            tokens.append((_TERM, None, text[i + 1:end]))
+            i = end + 1
+        else:
+            start = i
+            while i < n and not text[i].isspace() and text[i] not in '()"':
+                i += 1
+            word = text[start:i]
+            field, _, value = word.partition(':')
+            if value or (word.endswith(':') and i < n and text[i] in '"('):
+                if field.lower() in SEARCH_FIELDS:
+                    field = field.lower()
+                    if not value and text[i] == '"':
+                        end = text.find('"', i + 1)
+                        if end == -1:
+                            raise _ParseError('缺少右引号')
+                        value = text[i + 1:end]
+                        i = end + 1
+                    elif not value:
+                        # name:(a | b) 字段作用于括号内的所有关键词
+                        tokens.append((_LPAREN, field, '('))
+                        i += 1
+                        continue
+                    tokens.append((_TERM, field, value))
+                    continue
+            if word in ('AND', 'OR', '|'):
+                tokens.append((_AND if word == 'AND' else _OR, None, word))
+            else:
+                tokens.append((_TERM, None, word))
+    return tokens
+
+
+class _Parser:
+    """递归下降解析：OR的优先级低于AND，相邻的关键词之间默认是AND；不合法时抛出_ParseError"""
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def parse_or(self, field=None):
+        children = [self.parse_and(field)]
+        while self.peek() == _OR:
+            self.pos += 1
+            children.append(self.parse_and(field))
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self, field=None):
+        children = []
+        while self.peek() not in (None, _OR, _RPAREN):
+            if self.peek() == _AND:
+                self.pos += 1
+                if not children or self.peek() in (None, _OR, _RPAREN, _AND):
+                    raise _ParseError('AND缺少操作数')
+                continue
+            children.append(self.parse_unary(field))
+        if not children:
+            raise _ParseError('缺少关键词')
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_unary(self, field=None):
+        kind, token_field, text = self.tokens[self.pos]
+        self.pos += 1
+        if kind == _NEG:
+            if self.peek() in (None, _OR, _RPAREN, _AND):
+                raise _ParseError('排除条件缺少关键词')
+            return Not(self.parse_unary(field))
+        if kind == _LPAREN:
+            node = self.parse_or(token_field or field)
+            if self.peek() != _RPAREN:
+                raise _ParseError('缺少右括号')
+            self.pos += 1
+            return node
+        if not text:
+            raise _ParseError('空关键词')
+        return Term(token_field or field, text)
+
+
+def literal_query(text: str) -> Query:
+    """不解析语法，整个输入作为一个关键词"""
+    text = text.strip()
+    return Query(text, Term(None, text) if text else None, True)
+
+
+def parse_query(text: str) -> Query:
+    """解析查询；不含任何语法或无法解析时整体作为一个关键词"""
+    text = text.strip()
+    try:
+        tokens = _tokenize(text)
+        if all(kind == _TERM and field is None for kind, field, _ in tokens) and '"' not in text:
+            return literal_query(text)
+        parser = _Parser(tokens)
+        root = parser.parse_or()
+        if parser.pos < len(tokens):
+            raise _ParseError('多余的右括号')
+    except _ParseError:
+        return literal_query(text)
+    return Query(text, root, False)
@@ -0,0 +1,350 @@
+"""
+正则搜索分析模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 编译正则时分析语法树，找出任何匹配都必须包含的字面量，用于在倒排索引中预先缩小候选
+- 拒绝嵌套的无上限重复（如 (a+)+、(\\w*)*），这类模式在不匹配时会指数级回溯，无法中途打断
+- 同样拒绝重复内分支可以匹配相同文本的选择（如 (a|a)*、(ab|a.)+），
+  可以为空且含有可选部分的重复（如 (a?b?)*），以及有上限的重复包着无上限的重复（如 (.*a){12}），回溯次数随重复次数成指数或高次幂增长
+- 添加RegexWorker：在子进程中执行正则匹配（同时给出匹配位置），超时时结束子进程，
+  re模块的一次匹配在本进程中无法中途打断
+- 子进程用spawn方式启动，会重新导入主模块：程序入口必须放在 if __name__ == "__main__": 之下，
+  并先调用multiprocessing.freeze_support()（打包成exe时需要），否则子进程会再次启动整个程序；
+  子进程无法启动时退回本进程匹配，每匹配一组文本检查一次超时（单次匹配仍无法打断，靠安全检查拒绝危险模式）
+"""
+
+import multiprocessing
+import re
+import threading
+import time
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python 3.10及以前
+    import sre_parse
+    import sre_constants
+
+_LITERAL = sre_constants.LITERAL
+_NOT_LITERAL = sre_constants.NOT_LITERAL
+_IN = sre_constants.IN
+_ANY = sre_constants.ANY
+_NEGATE = sre_constants.NEGATE
+_RANGE = sre_constants.RANGE
+_CATEGORY = sre_constants.CATEGORY
+_SUBPATTERN = sre_constants.SUBPATTERN
+_AT = sre_constants.AT
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+_POSSESSIVE_REPEAT = getattr(sre_constants, 'POSSESSIVE_REPEAT', None)
+_BRANCH = sre_constants.BRANCH
+_MAXREPEAT = sre_constants.MAXREPEAT
+
+# 正则搜索统一忽略大小写
+REGEX_FLAGS = re.IGNORECASE
+
+# 字符类中的类别（\\d \\w \\s 等）对应的正则，用于判断单个字符是否属于该类别
+_CATEGORY_PATTERNS = {
+    sre_constants.CATEGORY_DIGIT: r'\d', sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_WORD: r'\w', sre_constants.CATEGORY_NOT_WORD: r'\W',
+    sre_constants.CATEGORY_SPACE: r'\s', sre_constants.CATEGORY_NOT_SPACE: r'\S',
+}
+
+
+class UnsafePatternError(ValueError):
+    """可能导致回溯爆炸的正则"""
+
+
+def _children(op, av) -> List:
+    """节点包含的子序列"""
+    if op == _SUBPATTERN:
+        return [av[-1]]
+    if op in _REPEATS:
+        return [av[2]]
+    if op == _BRANCH:
+        return list(av[1])
+    if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+        return [av]
+    return []
+
+
+def _has_repeat(seq, limit: int = 1) -> bool:
+    """序列中是否有最多次数超过limit的重复（原子组内的除外），limit为0时包括 ? 这样的可选部分"""
+    for op, av in seq:
+        if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            continue
+        if op in _REPEATS and av[1] > limit:
+            return True
+        if any(_has_repeat(child, limit) for child in _children(op, av)):
+            return True
+    return False
+
+
+def _has_unbounded_repeat(seq) -> bool:
+    """序列中是否有无上限的重复（原子组和占有型重复除外）"""
+    for op, av in seq:
+        if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            continue
+        if op in _REPEATS and av[1] == _MAXREPEAT and op != _POSSESSIVE_REPEAT:
+            return True
+        if any(_has_unbounded_repeat(child) for child in _children(op, av)):
+            return True
+    return False
+
+
+def _first_chars(seq) -> Tuple[list, bool]:
+    """匹配序列时第一个字符的可能范围，返回 (范围列表, 能否匹配空文本)
+    范围为 ('chars', 字符集合) 或 ('class', 字符类)，字符类为None时表示任意字符
+    """
+    terms = []
+    for op, av in seq:
+        if op == _AT:
+            continue  # 不占字符
+        if op == _LITERAL:
+            terms.append(('chars', {chr(av).lower()}))
+            return terms, False
+        if op == _NOT_LITERAL:
+            terms.append(('class', [(_NEGATE, None), (_LITERAL, av)]))
+            return terms, False
+        if op == _IN:
+            terms.append(('class', av))
+            return terms, False
+        if op == _ANY:
+            terms.append(('class', [(_NEGATE, None), (_LITERAL, ord('\n'))]))
+            return terms, False
+        if op == _BRANCH:
+            nullable = False
+            for branch in av[1]:
+                branch_terms, branch_nullable = _first_chars(branch)
+                terms.extend(branch_terms)
+                nullable = nullable or branch_nullable
+        elif op in _REPEATS or op == _SUBPATTERN or (_ATOMIC_GROUP is not None and op == _ATOMIC_GROUP):
+            child_terms, nullable = _first_chars(_children(op, av)[0])
+            terms.extend(child_terms)
+            nullable = nullable or (op in _REPEATS and av[0] == 0)
+        else:
+            # 反向引用、环视等：无法判断，按可能不占字符的任意字符处理
+            terms.append(('class', None))
+            continue
+        if not nullable:
+            return terms, False
+    return terms, True
+
+
+def _class_contains(items, char: str) -> bool:
+    """字符char（已是小写）是否可能属于字符类items（忽略大小写）"""
+    if items is None:
+        return True
+    negate = bool(items) and items[0][0] == _NEGATE
+    found = False
+    for op, av in items:
+        if op == _LITERAL:
+            found = chr(av).lower() == char
+        elif op == _RANGE:
+            found = any(av[0] <= ord(c) <= av[1] for c in (char, char.upper()))
+        elif op == _CATEGORY:
+            pattern = _CATEGORY_PATTERNS.get(av)
+            found = pattern is None or re.fullmatch(pattern, char) is not None
+        else:
+            found = op != _NEGATE
+        if found:
+            break
+    return found != negate
+
+
+def _terms_overlap(left: list, right: list) -> bool:
+    """两组首字符范围是否有交集（无法判断时按有交集处理）"""
+    for left_kind, left_value in left:
+        for right_kind, right_value in right:
+            if left_kind == 'chars' and right_kind == 'chars':
+                if left_value & right_value:
+                    return True
+            elif left_kind == 'chars':
+                if any(_class_contains(right_value, c) for c in left_value):
+                    return True
+            elif right_kind == 'chars':
+                if any(_class_contains(left_value, c) for c in right_value):
+                    return True
+            else:
+                return True
+    return False
+
+
+def _has_ambiguous_branch(seq) -> bool:
+    """序列中是否有两个分支可能匹配相同文本的选择（首字符范围有交集或都能匹配空文本）"""
+    for op, av in seq:
+        if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            continue
+        if op == _BRANCH:
+            firsts = [_first_chars(branch) for branch in av[1]]
+            for i, (terms, nullable) in enumerate(firsts):
+                for other_terms, other_nullable in firsts[i + 1:]:
+                    if (nullable and other_nullable) or _terms_overlap(terms, other_terms):
+                        return True
+        if any(_has_ambiguous_branch(child) for child in _children(op, av)):
+            return True
+    return False
+
+
+def check_pattern_safety(seq):
+    """发现可能回溯爆炸的重复时抛出UnsafePatternError：
+    无上限重复的内部还有重复（或可以为空且含有可选部分）、可重复的部分内有可能匹配相同文本的分支、
+    有上限的重复包着无上限的重复
+    """
+    for op, av in seq:
+        if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            continue  # 原子组不会回溯
+        if op in _REPEATS and av[1] > 1 and op != _POSSESSIVE_REPEAT:
+            if av[1] == _MAXREPEAT and _has_repeat(av[2]):
+                raise UnsafePatternError("正则中有嵌套的重复（如 (a+)+），可能导致搜索卡死，请改写")
+            if av[1] == _MAXREPEAT and _first_chars(av[2])[1] and _has_repeat(av[2], 0):
+                raise UnsafePatternError("正则中重复的部分可以为空且含有可选部分（如 (a?b?)*），可能导致搜索卡死，请改写")
+            if av[1] != _MAXREPEAT and _has_unbounded_repeat(av[2]):
+                raise UnsafePatternError("正则中有限次重复包含了无上限的重复（如 (.*a){12}），可能导致搜索卡死，请改写")
+            if _has_ambiguous_branch(av[2]):
+                raise UnsafePatternError("正则的重复部分中有可能匹配相同内容的分支（如 (a|a)*），可能导致搜索卡死，请改写")
+        for child in _children(op, av):
+            check_pattern_safety(child)
+
+
+def required_literals(seq) -> List[str]:
+    """任何匹配都必须包含的字面量（已转为小写），连续的字面字符合并为一段"""
+    literals = []
+    run = []
+
+    def end_run():
+        if run:
+            literals.append(''.join(run).lower())
+            run.clear()
+
+    def walk(items):
+        for op, av in items:
+            if op == _LITERAL:
+                run.append(chr(av))
+            elif op == _AT:
+                continue  # ^ $ \b 等不占字符，不打断字面量
+            elif op == _SUBPATTERN or (_ATOMIC_GROUP is not None and op == _ATOMIC_GROUP):
+                walk(_children(op, av)[0])
+            elif op in _REPEATS and av[0] >= 1:
+                # 至少出现一次：重复体内的字面量是必需的，但与前后不连续
+                end_run()
+                walk(av[2])
+                end_run()
+            else:
+                end_run()
+
+    walk(seq)
+    end_run()
+    return literals
+
+
+def compile_search_pattern(pattern: str) -> Tuple['re.Pattern', List[str]]:
+    """编译搜索用的正则，返回 (编译后的正则, 必需的字面量)
+    正则语法错误时抛出re.error，模式不安全时抛出UnsafePatternError
+    """
+    compiled = re.compile(pattern, REGEX_FLAGS)
+    try:
+        parsed = sre_parse.parse(pattern, REGEX_FLAGS)
+    except Exception:
+        return compiled, []
+    check_pattern_safety(parsed)
+    return compiled, required_literals(parsed)
+
+
+def _match_worker(conn):
+    """子进程：反复接收 (正则, [文本组, ...], 是否需要匹配位置)，返回与文本组一一对应的结果"""
+    pattern = compiled = None
+    conn.send(None)  # 已就绪
+    while True:
+        try:
+            request_pattern, jobs, want_spans = conn.recv()
+        except EOFError:
+            return
+        if request_pattern != pattern:
+            pattern, compiled = request_pattern, re.compile(request_pattern, REGEX_FLAGS)
+        conn.send(_match_jobs(compiled, jobs, want_spans))
+
+
+def _match_jobs(compiled, jobs, want_spans: bool, deadline: Optional[float] = None) -> list:
+    """逐组匹配，结果格式见RegexWorker.match；给出deadline时每组之间检查，超过时抛出TimeoutError"""
+    results = []
+    for texts in jobs:
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(compiled.pattern)
+        if not any(text is not None and compiled.search(text) for text in texts):
+            results.append(None)
+        elif want_spans:
+            results.append([[match.span() for match in compiled.finditer(text) if match.end() > match.start()]
+                            if text else [] for text in texts])
+        else:
+            results.append(True)
+    return results
+
+
+class RegexWorker:
+    """在子进程中执行正则匹配
+    re模块的一次匹配一直持有GIL，在本进程中无法中途打断；放到子进程中，超时时直接结束子进程，下次使用时重新启动
+    子进程无法启动时（如主模块没有__main__保护）改为在本进程中匹配
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._in_process = False
+        self._compiled = None
+
+    def _start(self) -> bool:
+        """确保子进程在运行，无法启动时返回False"""
+        if self._in_process:
+            return False
+        if self._process is not None and self._process.is_alive():
+            return True
+        self._stop()
+        context = multiprocessing.get_context('spawn')
+        conn, child_conn = context.Pipe()
+        process = context.Process(target=_match_worker, args=(child_conn,), daemon=True)
+        try:
+            process.start()
+            child_conn.close()
+            conn.recv()  # 等待子进程就绪，启动时间不计入匹配的时间预算
+        except (OSError, EOFError, RuntimeError) as e:
+            print(f"正则匹配子进程启动失败，改为在本进程中匹配: {str(e)}")
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+            self._in_process = True
+            return False
+        self._process, self._conn = process, conn
+        return True
+
+    def _stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._conn.close()
+            self._process = self._conn = None
+
+    def match(self, pattern: str, jobs: List[Tuple[Optional[str], ...]], want_spans: bool,
+              timeout: float) -> list:
+        """逐组匹配jobs中的文本（任意一个文本匹配即算匹配），返回与jobs对应的列表：
+        不匹配为None；匹配时want_spans为False返回True，否则返回每个文本的匹配位置 [[(开始, 结束), ...], ...]
+        timeout秒内没有完成时结束子进程并抛出TimeoutError
+        """
+        with self._lock:
+            if not self._start():
+                if self._compiled is None or self._compiled.pattern != pattern:
+                    self._compiled = re.compile(pattern, REGEX_FLAGS)
+                return _match_jobs(self._compiled, jobs, want_spans, time.monotonic() + max(timeout, 0))
+            self._conn.send((pattern, jobs, want_spans))
+            if self._conn.poll(max(timeout, 0)):
+                return self._conn.recv()
+            self._stop()
+            raise TimeoutError(pattern)
+
+    def close(self):
+        with self._lock:
+            self._stop()
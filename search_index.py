@@ -0,0 +1,235 @@
+"""
+搜索索引模块 - 字符n-gram倒排索引
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 按字段（名称、正文、备注、分组）建立1~3字符的倒排索引，中文不需要分词
+- 查询取关键词的全部n-gram求交集得到候选，候选再由调用方做精确的子串校验
+- 删除和修改采用墓碑标记，不需要知道旧内容；失效的编号累计到一定比例后统一压缩
+- 记录各字段长度，提供BM25需要的文档频率和平均长度
+- 添加gram_matches（按共有的n-gram数取近似匹配的候选）和substring_distance（有上限的编辑距离）
+- 压缩时按顺序重新编号有效文档，编号表和长度表不再随修改次数无限增长
+- 不再索引单个字符：单字的倒排表几乎包含所有文档，占用大量内存却缩小不了候选；
+  单字关键词的候选为全部有效文档，由调用方逐个校验
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+# 参与搜索的字段
+SEARCH_FIELDS = ('name', 'content', 'comment', 'group')
+# 索引的n-gram长度范围：关键词超过MAX_GRAM时用它的全部三元组求交集，
+# 短于MIN_GRAM的关键词不能用索引缩小候选
+MIN_GRAM = 2
+MAX_GRAM = 3
+# 失效编号超过有效编号的这个比例时压缩倒排表
+_COMPACT_RATIO = 0.25
+
+
+def field_text(value) -> str:
+    """字段值统一为小写字符串（与子串校验使用相同的规则）"""
+    if value is None:
+        return ''
+    return str(value).lower()
+
+
+def text_grams(text: str) -> Set[str]:
+    """文本中所有长度为MIN_GRAM~MAX_GRAM的n-gram"""
+    grams = set()
+    for n in range(MIN_GRAM, MAX_GRAM + 1):
+        grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def query_grams(keyword: str, size: int = MAX_GRAM) -> Set[str]:
+    """包含keyword的文本一定包含的n-gram（keyword已是小写，size不超过MAX_GRAM）
+    keyword短于MIN_GRAM时返回空集合
+    """
+    n = min(len(keyword), size)
+    if n < MIN_GRAM:
+        return set()
+    return {keyword[i:i + n] for i in range(len(keyword) - n + 1)}
+
+
+def substring_distance(pattern: str, text: str, max_dist: int) -> int:
+    """pattern与text中最接近的子串之间的编辑距离（Myers位并行算法，每个字符只做几次整数运算）
+    超过max_dist时返回max_dist + 1
+    """
+    if pattern in text:
+        return 0
+    m = len(pattern)
+    if m == 0:
+        return 0
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = full, 0
+    score = best = m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+            if score < best:
+                best = score
+                if best == 0:
+                    break
+        # 第0行的水平差为0：匹配可以从text的任意位置开始
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return best if best <= max_dist else max_dist + 1
+
+
+def bm25_idf(doc_count: int, doc_freq: int) -> float:
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+class NgramIndex:
+    """字符n-gram倒排索引
+    每个字段一张倒排表 gram -> {文档编号}；文件每次加入都分配新编号，
+    删除时只把编号标记为失效（墓碑），查询时过滤掉，累计过多时compact()统一清理并重新编号
+    """
+    def __init__(self, fields: Iterable[str] = SEARCH_FIELDS):
+        self.fields = tuple(fields)
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.fields}
+        self.doc_files: List[Optional[str]] = []   # 编号 -> 文件名，失效的编号为None
+        self.doc_ids: Dict[str, int] = {}          # 文件名 -> 当前编号
+        self._dead: Set[int] = set()
+        # 各字段的长度（按编号）和有效文档的长度总和，用于BM25
+        self.doc_lengths: Dict[str, List[int]] = {field: [] for field in self.fields}
+        self._length_sums: Dict[str, int] = {field: 0 for field in self.fields}
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __contains__(self, filename):
+        return filename in self.doc_ids
+
+    def clear(self):
+        for field in self.fields:
+            self.postings[field] = {}
+            self.doc_lengths[field] = []
+            self._length_sums[field] = 0
+        self.doc_files = []
+        self.doc_ids = {}
+        self._dead = set()
+
+    def add(self, filename: str, record):
+        """加入（或替换）一个文件，record只需具有各字段同名的属性"""
+        self.remove(filename)
+        doc_id = len(self.doc_files)
+        self.doc_files.append(filename)
+        self.doc_ids[filename] = doc_id
+        for field in self.fields:
+            postings = self.postings[field]
+            text = field_text(getattr(record, field, None))
+            self.doc_lengths[field].append(len(text))
+            self._length_sums[field] += len(text)
+            for gram in text_grams(text):
+                ids = postings.get(gram)
+                if ids is None:
+                    postings[gram] = {doc_id}
+                else:
+                    ids.add(doc_id)
+
+    def remove(self, filename: str) -> bool:
+        """移除一个文件（墓碑标记），文件不在索引中时返回False"""
+        doc_id = self.doc_ids.pop(filename, None)
+        if doc_id is None:
+            return False
+        self.doc_files[doc_id] = None
+        self._dead.add(doc_id)
+        for field in self.fields:
+            self._length_sums[field] -= self.doc_lengths[field][doc_id]
+        if len(self._dead) > _COMPACT_RATIO * max(len(self.doc_ids), 1) and len(self._dead) >= 64:
+            self.compact()
+        return True
+
+    def compact(self):
+        """从倒排表中清除失效的编号，删除变空的gram，有效文档按原顺序重新编号为0~n-1"""
+        if not self._dead:
+            return
+        renumber = {}
+        doc_files = []
+        for doc_id, filename in enumerate(self.doc_files):
+            if filename is not None:
+                renumber[doc_id] = len(doc_files)
+                doc_files.append(filename)
+        for field in self.fields:
+            postings = self.postings[field]
+            for gram in list(postings):
+                ids = {renumber[doc_id] for doc_id in postings[gram] if doc_id in renumber}
+                if ids:
+                    postings[gram] = ids
+                else:
+                    del postings[gram]
+            lengths = self.doc_lengths[field]
+            self.doc_lengths[field] = [lengths[doc_id] for doc_id in renumber]
+        self.doc_files = doc_files
+        self.doc_ids = {filename: doc_id for doc_id, filename in enumerate(doc_files)}
+        self._dead = set()
+
+    def field_candidates(self, field: str, keyword: str) -> Set[int]:
+        """某个字段可能包含keyword的文档编号（已是小写，可能含失效编号）
+        keyword短于MIN_GRAM时返回全部有效文档
+        """
+        if len(keyword) < MIN_GRAM:
+            return set(self.doc_ids.values()) if keyword else set()
+        postings = self.postings[field]
+        sets = []
+        for gram in query_grams(keyword):
+            ids = postings.get(gram)
+            if not ids:
+                return set()
+            sets.append(ids)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def candidates(self, keyword: str, fields: Optional[Iterable[str]] = None) -> List[str]:
+        """任意一个字段可能包含keyword的文件名（需要再做子串校验）"""
+        keyword = keyword.lower()
+        if not keyword:
+            return []
+        ids: Set[int] = set()
+        for field in (fields or self.fields):
+            ids |= self.field_candidates(field, keyword)
+        doc_files = self.doc_files
+        return [doc_files[doc_id] for doc_id in ids if doc_files[doc_id] is not None]
+
+    def avg_length(self, field: str) -> float:
+        """有效文档中该字段的平均长度"""
+        return self._length_sums[field] / len(self.doc_ids) if self.doc_ids else 0.0
+
+    def doc_freq(self, field: str, gram: str) -> int:
+        """该字段包含gram的文档数（可能多算尚未压缩的失效编号）"""
+        ids = self.postings[field].get(gram)
+        return len(ids) if ids else 0
+
+    def gram_matches(self, grams: Iterable[str], fields: Optional[Iterable[str]] = None) -> Dict[int, int]:
+        """每个有效文档（在任意字段中）包含了grams中的几个，只返回至少包含一个的文档"""
+        fields = tuple(fields or self.fields)
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            ids = set()
+            for field in fields:
+                ids.update(self.postings[field].get(gram, ()))
+            for doc_id in ids:
+                counts[doc_id] += 1
+        doc_files = self.doc_files
+        return {doc_id: count for doc_id, count in counts.items() if doc_files[doc_id] is not None}
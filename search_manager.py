@@ -1,80 +1,516 @@
-"""
-搜索管理模块
-
-版本日志：
-v1.0 2024-03-xx
-- 初始版本
-- 实现全局搜索功能
-- 实现分类内搜索功能
-- 实现搜索结果高亮
-"""
-
-import re
-import json
-from typing import List, Dict, Tuple
-
-class SearchManager:
-    def __init__(self, data_manager):
-        self.data_manager = data_manager
-        
-    def global_search(self, keyword: str) -> List[Tuple[str, Dict]]:
-        """全局搜索
-        返回: [(文件名, 文件数据), ...]
-        """
-        if not keyword:
-            return []
-            
-        results = []
-        for file in self.data_manager.get_all_files():
-            try:
-                with open(self.data_manager.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # 搜索所有字段
-                    if self._search_in_data(keyword, data):
-                        results.append((file, data))
-            except Exception as e:
-                print(f"搜索文件出错: {file}, {str(e)}")
-        return results
-        
-    def group_search(self, keyword: str, group: str) -> List[Tuple[str, Dict]]:
-        """分组内搜索
-        返回: [(文件名, 文件数据), ...]
-        """
-        if not keyword or not group:
-            return []
-            
-        results = []
-        for file in self.data_manager.get_files_by_group(group):
-            try:
-                with open(self.data_manager.get_data_path(file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if self._search_in_data(keyword, data):
-                        results.append((file, data))
-            except Exception as e:
-                print(f"搜索文件出错: {file}, {str(e)}")
-        return results
-        
-    def _search_in_data(self, keyword: str, data: Dict) -> bool:
-        """在数据中搜索关键词"""
-        keyword = keyword.lower()
-        # 搜索所有文本字段
-        for field in ['name', 'content', 'comment', 'group']:
-            if keyword in str(data.get(field, '')).lower():
-                return True
-        return False
-        
-    def get_highlight_ranges(self, text: str, keyword: str) -> List[Tuple[int, int]]:
-        """获取需要高亮的文本范围
-        返回: [(开始位置, 结束位置), ...]
-        """
-        if not keyword or not text:
-            return []
-            
-        ranges = []
-        keyword = re.escape(keyword.lower())
-        text_lower = text.lower()
-        
-        for match in re.finditer(keyword, text_lower):
-            ranges.append((match.start(), match.end()))
-            
-        return ranges 
\ No newline at end of file
+"""
+搜索管理模块
+
+版本日志：
+v1.0 2024-03-xx
+- 初始版本
+- 实现全局搜索功能
+- 实现分类内搜索功能
+- 实现搜索结果高亮
+v1.1 2026-10-xx
+- 搜索直接读取缓存中的PromptRecord，不再为每个文件复制字典
+- 全局搜索和分组搜索改用字符n-gram倒排索引（search_index）取候选，再做精确子串校验
+- 索引在第一次搜索时建立，提示词保存、删除时通过DataManager的变化通知增量更新
+- 添加SearchSession：关键词加长时在上次结果中筛选，变短时使用缓存的结果
+- 添加iter_search，逐个产生结果并可随时取消，供界面在后台线程中分批显示
+- 添加相关度搜索（ranked_search）：BM25按字段加权打分，允许少量错字，用堆取前K个结果
+- 支持搜索语法（字段前缀、排除、短语、AND/OR），查询解析为计划后先在索引中求候选再校验
+- 添加正则搜索模式：正则只编译一次，用必需的字面量预先缩小候选，有时间预算，拒绝嵌套重复
+- get_highlight_ranges直接返回tkinter的"行.列"位置，由行起始位置表和二分查找换算
+- 可通过配置项search_engine选择搜索引擎：倒排索引（默认）、列式缓冲区（columnar_index）或逐个扫描
+- 正则在子进程中分批匹配（regex_analyzer.RegexWorker），超时时结束子进程；
+  高亮用的匹配位置在搜索时一并算出，界面线程不再执行正则
+- SearchSession只在读写缓存时加锁，搜索本身不持有锁；正则搜索不使用缓存
+- 搜索语法改为单独的"语法"模式（MODE_QUERY），包含和相关度模式把输入整体当作关键词
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from prompt_record import PromptRecord
+from query_parser import And, Query, Term, literal_query, parse_query
+from regex_analyzer import RegexWorker, compile_search_pattern
+from columnar_index import ColumnarIndex
+from search_index import (MIN_GRAM, NgramIndex, SEARCH_FIELDS, bm25_idf, field_text,
+                          query_grams, substring_distance)
+
+# 搜索引擎（配置项search_engine）
+ENGINE_INDEX = 'index'
+ENGINE_COLUMNAR = 'columnar'
+ENGINE_SCAN = 'scan'
+
+# 异步搜索时每批返回给界面的结果数
+SEARCH_BATCH_SIZE = 50
+
+# 搜索模式：'substring' 包含关键词（按文件名排序） | 'ranked' 按相关度排序，允许少量错字
+MODE_SUBSTRING = 'substring'
+MODE_RANKED = 'ranked'
+# 按搜索语法解析（见query_parser）并按查询计划精确匹配；其他模式把输入整体当作一个关键词
+MODE_QUERY = 'query'
+# 正则搜索（忽略大小写），超过REGEX_TIME_BUDGET秒时停止并抛出SearchTimeout
+MODE_REGEX = 'regex'
+REGEX_TIME_BUDGET = 2.0
+# 正则每批交给子进程匹配的最多提示词数和字符数，两批之间检查是否已取消
+REGEX_BATCH_SIZE = 200
+REGEX_BATCH_CHARS = 1 << 18
+
+# 相关度搜索：各字段权重、BM25参数、返回的结果数
+FIELD_WEIGHTS = {'name': 3.0, 'group': 1.5, 'content': 1.0, 'comment': 0.8}
+BM25_K1 = 1.2
+BM25_B = 0.75
+RANKED_TOP_K = 100
+# 相关度搜索用二元组取候选和打分：短关键词的三元组太少，一个错字就可能全部破坏
+RANKED_GRAM = 2
+# 近似匹配（不包含关键词的全部n-gram）时最多做编辑距离校验的候选数，按共有的n-gram数取前若干个；
+# 包含全部n-gram的候选不受此限制
+FUZZY_CANDIDATE_LIMIT = 2000
+
+
+def allowed_edits(keyword: str) -> int:
+    """关键词允许的错字数：短关键词必须精确匹配"""
+    if len(keyword) < 4:
+        return 0
+    if len(keyword) < 8:
+        return 1
+    return 2
+
+def line_starts(text: str) -> List[int]:
+    """每一行第一个字符的位置"""
+    starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+    return starts
+
+
+def tk_index(starts: List[int], offset: int) -> str:
+    """字符位置转换为tkinter的"行.列"（行从1开始）"""
+    line = bisect.bisect_right(starts, offset) - 1
+    return f"{line + 1}.{offset - starts[line]}"
+
+
+class SearchTimeout(Exception):
+    """搜索超过时间预算，之前已产生的结果仍然有效"""
+
+
+def make_query(keyword: str, mode: str) -> Query:
+    """按搜索模式生成查询：只有MODE_QUERY解析搜索语法"""
+    return parse_query(keyword) if mode == MODE_QUERY else literal_query(keyword)
+
+
+class SearchManager:
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        # 搜索引擎（配置项search_engine）：
+        # 'index' n-gram倒排索引 | 'columnar' 按字段拼接的缓冲区 | 'scan' 逐个检查所有提示词
+        self.engine = data_manager.config.get('search_engine', ENGINE_INDEX)
+        if self.engine not in (ENGINE_INDEX, ENGINE_COLUMNAR, ENGINE_SCAN):
+            print(f"未知的搜索引擎: {self.engine}，使用 {ENGINE_INDEX}")
+            self.engine = ENGINE_INDEX
+        # 索引在第一次使用时建立，之后按数据变化通知增量更新；相关度搜索总是使用倒排索引
+        self.index = NgramIndex()
+        self.columnar = ColumnarIndex()
+        self._built = set()           # 已建立的索引
+        self._lock = threading.Lock()
+        self._pending = set()         # 有变化、尚未更新到索引的文件
+        self._pending_lock = threading.Lock()
+        self._regex_worker = RegexWorker()  # 第一次正则搜索时启动子进程
+        # 数据每变化一次加一，搜索会话据此判断缓存的结果是否过期
+        self.generation = 0
+        data_manager.add_listener(self._on_data_changed)
+
+    def _on_data_changed(self, event: str, filename=None):
+        """数据变化通知（可能来自其他线程），只做记录，下次搜索时再更新索引"""
+        with self._pending_lock:
+            self.generation += 1
+            if event == 'reset':
+                self._built = set()
+                self._pending.clear()
+            elif filename is not None:
+                self._pending.add(filename)
+
+    def _get_index(self, engine: str):
+        """返回指定引擎的索引，需要时先建立或应用积累的变化，调用时需持有self._lock"""
+        with self._pending_lock:
+            built = self._built
+            pending, self._pending = self._pending, set()
+        indexes = [self._index_of(name) for name in built]
+        for file in pending:
+            try:
+                record = self.data_manager.get_record(file)
+            except Exception:
+                # 文件已删除或暂时无法读取
+                for index in indexes:
+                    index.remove(file)
+                continue
+            for index in indexes:
+                index.add(file, record)
+        index = self._index_of(engine)
+        if engine not in built:
+            self._build_index(index)
+            with self._pending_lock:
+                # 建立期间如果收到了reset，下次会重新建立
+                if self._built is built:
+                    built.add(engine)
+        return index
+
+    def _index_of(self, engine: str):
+        return self.columnar if engine == ENGINE_COLUMNAR else self.index
+
+    def _build_index(self, index):
+        index.clear()
+        storage = self.data_manager.storage
+        if storage is not None:
+            for file, data in storage.iter_records():
+                index.add(file, PromptRecord.from_dict(data))
+            return
+        for file in self.data_manager.get_all_files():
+            try:
+                index.add(file, self.data_manager.get_record(file))
+            except Exception as e:
+                print(f"建立搜索索引出错: {file}, {str(e)}")
+
+    def _candidates(self, query: Query) -> List[str]:
+        """按配置的引擎取候选文件"""
+        if self.engine == ENGINE_SCAN:
+            return self.data_manager.get_all_files()
+        with self._lock:
+            return query.candidates(self._get_index(self.engine))
+
+    def iter_search(self, keyword, group: Optional[str] = None,
+                    cancelled: Optional[Callable[[], bool]] = None,
+                    mode: str = MODE_SUBSTRING) -> Iterator[Tuple[str, PromptRecord]]:
+        """逐个产生匹配的 (文件名, 提示词记录)，group不为空时只在该分组内搜索
+        keyword可以是查询字符串或Query，字符串只在mode为MODE_QUERY时按语法解析（见query_parser）
+        由查询计划在索引中取候选，再逐个精确校验；每校验一个候选检查一次cancelled()，返回True时提前结束
+        mode为MODE_RANKED时按相关度从高到低产生（见ranked_search）
+        """
+        if mode == MODE_REGEX:
+            yield from self.iter_regex_search(keyword, group, cancelled)
+            return
+        query = keyword if isinstance(keyword, Query) else make_query(keyword, mode)
+        if not query.text:
+            return
+        if mode == MODE_RANKED and query.plain:
+            yield from self.ranked_search(query.text, group, cancelled=cancelled)
+            return
+        scope = set(self.data_manager.get_files_by_group(group)) if group else None
+        candidates = self._candidates(query)
+        for file in sorted(candidates):
+            if cancelled is not None and cancelled():
+                return
+            if scope is not None and file not in scope:
+                continue
+            try:
+                record = self.data_manager.get_record(file)
+                if query.matches(record):
+                    yield file, record
+            except Exception as e:
+                print(f"搜索文件出错: {file}, {str(e)}")
+
+    def iter_regex_search(self, pattern: str, group: Optional[str] = None,
+                          cancelled: Optional[Callable[[], bool]] = None,
+                          time_budget: float = REGEX_TIME_BUDGET,
+                          spans: Optional[Dict[str, Dict[str, List[Tuple[int, int]]]]] = None
+                          ) -> Iterator[Tuple[str, PromptRecord]]:
+        """正则搜索，逐个产生任意字段匹配pattern的 (文件名, 提示词记录)
+        先用正则必须包含的字面量在索引中求候选，再分批交给子进程用正则校验，每批之间检查cancelled()。
+        正则有误时抛出re.error，可能回溯爆炸的正则抛出UnsafePatternError；
+        总用时超过time_budget秒时结束子进程中的匹配并抛出SearchTimeout。
+        spans不为None时，在其中记录每个结果各字段的匹配位置 {文件名: {字段: [(开始, 结束), ...]}}，供高亮使用
+        """
+        if not pattern:
+            return
+        _, literals = compile_search_pattern(pattern)
+        deadline = time.monotonic() + time_budget
+        scope = set(self.data_manager.get_files_by_group(group)) if group else None
+        if literals:
+            candidates = self._candidates(Query(pattern, And([Term(None, literal) for literal in literals]), False))
+        else:
+            candidates = self.data_manager.get_all_files()
+
+        batch = []   # [(文件名, 提示词记录)]
+        jobs = []    # 与batch对应的各字段文本
+        chars = 0
+        files = sorted(file for file in candidates if scope is None or file in scope)
+        for i, file in enumerate(files):
+            try:
+                record = self.data_manager.get_record(file)
+            except Exception as e:
+                print(f"搜索文件出错: {file}, {str(e)}")
+            else:
+                texts = tuple(None if getattr(record, field) is None else str(getattr(record, field))
+                              for field in SEARCH_FIELDS)
+                batch.append((file, record))
+                jobs.append(texts)
+                chars += sum(len(text) for text in texts if text)
+            if not batch or (len(batch) < REGEX_BATCH_SIZE and chars < REGEX_BATCH_CHARS and i + 1 < len(files)):
+                continue
+            if cancelled is not None and cancelled():
+                return
+            try:
+                results = self._regex_worker.match(pattern, jobs, spans is not None,
+                                                   deadline - time.monotonic())
+            except TimeoutError:
+                raise SearchTimeout(f"正则搜索超过{time_budget:g}秒，只显示了部分结果")
+            for (file, record), result in zip(batch, results):
+                if result is None:
+                    continue
+                if spans is not None:
+                    spans[file] = {field: field_spans for field, field_spans in zip(SEARCH_FIELDS, result)
+                                   if field_spans}
+                yield file, record
+            batch, jobs, chars = [], [], 0
+
+    def ranked_search(self, keyword: str, group: Optional[str] = None, top_k: int = RANKED_TOP_K,
+                      cancelled: Optional[Callable[[], bool]] = None) -> List[Tuple[str, PromptRecord]]:
+        """按相关度搜索，返回得分最高的top_k个 [(文件名, 提示词记录), ...]
+        关键词切成n-gram后按BM25打分（各字段按FIELD_WEIGHTS加权），
+        允许allowed_edits()个错字：共有的n-gram足够多的文档作为候选，再用有上限的编辑距离校验，
+        近似匹配的得分按错字数降低；用大小为top_k的堆选出结果，不对全部匹配排序，
+        得分已低于堆中最低分的候选不再计算编辑距离
+        """
+        key = keyword.lower()
+        if not key:
+            return []
+        # 单字不在倒排索引中，直接用它打分，所有文档都是候选
+        grams = query_grams(key, RANKED_GRAM) or {key}
+        max_edits = allowed_edits(key)
+        scope = set(self.data_manager.get_files_by_group(group)) if group else None
+
+        with self._lock:
+            index = self._get_index(ENGINE_INDEX)
+            doc_count = len(index)
+            # 每个错字最多破坏RANKED_GRAM个n-gram（q-gram引理）
+            min_shared = max(1, len(grams) - max_edits * RANKED_GRAM)
+            doc_files = index.doc_files
+            # 先按分组过滤，再区分包含全部n-gram的候选（都要打分）和只能近似匹配的候选
+            full, fuzzy = [], []
+            if len(key) < MIN_GRAM:
+                full = [file for file in index.doc_ids if scope is None or file in scope]
+            # 单字的gram_matches为空，上面已把所有文档作为候选
+            for doc_id, count in index.gram_matches(grams).items():
+                if count < min_shared or (scope is not None and doc_files[doc_id] not in scope):
+                    continue
+                if count == len(grams):
+                    full.append(doc_files[doc_id])
+                else:
+                    fuzzy.append((count, doc_id))
+            # 近似匹配的候选可能很多，只校验共有n-gram最多的若干个；
+            # 共有n-gram多的先处理，堆能尽早填入高分结果，后面的候选多数可以直接跳过
+            candidates = full + [doc_files[doc_id] for _, doc_id in heapq.nlargest(FUZZY_CANDIDATE_LIMIT, fuzzy)]
+            idf = {(field, gram): bm25_idf(doc_count, index.doc_freq(field, gram))
+                   for field in SEARCH_FIELDS for gram in grams}
+            avg_lengths = {field: index.avg_length(field) or 1.0 for field in SEARCH_FIELDS}
+
+        # 大小为top_k的最小堆 (得分, 序号, 文件名, 记录)，堆顶是目前入选结果中得分最低的
+        heap = []
+        for seq, file in enumerate(candidates):
+            if cancelled is not None and cancelled():
+                return []
+            try:
+                record = self.data_manager.get_record(file)
+            except Exception as e:
+                print(f"搜索文件出错: {file}, {str(e)}")
+                continue
+            texts = [(field, field_text(getattr(record, field))) for field in SEARCH_FIELDS]
+            score = 0.0
+            for field, text in texts:
+                if not text:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * len(text) / avg_lengths[field])
+                field_score = 0.0
+                for gram in grams:
+                    tf = text.count(gram)
+                    if tf:
+                        field_score += idf[field, gram] * tf * (BM25_K1 + 1) / (tf + norm)
+                score += FIELD_WEIGHTS[field] * field_score
+            # 近似匹配只会降低得分，已经进不了前top_k的不必再算编辑距离
+            if len(heap) >= top_k and score <= heap[0][0]:
+                continue
+            distance = max_edits + 1
+            for field, text in texts:
+                if text:
+                    distance = min(distance, substring_distance(key, text, max_edits))
+                    if not distance:
+                        break
+            if distance > max_edits:
+                continue
+            item = (score / (1 + distance), -seq, file, record)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+        heap.sort(reverse=True)
+        return [(file, record) for _, _, file, record in heap]
+
+    def global_search(self, keyword: str) -> List[Tuple[str, PromptRecord]]:
+        """全局搜索
+        返回: [(文件名, 提示词记录), ...]
+        """
+        if not keyword:
+            return []
+        return list(self.iter_search(keyword))
+        
+    def group_search(self, keyword: str, group: str) -> List[Tuple[str, PromptRecord]]:
+        """分组内搜索
+        返回: [(文件名, 提示词记录), ...]
+        """
+        if not keyword or not group:
+            return []
+        return list(self.iter_search(keyword, group))
+        
+    def _search_in_data(self, keyword: str, record: PromptRecord) -> bool:
+        """在记录中搜索关键词"""
+        keyword = keyword.lower()
+        # 搜索所有文本字段
+        for field in SEARCH_FIELDS:
+            value = getattr(record, field)
+            if value is not None and keyword in str(value).lower():
+                return True
+        return False
+        
+    def get_highlight_ranges(self, text: str, keyword: str, mode: str = MODE_SUBSTRING,
+                             spans: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[str, str]]:
+        """获取需要高亮的文本范围，按位置排序；spans为已知的匹配位置（如正则搜索时记录的）
+        返回: [(开始位置, 结束位置), ...]，位置为tkinter的"行.列"格式
+        """
+        if spans is None:
+            spans = self._match_spans(text, keyword, mode)
+        if not spans:
+            return []
+        # 先建立每行起始位置的表，每个位置用二分查找换算为行列，不再逐个从头数换行符
+        starts = line_starts(text)
+        return [(tk_index(starts, start), tk_index(starts, end)) for start, end in spans]
+
+    def _match_spans(self, text: str, keyword: str, mode: str) -> List[Tuple[int, int]]:
+        """匹配内容的字符位置 [(开始, 结束), ...]"""
+        if not keyword or not text:
+            return []
+            
+        if mode == MODE_REGEX:
+            # 正则的匹配位置由搜索时的子进程给出（见iter_regex_search的spans），这里不执行正则
+            return []
+            
+        ranges = []
+        text_lower = text.lower()
+        
+        # 使用搜索语法时高亮每个肯定条件中的关键词
+        for term in make_query(keyword, mode).highlight_terms():
+            for match in re.finditer(re.escape(term), text_lower):
+                ranges.append((match.start(), match.end()))
+            
+        ranges.sort()
+        return ranges
+
+
+class SearchSession:
+    """边输入边搜索的会话
+    记住最近若干次查询的结果：新关键词包含之前某个关键词时（如 arx -> arxi），
+    结果一定是之前结果的子集，只需在之前的结果中筛选；关键词变短时直接用缓存的结果。
+    数据有变化或搜索范围（分组）改变时缓存作废。
+    可以在后台线程中使用：只在读写缓存时加锁，搜索本身不持有锁；被取消的搜索不写入缓存
+    """
+    def __init__(self, search_manager: SearchManager, max_cached: int = 16):
+        self.search_manager = search_manager
+        self.max_cached = max_cached
+        self._cache = OrderedDict()  # (搜索模式, 小写关键词) -> [(文件名, 提示词记录), ...]
+        self._group = None
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._cache.clear()
+
+    def search(self, keyword: str, group: Optional[str] = None,
+               mode: str = MODE_SUBSTRING) -> List[Tuple[str, PromptRecord]]:
+        """搜索keyword，group不为空时只在该分组内搜索
+        返回: [(文件名, 提示词记录), ...]
+        """
+        return [item for batch in self.iter_search(keyword, group, mode=mode) for item in batch]
+
+    def iter_search(self, keyword: str, group: Optional[str] = None,
+                    cancelled: Optional[Callable[[], bool]] = None,
+                    batch_size: int = SEARCH_BATCH_SIZE,
+                    mode: str = MODE_SUBSTRING,
+                    spans: Optional[Dict[str, Dict[str, List[Tuple[int, int]]]]] = None
+                    ) -> Iterator[List[Tuple[str, PromptRecord]]]:
+        """分批产生搜索结果，每批最多batch_size个；cancelled()返回True时提前结束
+        只有不含语法的包含搜索可以在之前的结果中筛选，其他情况只复用完全相同的查询；
+        正则搜索不使用缓存，spans的含义见SearchManager.iter_regex_search
+        """
+        manager = self.search_manager
+        if mode == MODE_REGEX:
+            # 正则区分\w与\W等写法，不能转小写；匹配位置随结果一起产生，每次都重新搜索
+            if keyword:
+                yield from self._batches(manager.iter_regex_search(keyword, group, cancelled, spans=spans),
+                                         batch_size, cancelled)
+            return
+        query = make_query(keyword, mode)
+        text = query.text.lower()
+        if query.plain:
+            # 不含语法的查询就是包含搜索，可以复用包含搜索的缓存和筛选
+            mode = MODE_RANKED if mode == MODE_RANKED else MODE_SUBSTRING
+        if not text:
+            return
+
+        key = (mode, text)
+        with self._lock:
+            if group != self._group or manager.generation != self._generation:
+                self._cache.clear()
+                self._group = group
+                self._generation = manager.generation
+            generation = self._generation
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            # 找包含在新关键词中的最长的已缓存关键词，在它的结果中筛选
+            base = None
+            if cached is None and mode == MODE_SUBSTRING:
+                base = max((cached_key for cached_key in self._cache
+                            if cached_key[0] == mode and cached_key[1] in text),
+                           key=lambda cached_key: len(cached_key[1]), default=None)
+            base_results = self._cache[base] if base is not None else None
+
+        if cached is not None:
+            for i in range(0, len(cached), batch_size):
+                yield cached[i:i + batch_size]
+            return
+        if base_results is not None:
+            source = ((file, record) for file, record in base_results if manager._search_in_data(text, record))
+        else:
+            source = manager.iter_search(query, group, cancelled, mode)
+
+        results = []
+        yield from self._batches(source, batch_size, cancelled, results)
+        if cancelled is not None and cancelled():
+            return
+        with self._lock:
+            # 搜索期间数据或搜索范围有变化时结果可能已过期，不写入缓存
+            if self._generation == generation and self._group == group and manager.generation == generation:
+                self._cache[key] = results
+                if len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+
+    @staticmethod
+    def _batches(source, batch_size: int, cancelled: Optional[Callable[[], bool]],
+                 results: Optional[list] = None) -> Iterator[List[Tuple[str, PromptRecord]]]:
+        """把source分成每批最多batch_size个产生，results不为None时同时全部追加到其中"""
+        batch = []
+        for item in source:
+            if cancelled is not None and cancelled():
+                return
+            if results is not None:
+                results.append(item)
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch and not (cancelled is not None and cancelled()):
+            yield batch
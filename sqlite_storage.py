@@ -0,0 +1,290 @@
+"""
+SQLite存储模块 - 把所有提示词保存在单个数据库文件中
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 提供与JSON目录相同的读写接口，供DataManager切换使用
+- 对分组、名称、快捷键建立索引
+- 提供JSON目录与SQLite数据库之间的一次性迁移工具
+v1.1 2026-10-xx
+- iter_records按主键分页读取，导出大型库时内存占用有上限
+- 快捷键批量修改改为get_shortcut_files + update_shortcuts，只更新真正设置了快捷键的行
+- 添加reserve/release：新文件名用一条INSERT原子地预留，保存时解除预留
+
+用法（迁移）：
+    python sqlite_storage.py to-sqlite data data/prompts.db
+    python sqlite_storage.py to-json data/prompts.db data_export
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dir_scanner import scan_prompt_files
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompts (
+    filename TEXT PRIMARY KEY,
+    name     TEXT NOT NULL DEFAULT '',
+    grp      TEXT NOT NULL DEFAULT '',
+    shortcut TEXT NOT NULL DEFAULT '',
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prompts_group ON prompts(grp, filename);
+CREATE INDEX IF NOT EXISTS idx_prompts_name ON prompts(name);
+CREATE INDEX IF NOT EXISTS idx_prompts_shortcut ON prompts(shortcut);
+CREATE TABLE IF NOT EXISTS reserved_names (
+    filename TEXT PRIMARY KEY,
+    time     REAL NOT NULL
+);
+"""
+
+# 超过这个秒数仍未保存的文件名预留视为遗留（如程序崩溃），打开数据库时清除
+RESERVATION_MAX_AGE = 3600
+
+
+def _row_values(filename: str, data: Dict) -> Tuple[str, str, str, str, str]:
+    """把一条提示词转换成表中的一行，data列保存完整记录以保证无损"""
+    return (
+        filename,
+        str(data.get('name', '')),
+        str(data.get('group', '')).strip(),
+        str(data.get('shortcut', '')),
+        json.dumps(data, ensure_ascii=False),
+    )
+
+
+class SqliteStorage:
+    """SQLite提示词存储
+    文件名仍作为主键保留，界面和热键配置中使用的文件名无需改变
+    热键回调在其他线程中执行，所以连接允许跨线程并加锁
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.execute("DELETE FROM reserved_names WHERE time < ?", (time.time() - RESERVATION_MAX_AGE,))
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_all_groups(self) -> List[str]:
+        """获取所有非空分组（已排序）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT grp FROM prompts WHERE grp != '' ORDER BY grp"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_files_by_group(self, group: str) -> List[str]:
+        """获取指定分组的所有文件名（已排序）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename FROM prompts WHERE grp = ? ORDER BY filename", (group,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_all_files(self) -> List[str]:
+        """获取所有文件名"""
+        with self._lock:
+            rows = self._conn.execute("SELECT filename FROM prompts ORDER BY filename").fetchall()
+        return [row[0] for row in rows]
+
+    def count_by_group(self) -> Dict[str, int]:
+        """按分组统计提示词数量"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT grp, COUNT(*) FROM prompts WHERE grp != '' GROUP BY grp"
+            ).fetchall()
+        return dict(rows)
+
+    def exists(self, filename: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM prompts WHERE filename = ?", (filename,)
+            ).fetchone()
+        return row is not None
+
+    def reserve(self, filename: str) -> bool:
+        """原子地预留一个新文件名，文件名已存在或已被预留时返回False
+        检查和插入在同一条语句中完成，多个进程同时预留也只有一个成功
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO reserved_names (filename, time) SELECT ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM prompts WHERE filename = ?)",
+                (filename, time.time(), filename)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, filename: str):
+        """解除未使用的文件名预留"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reserved_names WHERE filename = ?", (filename,))
+
+    def load(self, filename: str) -> Dict:
+        """读取一条提示词，不存在时抛出FileNotFoundError（与JSON目录行为一致）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM prompts WHERE filename = ?", (filename,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(filename)
+        return json.loads(row[0])
+
+    def iter_records(self, page_size: int = 500) -> Iterator[Tuple[str, Dict]]:
+        """按文件名顺序遍历所有提示词
+        按主键分页读取，每次只在内存中保留一页，遍历期间不长时间占用锁
+        """
+        last = None
+        while True:
+            with self._lock:
+                if last is None:
+                    rows = self._conn.execute(
+                        "SELECT filename, data FROM prompts ORDER BY filename LIMIT ?", (page_size,)
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT filename, data FROM prompts WHERE filename > ? ORDER BY filename LIMIT ?",
+                        (last, page_size)
+                    ).fetchall()
+            for filename, text in rows:
+                yield filename, json.loads(text)
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    def iter_meta(self) -> Iterator[Tuple[str, Dict]]:
+        """只遍历元数据列（不解析正文）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, name, grp, shortcut FROM prompts ORDER BY filename"
+            ).fetchall()
+        for filename, name, group, shortcut in rows:
+            yield filename, {'name': name, 'group': group, 'shortcut': shortcut}
+
+    def load_meta(self, filename: str) -> Optional[Dict]:
+        """读取单条元数据，不存在时返回None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, grp, shortcut FROM prompts WHERE filename = ?", (filename,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'name': row[0], 'group': row[1], 'shortcut': row[2]}
+
+    def save(self, filename: str, data: Dict):
+        """保存（新增或覆盖）一条提示词"""
+        self.save_many([(filename, data)])
+
+    def save_many(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """在一个事务中批量保存（同时解除这些文件名的预留），返回写入条数"""
+        rows = [_row_values(filename, data) for filename, data in items]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prompts (filename, name, grp, shortcut, data) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.executemany("DELETE FROM reserved_names WHERE filename = ?", [(row[0],) for row in rows])
+        return len(rows)
+
+    def delete(self, filename: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM prompts WHERE filename = ?", (filename,))
+
+    def get_shortcut_files(self, group: Optional[str] = None) -> List[Tuple[str, str]]:
+        """获取设置了快捷键（不含ctrl+*占位）的 [(文件名, 快捷键), ...]，可限定分组"""
+        sql = "SELECT filename, shortcut FROM prompts WHERE shortcut NOT IN ('', 'ctrl+*')"
+        params = ()
+        if group is not None:
+            sql += " AND grp = ?"
+            params = (group,)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY filename", params).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def update_shortcuts(self, changes: Dict[str, str]) -> int:
+        """在一个事务中修改多条提示词的快捷键，返回受影响的条数"""
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE prompts SET shortcut = ?, data = json_set(data, '$.shortcut', ?) WHERE filename = ?",
+                [(shortcut, shortcut, filename) for filename, shortcut in changes.items()]
+            )
+        return cursor.rowcount
+
+    def backup_to(self, backup_path: str):
+        """使用SQLite在线备份接口复制整个数据库"""
+        target = sqlite3.connect(backup_path)
+        try:
+            with self._lock:
+                self._conn.backup(target)
+        finally:
+            target.close()
+
+
+def migrate_json_to_sqlite(json_dir: str, db_path: str, extension: str = '.json',
+                           recursive: bool = True) -> int:
+    """把JSON目录（可含子目录）中的所有提示词导入SQLite数据库，返回导入条数"""
+    items = []
+    for file, entry in scan_prompt_files(json_dir, extension, recursive):
+        try:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                items.append((file, json.load(f)))
+        except Exception as e:
+            print(f"迁移文件错误: {file}, {str(e)}")
+    storage = SqliteStorage(db_path)
+    try:
+        return storage.save_many(items)
+    finally:
+        storage.close()
+
+
+def migrate_sqlite_to_json(db_path: str, json_dir: str) -> int:
+    """把SQLite数据库中的所有提示词写回JSON目录，返回导出条数"""
+    if not os.path.exists(json_dir):
+        os.makedirs(json_dir)
+    storage = SqliteStorage(db_path)
+    count = 0
+    try:
+        for filename, data in storage.iter_records():
+            file_path = os.path.join(json_dir, filename)
+            file_dir = os.path.dirname(file_path)
+            if not os.path.exists(file_dir):
+                os.makedirs(file_dir)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+            count += 1
+    finally:
+        storage.close()
+    return count
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSON目录与SQLite数据库之间的迁移工具")
+    sub = parser.add_subparsers(dest='command', required=True)
+    to_sqlite = sub.add_parser('to-sqlite', help="JSON目录 -> SQLite数据库")
+    to_sqlite.add_argument('json_dir')
+    to_sqlite.add_argument('db_path')
+    to_json = sub.add_parser('to-json', help="SQLite数据库 -> JSON目录")
+    to_json.add_argument('db_path')
+    to_json.add_argument('json_dir')
+    args = parser.parse_args()
+
+    if args.command == 'to-sqlite':
+        n = migrate_json_to_sqlite(args.json_dir, args.db_path)
+    else:
+        n = migrate_sqlite_to_json(args.db_path, args.json_dir)
+    print(f"迁移完成，共 {n} 条提示词")
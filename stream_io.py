@@ -0,0 +1,158 @@
+"""
+流式导入导出模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- JSON Lines格式（每行一条提示词）的读写
+- 原有JSON数组格式的增量写入和增量解析，不需要把整个文件读入内存
+- 写入按批次缓冲，减少系统调用
+- 写入中途出错时不写数组结尾，不会留下看似完整的文件（调用方先写临时文件，成功后再替换）
+- 单个元素跨越多个块时每次多读一倍，避免对同一段缓冲区反复从头解析
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, TextIO
+
+FORMAT_JSON = 'json'
+FORMAT_JSONL = 'jsonl'
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+_WHITESPACE = ' \t\n\r'
+
+
+def detect_format(path: str) -> str:
+    """根据扩展名判断导入导出格式，.jsonl/.ndjson为JSON Lines，其余为JSON数组"""
+    return FORMAT_JSONL if path.lower().endswith(JSONL_EXTENSIONS) else FORMAT_JSON
+
+
+class _BatchedWriter:
+    """把待写入的文本攒到batch_bytes后一次写出"""
+    def __init__(self, f: TextIO, batch_bytes: int = 1024 * 1024):
+        self.f = f
+        self.batch_bytes = batch_bytes
+        self.count = 0
+        self._parts = []
+        self._size = 0
+
+    def _append(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.batch_bytes:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.f.write(''.join(self._parts))
+            self._parts = []
+            self._size = 0
+
+    def write_all(self, records: Iterable[Dict]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 出错时不写结尾，半成品由调用方丢弃
+        if exc_type is None:
+            self.close()
+
+
+class JsonLinesWriter(_BatchedWriter):
+    """JSON Lines写入：每条提示词一行"""
+    def write(self, record: Dict):
+        self._append(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+
+    def close(self):
+        self.flush()
+
+
+class JsonArrayWriter(_BatchedWriter):
+    """JSON数组增量写入，输出与 json.dump(list, indent=4) 相同"""
+    def write(self, record: Dict):
+        text = json.dumps(record, ensure_ascii=False, indent=4).replace('\n', '\n    ')
+        self._append(('[\n    ' if self.count == 0 else ',\n    ') + text)
+        self.count += 1
+
+    def close(self):
+        self._append('\n]' if self.count else '[]')
+        self.flush()
+
+
+def iter_json_lines(f: TextIO) -> Iterator[Dict]:
+    """逐行解析JSON Lines，跳过空行"""
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"第 {line_no} 行不是有效的JSON: {str(e)}") from None
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """增量解析JSON数组文件，逐个产出数组元素
+    按块读取文件，用raw_decode从缓冲区中解析出一个完整元素后即丢弃对应的文本，
+    内存占用只与单条提示词的大小有关；元素不完整时下一次读取的块大小加倍，
+    大元素的总解析量与其长度成正比
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill(size: int = chunk_size) -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        """跳过空白，返回下一个非空白字符（不消耗），文件结束时返回''"""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ''
+
+    if next_char() != '[':
+        raise ValueError("导入文件不是JSON数组")
+    pos += 1
+    if next_char() == ']':
+        return
+    while True:
+        if next_char() == '':
+            raise ValueError("JSON数组不完整")
+        size = chunk_size
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # 数字等标量可能恰好在块边界被截断，确保后面还有分隔符再接受
+                if end < len(buf) or eof:
+                    break
+            except ValueError:
+                if eof:
+                    raise
+            # 已缓冲的部分不足一个元素，多读一倍，重试次数只与元素长度的对数有关
+            fill(size)
+            size *= 2
+        pos = end
+        yield item
+        sep = next_char()
+        if sep == ']':
+            return
+        if sep != ',':
+            raise ValueError(f"JSON数组格式错误: 意外的字符 {sep!r}")
+        pos += 1
@@ -0,0 +1,53 @@
+"""
+版本历史模块的测试
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_manager import HistoryManager, apply_delta, make_delta
+
+
+def _prompt(content, **fields):
+    data = {'name': '翻译助手', 'group': '翻译类', 'shortcut': '', 'comment': '', 'content': content}
+    data.update(fields)
+    return data
+
+
+def _long_content(changed_line=None):
+    lines = [f"第{i}行：请把下面的内容翻译成英文，保持原有格式。" for i in range(200)]
+    if changed_line is not None:
+        lines[changed_line] = "这一行被修改了"
+    return '\n'.join(lines)
+
+
+def test_delta_smaller_than_snapshot():
+    old = _prompt(_long_content())
+    new = _prompt(_long_content(changed_line=100))
+    delta = make_delta(new, old)
+    assert len(json.dumps(delta, ensure_ascii=False)) < len(json.dumps(old, ensure_ascii=False)) / 10
+    assert apply_delta(new, delta) == old
+
+
+def test_delta_records_changed_and_removed_fields():
+    old = _prompt('正文', comment='旧备注')
+    new = _prompt('正文', comment='新备注', extra='新字段')
+    delta = make_delta(new, old)
+    assert delta == {'fields': {'comment': '旧备注'}, 'removed': ['extra']}
+    assert apply_delta(new, delta) == old
+
+
+def test_revisions_round_trip(tmp_path):
+    history = HistoryManager(str(tmp_path), checkpoint_interval=3)
+    versions = [_prompt(_long_content(changed_line=i), comment=f"备注{i}") for i in range(8)]
+    for i, data in enumerate(versions):
+        history.record('a.json', data, timestamp=1000 + i)
+    history.flush()
+    assert [rev for rev, _ in history.list_revisions('a.json')] == list(range(8, 0, -1))
+    for i, data in enumerate(versions):
+        assert history.get_revision('a.json', i + 1) == data
+    assert '这一行被修改了' in history.diff('a.json', 1, 2)
+
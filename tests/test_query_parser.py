@@ -0,0 +1,72 @@
+"""
+搜索语法解析模块的测试
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_record import PromptRecord
+from query_parser import Not, Term, parse_query
+from search_manager import MODE_QUERY, MODE_SUBSTRING, SearchManager, SearchSession
+
+
+class _Prompts:
+    """只提供搜索需要的接口的内存数据源"""
+    def __init__(self, records):
+        self.config = {}
+        self.storage = None
+        self.records = records
+
+    def add_listener(self, listener):
+        pass
+
+    def get_all_files(self):
+        return list(self.records)
+
+    def get_files_by_group(self, group):
+        return [file for file, record in self.records.items() if record.group == group]
+
+    def get_record(self, file):
+        return self.records[file]
+
+
+def _session():
+    records = {
+        'a.json': PromptRecord(name='打印', group='代码', content='print(x)'),
+        'b.json': PromptRecord(name='变量', group='代码', content='print the value of x'),
+        'c.json': PromptRecord(name='选项', group='命令行', content='ls -x'),
+        'd.json': PromptRecord(name='其他', group='命令行', content='foo (bar'),
+    }
+    return SearchSession(SearchManager(_Prompts(records)))
+
+
+def test_unbalanced_input_falls_back_to_literal():
+    for text in ('foo (bar', 'foo bar)', '"foo bar', 'foo OR', 'AND foo', '-', 'name:(a'):
+        query = parse_query(text)
+        assert query.plain, text
+        assert isinstance(query.root, Term) and query.root.text == text.lower()
+
+
+def test_balanced_syntax_is_parsed():
+    assert parse_query('print(x)').highlight_terms() == ['print', 'x']
+    assert isinstance(parse_query('-x').root, Not)
+    assert not parse_query('name:(翻译 | 总结) -group:模板').plain
+
+
+def test_plain_modes_search_literally():
+    session = _session()
+    assert [file for file, _ in session.search('print(x)')] == ['a.json']
+    assert [file for file, _ in session.search('foo (bar')] == ['d.json']
+    assert [file for file, _ in session.search('-x')] == ['c.json']
+    assert [file for file, _ in session.search('print(x)', mode=MODE_SUBSTRING)] == ['a.json']
+
+
+def test_query_mode_opts_in_to_syntax():
+    session = _session()
+    assert [file for file, _ in session.search('print(x)', mode=MODE_QUERY)] == ['a.json', 'b.json']
+    assert [file for file, _ in session.search('print -x', mode=MODE_QUERY)] == []
+    assert [file for file, _ in session.search('group:命令行 -x', mode=MODE_QUERY)] == ['d.json']
+    # 无法解析时按字面搜索
+    assert [file for file, _ in session.search('foo (bar', mode=MODE_QUERY)] == ['d.json']
@@ -0,0 +1,128 @@
+"""
+使用统计模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- 记录提示词被复制的次数（界面复制、ctrl+b、专属快捷键、高频快捷键）
+- 计数保存在内存中，由后台线程定期批量写入磁盘
+- 用堆求使用次数最多的前K个提示词
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 使用来源: 'gui' 主界面“复制”按钮 | 'global_hotkey' ctrl+b发送缓存的提示词 |
+#           'shortcut' 提示词自己的快捷键 | 'high_freq' 高频快捷键
+
+USAGE_VERSION = 1
+
+
+class UsageTracker:
+    """提示词使用计数
+    record()只在内存中加一（热键回调线程中调用，开销很小），
+    有未保存的变化时由后台线程每隔flush_interval秒写一次文件
+    """
+    def __init__(self, path: str, flush_interval: float = 30.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._counts: Dict[str, List] = {}   # 文件名 -> [次数, 最后使用时间]
+        self._sources: Dict[str, int] = {}   # 来源 -> 次数
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 后台线程和close()可能同时写文件
+        self._stop = threading.Event()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('version') == USAGE_VERSION:
+                self._counts = saved.get('counts', {})
+                self._sources = saved.get('sources', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取使用统计失败: {str(e)}")
+
+    def record(self, filename: str, source: str):
+        """记录一次使用"""
+        now = time.time()
+        with self._lock:
+            entry = self._counts.get(filename)
+            if entry is None:
+                self._counts[filename] = [1, now]
+            else:
+                entry[0] += 1
+                entry[1] = now
+            self._sources[source] = self._sources.get(source, 0) + 1
+            self._dirty = True
+        if self._thread is None:
+            self._start()
+
+    def forget(self, filename: str):
+        """提示词被删除时移除其计数"""
+        with self._lock:
+            if self._counts.pop(filename, None) is not None:
+                self._dirty = True
+
+    def get_count(self, filename: str) -> int:
+        entry = self._counts.get(filename)
+        return entry[0] if entry else 0
+
+    def get_source_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._sources)
+
+    def top_k(self, k: int, files: Optional[Iterable[str]] = None) -> List[Tuple[str, int]]:
+        """使用次数最多的前k个 [(文件名, 次数), ...]，次数相同时最近使用的在前
+        files: 只在这些文件中统计（如当前仍存在的提示词）
+        """
+        with self._lock:
+            items = list(self._counts.items())
+        if files is not None:
+            wanted = files if isinstance(files, (set, frozenset, dict)) else set(files)
+            items = [item for item in items if item[0] in wanted]
+        top = heapq.nlargest(k, items, key=lambda item: (item[1][0], item[1][1]))
+        return [(filename, entry[0]) for filename, entry in top]
+
+    def flush(self):
+        """把计数写入文件（没有变化时不写）"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = json.dumps({'version': USAGE_VERSION, 'counts': self._counts, 'sources': self._sources},
+                                     ensure_ascii=False, separators=(',', ':'))
+                self._dirty = False
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                print(f"保存使用统计失败: {str(e)}")
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """停止后台线程并写入剩余的计数"""
+        self._stop.set()
+        self.flush()
@@ -0,0 +1,259 @@
+"""
+目录监听模块
+
+版本日志：
+v1.0 2026-10-xx
+- 初始版本
+- Linux下使用inotify监听data目录
+- 其他平台（或网络盘）使用目录快照轮询
+- 合并短时间内的大量事件，按批次交给界面线程处理
+v1.1 2026-10-xx
+- 支持监听子目录，文件名使用相对路径
+- 新建的子目录和文件事件都按dir_scanner的规则过滤，不再监听backup等目录
+"""
+
+import os
+import sys
+import time
+import queue
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+from typing import Dict, Optional, Set
+from dir_scanner import _wanted_dir, is_prompt_file, scan_prompt_files, scan_prompt_dirs
+
+# 批次中出现该标记表示事件丢失（如inotify队列溢出），需要全量重建
+RESCAN = None
+
+# inotify 事件掩码
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyBackend:
+    """基于inotify的监听后端（仅Linux）
+    inotify不会递归，每个子目录单独添加一个watch；新建子目录时补充watch并要求全量重建
+    """
+    MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+            IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+    def __init__(self, data_dir: str, extension: str, recursive: bool = True):
+        self.data_dir = data_dir
+        self.extension = extension
+        self.recursive = recursive
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self._prefixes: Dict[int, str] = {}  # wd -> 相对目录前缀
+        self._root_wd = None
+        try:
+            for prefix, path in scan_prompt_dirs(data_dir, recursive):
+                self._add_watch(prefix, path)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add_watch(self, prefix: str, path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            if prefix == '':
+                raise OSError(ctypes.get_errno(), f"无法监听目录: {path}")
+            print(f"无法监听子目录: {path}")
+            return
+        self._prefixes[wd] = prefix
+        if prefix == '':
+            self._root_wd = wd
+
+    @staticmethod
+    def available() -> bool:
+        """当前平台是否支持inotify"""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+            return hasattr(libc, 'inotify_init1')
+        except OSError:
+            return False
+
+    def wait(self, timeout: float) -> Set[Optional[str]]:
+        """等待事件，返回发生变化的文件名集合"""
+        changed = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(RESCAN)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if wd == self._root_wd:
+                    changed.add(RESCAN)
+                continue
+            if mask & IN_IGNORED:
+                self._prefixes.pop(wd, None)
+                continue
+            if not name or wd not in self._prefixes:
+                continue
+            prefix = self._prefixes[wd]
+            filename = prefix + os.fsdecode(name)
+            if mask & IN_ISDIR:
+                # 子目录新增/移入/删除：补充监听，目录中的文件没有单独事件，需要全量重建
+                if not self.recursive or not _wanted_dir(prefix, os.fsdecode(name)):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for sub_prefix, path in scan_prompt_dirs(os.path.join(self.data_dir, filename)):
+                        self._add_watch(filename + '/' + sub_prefix, path)
+                changed.add(RESCAN)
+            elif is_prompt_file(filename, self.extension, self.recursive):
+                changed.add(filename)
+        return changed
+
+    def close(self):
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class PollingBackend:
+    """目录快照轮询后端
+    适用于非Linux平台以及inotify收不到其他机器修改的网络共享目录
+    """
+    def __init__(self, data_dir: str, extension: str, recursive: bool = True, interval: float = 2.0):
+        self.data_dir = data_dir
+        self.extension = extension
+        self.recursive = recursive
+        self.interval = interval
+        self._stop = threading.Event()
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for filename, entry in scan_prompt_files(self.data_dir, self.extension, self.recursive):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            snapshot[filename] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[Optional[str]]:
+        """间隔一段时间后对比目录快照，返回发生变化的文件名集合"""
+        if self._stop.wait(min(timeout, self.interval)):
+            return set()
+        new_snapshot = self._take_snapshot()
+        old_snapshot = self._snapshot
+        self._snapshot = new_snapshot
+        changed = {name for name, key in new_snapshot.items() if old_snapshot.get(name) != key}
+        changed.update(name for name in old_snapshot if name not in new_snapshot)
+        return changed
+
+    def close(self):
+        self._stop.set()
+
+
+class WatchManager:
+    """数据目录监听器
+    后台线程收集文件变化，debounce秒内没有新事件（或累计超过max_delay秒）时
+    把合并后的文件名集合放入队列，由界面线程通过get_changes()取走
+    mode: 'auto' | 'inotify' | 'poll' | 'off'
+    """
+    def __init__(self, data_dir: str, extension: str = '.json', recursive: bool = True,
+                 mode: str = 'auto', debounce: float = 0.3, max_delay: float = 2.0,
+                 poll_interval: float = 2.0):
+        self.data_dir = data_dir
+        self.extension = extension
+        self.recursive = recursive
+        self.mode = mode
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._backend = None
+
+    def start(self):
+        """启动监听线程"""
+        if self.mode == 'off' or self._thread is not None:
+            return
+        try:
+            if self.mode in ('auto', 'inotify') and InotifyBackend.available():
+                self._backend = InotifyBackend(self.data_dir, self.extension, self.recursive)
+            else:
+                self._backend = PollingBackend(self.data_dir, self.extension, self.recursive,
+                                               self.poll_interval)
+        except Exception as e:
+            print(f"inotify不可用，改用轮询: {str(e)}")
+            self._backend = PollingBackend(self.data_dir, self.extension, self.recursive,
+                                           self.poll_interval)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"目录监听已启动: {self.data_dir} ({type(self._backend).__name__})")
+
+    def stop(self):
+        """停止监听线程"""
+        self._stop.set()
+        if self._backend is not None:
+            self._backend.close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._backend = None
+
+    def get_changes(self) -> Set[Optional[str]]:
+        """取出所有已合并的变化（非阻塞），集合中包含RESCAN时需要全量重建"""
+        changes = set()
+        while True:
+            try:
+                changes |= self._queue.get_nowait()
+            except queue.Empty:
+                return changes
+
+    def _run(self):
+        pending = set()
+        first_time = last_time = 0.0
+        while not self._stop.is_set():
+            timeout = self.debounce if pending else 1.0
+            try:
+                names = self._backend.wait(timeout)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                print(f"目录监听出错: {str(e)}")
+                names = {RESCAN}
+                time.sleep(self.poll_interval)
+            now = time.monotonic()
+            if names:
+                if not pending:
+                    first_time = now
+                pending |= names
+                last_time = now
+            if pending and (now - last_time >= self.debounce or now - first_time >= self.max_delay):
+                self._queue.put(pending)
+                pending = set()